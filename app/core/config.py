@@ -6,6 +6,40 @@ from pydantic_settings import BaseSettings
 class Settings(BaseSettings):
     DATABASE_URL: str
 
+    # Engine / connection pool
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800  # seconds, -1 disables recycling
+    # Off: a ping is an extra round trip on every checkout, and recycling
+    # already retires connections before common server idle timeouts. Turn
+    # it on behind proxies or firewalls that drop idle connections sooner.
+    DB_POOL_PRE_PING: bool = False
+    DB_POOL_WARMUP: int = 4  # connections opened at startup, at most DB_POOL_SIZE
+
+    # Service-layer caches (TTL in seconds)
+    USER_CACHE_SIZE: int = 10000
+    USER_CACHE_TTL: float = 300.0
+    PAGE_CACHE_SIZE: int = 256
+    PAGE_CACHE_TTL: float = 60.0
+
+    # Live updates from other clients (seconds)
+    CHANGE_FEED_ENABLED: bool = True
+    CHANGE_POLL_INTERVAL: float = 1.0
+    CHANGE_BATCH_WINDOW: float = 0.1
+    CHANGE_LOG_RETENTION: int = 100000  # SQLite change-log rows kept
+
+    # Latency metrics for SQL statements and service calls
+    METRICS_ENABLED: bool = True
+    SLOW_QUERY_MS: float = 200.0  # statements at least this slow are logged
+    METRICS_DUMP_PATH: str = "metrics.json"
+
+    # Snapshot of the first rows of the user list, shown before the database is up
+    SNAPSHOT_ENABLED: bool = True
+    SNAPSHOT_PATH: str = "users.snapshot"
+    SNAPSHOT_MAX_BYTES: int = 4 * 1024 * 1024  # rows past this are not saved
+
     class Config:
         env_file = os.path.join(
             getattr(sys, '_MEIPASS', os.path.abspath(".")), ".env"
@@ -0,0 +1,223 @@
+"""
+Low-overhead latency metrics for SQL statements, service calls and pool
+checkouts.
+
+Every sample goes into a fixed-bucket histogram: recording is two
+``perf_counter()`` calls, a bisect over 17 bounds and a few additions under
+a lock, cheap enough to leave on in production. ``snapshot()`` returns
+everything as plain data and ``dump_json()`` writes it to a file.
+"""
+import bisect
+import functools
+import inspect
+import json
+import logging
+import re
+import threading
+import time
+
+from app.core.config import settings
+
+# Upper bounds of the histogram buckets in milliseconds; one overflow bucket follows
+BUCKETS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Distinct statements tracked; anything beyond is pooled under OTHER_STATEMENT
+MAX_STATEMENTS = 500
+OTHER_STATEMENT = "<other>"
+
+slow_query_logger = logging.getLogger("app.slow_query")
+
+# "(?, ?, ?)" / "(%(id_1)s, %(id_2)s)" lists differ only in length; count them as one statement
+_PARAMETER_LIST = re.compile(r"\((?:\s*(?:\?|%\(\w+\)s|%s)\s*,)+\s*(?:\?|%\(\w+\)s|%s)\s*\)")
+
+
+class Histogram:
+    """Latency histogram over BUCKETS_MS with count, sum and max"""
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, elapsed_ms):
+        self.counts[bisect.bisect_left(BUCKETS_MS, elapsed_ms)] += 1
+        self.count += 1
+        self.total_ms += elapsed_ms
+        if elapsed_ms > self.max_ms:
+            self.max_ms = elapsed_ms
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding the ``fraction`` quantile"""
+        if not self.count:
+            return 0.0
+        threshold = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= threshold:
+                return BUCKETS_MS[index] if index < len(BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+    def to_dict(self):
+        labels = [f"<={bound}" for bound in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}"]
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "p50_ms": self.percentile(0.5),
+            "p90_ms": self.percentile(0.9),
+            "p99_ms": self.percentile(0.99),
+            "buckets": {label: count for label, count in zip(labels, self.counts) if count},
+        }
+
+
+class _Series:
+    """
+    A histogram plus counters for one statement or function. ``rows`` sums
+    the driver's ``cursor.rowcount``; drivers that report -1 (SQLite for
+    SELECT and RETURNING) add nothing.
+    """
+
+    def __init__(self):
+        self.latency = Histogram()
+        self.rows = 0
+        self.errors = 0
+
+    def to_dict(self):
+        return {**self.latency.to_dict(), "rows": self.rows, "errors": self.errors}
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.statements = {}
+            self.calls = {}
+            self.pool_wait = Histogram()
+            self.slow_queries = 0
+            self.started_at = time.time()
+
+    def record_statement(self, statement, elapsed_ms, rows):
+        with self._lock:
+            series = self.statements.get(statement)
+            if series is None:
+                if len(self.statements) >= MAX_STATEMENTS:
+                    statement = OTHER_STATEMENT
+                series = self.statements.setdefault(statement, _Series())
+            series.latency.record(elapsed_ms)
+            if rows > 0:
+                series.rows += rows
+
+    def record_call(self, name, elapsed_ms, failed=False):
+        with self._lock:
+            series = self.calls.get(name)
+            if series is None:
+                series = self.calls[name] = _Series()
+            series.latency.record(elapsed_ms)
+            if failed:
+                series.errors += 1
+
+    def record_pool_wait(self, elapsed_ms):
+        with self._lock:
+            self.pool_wait.record(elapsed_ms)
+
+    def record_slow_query(self):
+        with self._lock:
+            self.slow_queries += 1
+
+    def snapshot(self):
+        """Everything recorded since the last reset, as JSON-ready data"""
+        with self._lock:
+            return {
+                "since": self.started_at,
+                "taken_at": time.time(),
+                "slow_query_ms": settings.SLOW_QUERY_MS,
+                "slow_queries": self.slow_queries,
+                "pool_wait": self.pool_wait.to_dict(),
+                "calls": {name: series.to_dict() for name, series in sorted(self.calls.items())},
+                "statements": {
+                    statement: series.to_dict()
+                    for statement, series in sorted(
+                        self.statements.items(), key=lambda item: item[1].latency.total_ms, reverse=True
+                    )
+                },
+            }
+
+
+metrics = Metrics()
+
+
+@functools.lru_cache(maxsize=2048)
+def normalize_statement(statement):
+    """Collapse whitespace and bound-parameter lists so statements group together"""
+    return _PARAMETER_LIST.sub("(?...)", " ".join(statement.split()))
+
+
+def instrument_engine(engine):
+    """Time every statement ``engine`` executes and log the slow ones"""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(connection, cursor, statement, parameters, context, executemany):
+        connection.info.setdefault("metrics_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(connection, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - connection.info["metrics_started"].pop()) * 1000
+        key = normalize_statement(statement)
+        metrics.record_statement(key, elapsed_ms, cursor.rowcount)
+        if elapsed_ms >= settings.SLOW_QUERY_MS:
+            metrics.record_slow_query()
+            slow_query_logger.warning("Slow query (%.1f ms, %d rows): %s", elapsed_ms, cursor.rowcount, key[:500])
+
+    @event.listens_for(engine, "handle_error")
+    def _error(context):
+        # The statement never reached after_cursor_execute
+        started = context.connection.info.get("metrics_started") if context.connection else None
+        if started:
+            started.pop()
+
+
+def timed(fn):
+    """
+    Record the latency of every call to ``fn`` under its qualified name.
+
+    Generator functions are refused: their time would include the
+    consumer's work between items, so time the calls they make instead.
+    With METRICS_ENABLED off, ``fn`` is returned unchanged.
+    """
+    if inspect.isgeneratorfunction(fn):
+        raise TypeError(f"cannot time generator function {fn.__qualname__}")
+    if not settings.METRICS_ENABLED:
+        return fn
+    name = f"{fn.__module__.rsplit('.', 1)[-1]}.{fn.__qualname__}"
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        failed = False
+        try:
+            return fn(*args, **kwargs)
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            metrics.record_call(name, (time.perf_counter() - started) * 1000, failed)
+    return wrapper
+
+
+def dump_json(path=None):
+    """Write a snapshot (plus the pool report) to ``path``; returns the path"""
+    from app.db.session import get_pool_report
+
+    path = path or settings.METRICS_DUMP_PATH
+    data = metrics.snapshot()
+    data["pool"] = get_pool_report()
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(data, handle, indent=2, default=str)
+    return path
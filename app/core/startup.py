@@ -0,0 +1,224 @@
+"""
+Startup profiling and lazy imports.
+
+``python -m app.main --profile-startup`` enables the profile before anything
+else is imported: every module import is timed through a meta path finder,
+and ``span()``/``mark()`` calls along the startup path record phases such as
+engine creation, the schema check and the first paint. Without it both are
+no-ops costing one global lookup.
+
+``start_database()`` runs the database side of startup on a background
+thread, so it overlaps with building the UI.
+
+This module must stay cheap to import: standard library only.
+"""
+import importlib
+import importlib.abc
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager, nullcontext
+
+_profile = None
+
+# Imported and called by start_database(), on its own thread
+DATABASE_STARTUP = "app.db.init_db:prepare_database"
+
+
+class _LazyModule:
+    """Stands in for a module until the first attribute access imports it"""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attribute):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attribute)
+
+    def __repr__(self):
+        return f"<lazy module {self._name!r}>"
+
+
+def lazy_import(name):
+    """
+    Return a stand-in for module ``name`` that imports it on first
+    attribute access. Used to keep the database stack off the path to the
+    first window.
+
+    Unlike ``importlib.util.LazyLoader`` nothing is put in ``sys.modules``
+    early: the eventual import is an ordinary one, and other threads
+    importing ``name`` meanwhile (the startup and worker threads do) never
+    see a module that is still being loaded. Use it from GUI code only.
+    """
+    return _LazyModule(name)
+
+
+def run_in_background(target, name):
+    """
+    Call ``target`` on a daemon thread and return a Future of its result.
+    ``target`` may be a ``"module:function"`` string, imported on that thread.
+    """
+    future = Future()
+
+    def run():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            fn = target
+            if isinstance(target, str):
+                module, _, attribute = target.partition(":")
+                fn = getattr(importlib.import_module(module), attribute)
+            result = fn()
+        except BaseException as exc:
+            future.set_exception(exc)
+        else:
+            future.set_result(result)
+
+    threading.Thread(target=run, name=name, daemon=True).start()
+    return future
+
+
+def start_database():
+    """Import, migrate and warm up the database in the background; returns a Future"""
+    mark("database started")
+    return run_in_background(DATABASE_STARTUP, "database-startup")
+
+
+class _TimedLoader:
+    """Wraps a module's loader to time its execution"""
+
+    def __init__(self, loader, timer):
+        self._loader = loader
+        self._timer = timer
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        stack = self._timer.stack()
+        stack.append(0.0)  # time spent in nested imports
+        started = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            elapsed = time.perf_counter() - started
+            nested = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            self._timer.record(module.__name__, elapsed - nested, elapsed)
+
+
+class ImportTimer(importlib.abc.MetaPathFinder):
+    """Records self and cumulative execution time of every module imported"""
+
+    def __init__(self):
+        self.modules = {}  # name -> (self seconds, cumulative seconds)
+        self._local = threading.local()
+
+    def stack(self):
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def record(self, name, own, cumulative):
+        self.modules[name] = (own, cumulative)
+
+    def find_spec(self, name, path, target=None):
+        if getattr(self._local, "finding", False):
+            return None
+        self._local.finding = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(name, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._local.finding = False
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader, self)
+        return spec
+
+
+class StartupProfile:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = []  # (name, start seconds, duration seconds or None)
+        self.imports = ImportTimer()
+        sys.meta_path.insert(0, self.imports)
+
+    def stop(self):
+        if self.imports in sys.meta_path:
+            sys.meta_path.remove(self.imports)
+
+    def report(self, top=25):
+        lines = ["Startup profile (ms since start)", f"  {'phase':<28} {'at':>9} {'took':>9}"]
+        # Phases come from several threads; list them in the order they began
+        for name, start, duration in sorted(self.phases, key=lambda phase: phase[1]):
+            took = "" if duration is None else f"{duration * 1000:9.1f}"
+            lines.append(f"  {name:<28} {start * 1000:9.1f} {took:>9}")
+
+        modules = self.imports.modules
+        total = sum(own for own, _ in modules.values())
+        lines.append(f"Imports: {len(modules)} modules, {total * 1000:.1f} ms")
+        packages = {}
+        for name, (own, _) in modules.items():
+            package = name.partition(".")[0]
+            packages[package] = packages.get(package, 0.0) + own
+        for package, own in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:10]:
+            lines.append(f"  {package:<40} {own * 1000:9.1f}")
+        lines.append(f"  {'slowest modules':<40} {'self':>9} {'cumul.':>9}")
+        for name, (own, cumulative) in sorted(modules.items(), key=lambda item: item[1][0], reverse=True)[:top]:
+            lines.append(f"  {name:<40} {own * 1000:9.1f} {cumulative * 1000:9.1f}")
+        return "\n".join(lines)
+
+
+def enable():
+    """Start profiling; call before importing anything worth measuring"""
+    global _profile
+    if _profile is None:
+        _profile = StartupProfile()
+    return _profile
+
+
+def enabled():
+    return _profile is not None
+
+
+def mark(name):
+    """Record that startup reached ``name``"""
+    if _profile is not None:
+        _profile.phases.append((name, time.perf_counter() - _profile.started, None))
+
+
+def span(name):
+    """Context manager recording how long phase ``name`` took"""
+    if _profile is None:
+        return nullcontext()
+    return _span(name)
+
+
+@contextmanager
+def _span(name):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _profile.phases.append((name, started - _profile.started, time.perf_counter() - started))
+
+
+def report():
+    """Stop timing imports and return the profile as text, or None if disabled"""
+    if _profile is None:
+        return None
+    _profile.stop()
+    return _profile.report()
@@ -1,6 +1,45 @@
-from sqlmodel import SQLModel
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy.pool import QueuePool
+
+from app.core import startup
+from app.core.config import settings
 from app.db.session import engine
-from app.models.user import User
+from app.db.migrations import migrate
 
 def init_db():
-    SQLModel.metadata.create_all(engine)
\ No newline at end of file
+    """Bring the schema up to date; a single version query when it already is"""
+    with startup.span("schema check"):
+        return migrate(engine)
+
+
+def warm_pool(connections=None):
+    """
+    Open ``connections`` pooled connections (default DB_POOL_WARMUP, at most
+    the pool size) in parallel and return them to the pool, so the first
+    queries do not pay for connecting. Returns how many were opened.
+    """
+    if not isinstance(engine.pool, QueuePool):
+        return 0
+    count = min(settings.DB_POOL_WARMUP if connections is None else connections, settings.DB_POOL_SIZE)
+    if count <= 0:
+        return 0
+
+    def connect(_):
+        # None is returned before all are open, so every checkout opens a new connection
+        connection = engine.connect()
+        connection.exec_driver_sql("SELECT 1")
+        return connection
+
+    with startup.span("warm pool"):
+        with ThreadPoolExecutor(count, thread_name_prefix="pool-warmup") as executor:
+            opened = list(executor.map(connect, range(count)))
+        for connection in opened:
+            connection.close()
+    return len(opened)
+
+
+def prepare_database():
+    """Everything the first screen needs from the database, for a background thread"""
+    init_db()
+    warm_pool()
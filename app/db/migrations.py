@@ -0,0 +1,154 @@
+import datetime
+import logging
+from dataclasses import dataclass
+from typing import Callable
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, func, inspect, select
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from sqlalchemy.schema import CreateIndex
+
+from app.models.user import CHANGE_FEED_DDL, SEARCH_INDEX_DDL, User
+
+SCHEMA_VERSION_TABLE = "schema_version"
+
+logger = logging.getLogger(__name__)
+
+schema_version = Table(
+    SCHEMA_VERSION_TABLE,
+    MetaData(),
+    Column("version", Integer, primary_key=True),
+    Column("description", String(255), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    description: str
+    apply: Callable
+
+
+MIGRATIONS = []
+
+
+def migration(version, description):
+    """Register ``fn(connection)`` as the migration to ``version``"""
+    def register(fn):
+        MIGRATIONS.append(Migration(version, description, fn))
+        MIGRATIONS.sort(key=lambda m: m.version)
+        return fn
+    return register
+
+
+@migration(1, "create Users table")
+def _create_users(connection):
+    # Databases created by the old create_all() already have the table
+    User.__table__.create(connection, checkfirst=True)
+
+
+@migration(2, "limit name and email length")
+def _column_lengths(connection):
+    # SQLite does not enforce VARCHAR lengths, so there is nothing to alter
+    if connection.dialect.name == "postgresql":
+        connection.exec_driver_sql(
+            'ALTER TABLE "Users" '
+            f"ALTER COLUMN name TYPE VARCHAR({User.__table__.c.name.type.length}), "
+            f"ALTER COLUMN email TYPE VARCHAR({User.__table__.c.email.type.length})"
+        )
+
+
+@migration(3, "add model indexes (unique email, name, lower name/email)")
+def _model_indexes(connection):
+    # Fails if existing rows share an email; duplicates must be resolved first
+    for index in sorted(User.__table__.indexes, key=lambda index: index.name):
+        connection.execute(CreateIndex(index, if_not_exists=True))
+
+
+def _sqlite_has_trigram_fts(connection):
+    """Whether SQLite was built with FTS5 and has its trigram tokenizer (3.34+)"""
+    try:
+        connection.exec_driver_sql('CREATE VIRTUAL TABLE temp."fts_probe" USING fts5(value, tokenize=\'trigram\')')
+    except OperationalError:
+        return False
+    connection.exec_driver_sql('DROP TABLE temp."fts_probe"')
+    return True
+
+
+@migration(4, "add substring search indexes")
+def _search_indexes(connection):
+    if connection.dialect.name == "sqlite" and not _sqlite_has_trigram_fts(connection):
+        # Contains-searches then scan with LIKE (user_service._has_fts)
+        logger.warning("SQLite %s has no FTS5 trigram tokenizer; skipping the search index",
+                       connection.dialect.dbapi.sqlite_version)
+        return
+    for statement in SEARCH_INDEX_DDL.get(connection.dialect.name, ()):
+        connection.exec_driver_sql(statement)
+    if connection.dialect.name == "sqlite":
+        # Index rows that existed before the FTS table and its triggers
+        connection.exec_driver_sql('INSERT INTO "Users_fts"("Users_fts") VALUES (\'rebuild\')')
+
+
+@migration(5, "add change feed triggers")
+def _change_feed(connection):
+    for statement in CHANGE_FEED_DDL.get(connection.dialect.name, ()):
+        connection.exec_driver_sql(statement)
+
+
+@migration(6, "add Users.version for optimistic concurrency")
+def _row_version(connection):
+    # Tables created from the current model already have the column
+    if "version" not in {column["name"] for column in inspect(connection).get_columns("Users")}:
+        connection.exec_driver_sql('ALTER TABLE "Users" ADD COLUMN version INTEGER NOT NULL DEFAULT 1')
+
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+def get_schema_version(engine):
+    """Return the applied schema version with one query, or 0 if unversioned"""
+    with engine.connect() as connection:
+        try:
+            return connection.execute(select(func.max(schema_version.c.version))).scalar() or 0
+        except (OperationalError, ProgrammingError):
+            return 0
+
+
+def _lock_versions(connection):
+    # Serialise concurrent launches so each migration is applied exactly once
+    if connection.dialect.name == "postgresql":
+        connection.exec_driver_sql(f'LOCK TABLE "{SCHEMA_VERSION_TABLE}" IN EXCLUSIVE MODE')
+
+
+def migrate(engine, target=None):
+    """
+    Apply every pending migration up to ``target`` (default: latest).
+
+    Each migration runs in its own transaction together with the row that
+    records it, so an interrupted upgrade resumes where it stopped.
+    Returns the migrations that were applied.
+    """
+    target = LATEST_VERSION if target is None else target
+    if get_schema_version(engine) >= target:
+        return []
+
+    schema_version.create(engine, checkfirst=True)
+    applied = []
+    for pending in MIGRATIONS:
+        if pending.version > target:
+            break
+        with engine.begin() as connection:
+            _lock_versions(connection)
+            current = connection.execute(select(func.max(schema_version.c.version))).scalar() or 0
+            if pending.version <= current:
+                continue
+            pending.apply(connection)
+            connection.execute(
+                schema_version.insert().values(
+                    version=pending.version,
+                    description=pending.description,
+                    applied_at=datetime.datetime.now(datetime.timezone.utc),
+                )
+            )
+        applied.append(pending)
+    return applied
@@ -1,10 +1,179 @@
+import threading
+import time
+from contextlib import contextmanager
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
 from sqlmodel import create_engine, Session
+
 from app.core.config import settings
-from contextlib import contextmanager  # Thêm dòng này
+from app.core import startup
+from app.core.metrics import instrument_engine, metrics
+
+# A checkout slower than this counts as having waited for a free connection
+POOL_WAIT_THRESHOLD = 0.001
+
+# SQLite's built-in lower() folds ASCII letters only. This function, added to
+# every SQLite connection, folds like Python's str.lower instead.
+SQLITE_UNICODE_LOWER = "unicode_lower"
+
+
+class PoolStats:
+    """Thread-safe counters describing how the connection pool is used"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.checkouts = 0
+            self.connects = 0
+            self.waits = 0
+            self.wait_time_total = 0.0
+            self.wait_time_max = 0.0
+            self.connect_time_total = 0.0
+            self.connect_time_max = 0.0
+            self.peak_checked_out = 0
+            self.peak_overflow = 0
+
+    def record_checkout(self, elapsed, pool):
+        with self._lock:
+            self.checkouts += 1
+            if elapsed >= POOL_WAIT_THRESHOLD:
+                self.waits += 1
+                self.wait_time_total += elapsed
+                self.wait_time_max = max(self.wait_time_max, elapsed)
+            self.peak_checked_out = max(self.peak_checked_out, pool.checkedout())
+            self.peak_overflow = max(self.peak_overflow, max(pool.overflow(), 0))
+
+    def record_connect(self):
+        with self._lock:
+            self.connects += 1
+
+    def record_connect_time(self, elapsed):
+        with self._lock:
+            self.connect_time_total += elapsed
+            self.connect_time_max = max(self.connect_time_max, elapsed)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "connects": self.connects,
+                "waits": self.waits,
+                "wait_time_total": self.wait_time_total,
+                "wait_time_max": self.wait_time_max,
+                "connect_time_total": self.connect_time_total,
+                "connect_time_max": self.connect_time_max,
+                "peak_checked_out": self.peak_checked_out,
+                "peak_overflow": self.peak_overflow,
+            }
+
+
+pool_stats = PoolStats()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool that times how long each checkout waits for a connection.
+    Opening a new connection during the checkout is timed separately, so
+    the wait is contention for the pool only.
+    """
+    _checkout = threading.local()  # seconds spent connecting in this thread's checkout
 
-engine = create_engine(settings.DATABASE_URL, echo=True)
+    def _do_get(self):
+        if getattr(self._checkout, "active", False):
+            return super()._do_get()  # QueuePool retries through _do_get
+        self._checkout.active = True
+        self._checkout.connecting = 0.0
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        finally:
+            self._checkout.active = False
+        waited = time.perf_counter() - started - self._checkout.connecting
+        pool_stats.record_checkout(waited, self)
+        metrics.record_pool_wait(waited * 1000)
+        return connection
 
-@contextmanager  # Thêm dòng này
+    def _create_connection(self):
+        started = time.perf_counter()
+        try:
+            return super()._create_connection()
+        finally:
+            elapsed = time.perf_counter() - started
+            # Also called outside _do_get, e.g. by recreate()
+            self._checkout.connecting = getattr(self._checkout, "connecting", 0.0) + elapsed
+            pool_stats.record_connect_time(elapsed)
+
+
+def _engine_options(url):
+    options = {
+        "echo": settings.DB_ECHO,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+    if url.get_backend_name() == "sqlite":
+        # Let pooled SQLite connections be used by whichever thread checks them out
+        options["connect_args"] = {"check_same_thread": False}
+        # In-memory SQLite lives inside a single connection, so keep the default pool
+        if url.database in (None, "", ":memory:"):
+            return options
+    options.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+    )
+    return options
+
+
+_url = make_url(settings.DATABASE_URL)
+with startup.span("create engine"):
+    engine = create_engine(_url, **_engine_options(_url))
+if settings.METRICS_ENABLED:
+    instrument_engine(engine)
+
+
+@event.listens_for(engine, "connect")
+def _count_connect(dbapi_connection, connection_record):
+    pool_stats.record_connect()
+
+
+def _unicode_lower(value):
+    return value.lower() if isinstance(value, str) else value
+
+
+if _url.get_backend_name() == "sqlite":
+    @event.listens_for(engine, "connect")
+    def _register_functions(dbapi_connection, connection_record):
+        dbapi_connection.create_function(SQLITE_UNICODE_LOWER, 1, _unicode_lower, deterministic=True)
+
+
+# Sessions are short-lived and return their connection to the pool on exit;
+# objects stay readable after commit so callers need no extra refresh query.
+SessionLocal = sessionmaker(engine, class_=Session, expire_on_commit=False)
+
+
+@contextmanager
 def get_session():
-    with Session(engine) as session:
+    with SessionLocal() as session:
         yield session
+
+
+def get_pool_report():
+    """Return pool usage counters along with the pool's current state"""
+    report = pool_stats.snapshot()
+    pool = engine.pool
+    report["pool_class"] = type(pool).__name__
+    report["status"] = pool.status()
+    if isinstance(pool, QueuePool):
+        report.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+        )
+    return report
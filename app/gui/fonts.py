@@ -0,0 +1,79 @@
+import glob
+import os
+import sys
+import time
+
+from PyQt6.QtGui import QFont, QFontDatabase, QFontInfo
+
+if hasattr(sys, "_MEIPASS"):
+    # PyInstaller build: the --add-data copy is unpacked under _MEIPASS
+    FONT_DIR = os.path.join(sys._MEIPASS, "app", "assets", "fonts")
+else:
+    FONT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets", "fonts")
+
+_family = None
+_fonts = {}  # (weight, point size, italic) -> QFont
+
+# Filled by load_fonts(): files registered, chosen family and timings in ms
+load_stats = {"files": 0, "family": None, "load_ms": 0.0, "resolve_ms": 0.0}
+
+
+def load_fonts(font_dir=FONT_DIR):
+    """
+    Register the bundled fonts and pick the family every widget will use.
+
+    That is the platform's UI font unless font files were dropped into
+    ``font_dir``, in which case their family (the first one, by file name)
+    is used. Runs once, after the QApplication exists. The family is
+    resolved here a single time, so widgets never make Qt match a family
+    list or search for a fallback on their own.
+    """
+    global _family
+    if _family is not None:
+        return _family
+
+    started = time.perf_counter()
+    families = []
+    paths = sorted(glob.glob(os.path.join(font_dir, "*.ttf")) + glob.glob(os.path.join(font_dir, "*.otf")))
+    for path in paths:
+        font_id = QFontDatabase.addApplicationFont(path)
+        if font_id != -1:
+            families.extend(QFontDatabase.applicationFontFamilies(font_id))
+    loaded = time.perf_counter()
+
+    if families:
+        _family = families[0]
+    else:
+        # Use whatever the platform resolves for its UI font
+        _family = QFontInfo(QFontDatabase.systemFont(QFontDatabase.SystemFont.GeneralFont)).family()
+
+    load_stats.update(
+        files=len(paths),
+        family=_family,
+        load_ms=(loaded - started) * 1000,
+        resolve_ms=(time.perf_counter() - loaded) * 1000,
+    )
+    return _family
+
+
+def family():
+    return _family if _family is not None else load_fonts()
+
+
+def get_font(weight=QFont.Weight.Normal, point_size=None, italic=False):
+    """
+    Shared font for ``weight``/``point_size``/``italic``.
+
+    QFont is implicitly shared, so handing the same instance to many
+    widgets costs no copies; callers that tweak it get their own copy.
+    """
+    key = (weight, point_size, italic)
+    font = _fonts.get(key)
+    if font is None:
+        font = QFont(family())
+        font.setWeight(weight)
+        font.setItalic(italic)
+        if point_size:
+            font.setPointSize(point_size)
+        _fonts[key] = font
+    return font
@@ -0,0 +1,83 @@
+import time
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from app.core.startup import lazy_import
+
+change_feed = lazy_import("app.services.change_feed")
+
+# How long a write made here waits for its own echo from the change feed
+ECHO_TIMEOUT = 30.0
+# A write of more than CHANGE_NOTIFY_MAX_IDS rows echoes as a RELOAD, which
+# cannot be told apart from another client's, so it is only waited for briefly
+RELOAD_ECHO_TIMEOUT = 5.0
+
+
+class LiveUpdates(QObject):
+    """
+    Brings the change feed onto the GUI thread.
+
+    Batches from the listener thread are coalesced and emitted through
+    ``changes`` as a ChangeBatch. Changes this client already applied
+    itself are announced with ``expect()`` and dropped when their echo
+    arrives, and ``resync()`` drops whatever was read before a full reload.
+    The RELOAD sent for a large write made here is dropped too.
+    """
+    changes = pyqtSignal(object)
+    _received = pyqtSignal(object, float)  # events, read_at; emitted from the listener thread
+
+    def __init__(self, parent=None, engine=None):
+        super().__init__(parent)
+        self._expected = {}  # (op, user id) -> deadline
+        self._reload_expected_until = 0.0
+        self._synced_at = 0.0
+        self._received.connect(self._on_received)
+        self._engine = engine
+        self.listener = None  # created by start(), once the database is up
+
+    def is_available(self):
+        return self.listener is not None
+
+    def start(self):
+        if self.listener is None:
+            self.listener = change_feed.create_listener(self._received.emit, self._engine)
+        if self.listener:
+            self.listener.start()
+
+    def stop(self):
+        if self.listener:
+            self.listener.stop()
+
+    def expect(self, op, user_ids, count=None):
+        """
+        Announce changes made by this client so their echoes are ignored.
+        ``count`` is the number of rows written when ``user_ids`` lists only
+        some of them (or none).
+        """
+        now = time.monotonic()
+        for user_id in user_ids:
+            self._expected[(op, user_id)] = now + ECHO_TIMEOUT
+        if (len(user_ids) if count is None else count) > change_feed.CHANGE_NOTIFY_MAX_IDS:
+            self._reload_expected_until = now + RELOAD_ECHO_TIMEOUT
+
+    def resync(self):
+        """Forget changes read so far; the caller is reloading everything"""
+        self._synced_at = time.monotonic()
+        self._expected.clear()
+        self._reload_expected_until = 0.0
+
+    def _on_received(self, events, read_at):
+        if read_at < self._synced_at:
+            return
+        now = time.monotonic()
+        self._expected = {key: deadline for key, deadline in self._expected.items() if deadline > now}
+        remaining = []
+        for event in events:
+            if event.op == change_feed.ChangeOp.RELOAD:
+                if now < self._reload_expected_until:
+                    continue
+            elif self._expected.pop((event.op, event.user_id), None) is not None:
+                continue
+            remaining.append(event)
+        if remaining:
+            self.changes.emit(change_feed.coalesce(remaining))
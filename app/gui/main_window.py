@@ -1,16 +1,93 @@
+import sys
+
 from PyQt6.QtWidgets import (
-    QMainWindow, QLabel, QVBoxLayout, QWidget, QPushButton,
-    QLineEdit, QMessageBox, QTableWidget, QHBoxLayout,
-    QGroupBox, QTableWidgetItem, QDialog, QFormLayout,
-    QFrame, QSpacerItem, QSizePolicy, QCheckBox, QHeaderView
+    QApplication, QMainWindow, QVBoxLayout, QWidget,
+    QLineEdit, QMessageBox, QHBoxLayout,
+    QGroupBox, QDialog, QFormLayout, QHeaderView,
+    QFileDialog, QProgressDialog, QProgressBar, QComboBox
 )
-from PyQt6.QtCore import Qt, QSize
-from PyQt6.QtGui import QFont, QIcon, QColor
-from app.services.user_service import get_all_users, add_user, delete_user, update_user
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
+from PyQt6.QtGui import QKeySequence, QShortcut
+from app.core import startup
+from app.core.startup import lazy_import
+from app.gui import theme
+from app.gui.widgets.ui import styles
 from app.gui.widgets.ui.button import Button, ButtonVariant, ButtonSize
 from app.gui.widgets.ui.input import Input, InputSize, InputVariant
 from app.gui.widgets.ui.label import Label, LabelSize, LabelVariant
 from app.gui.widgets.ui.table import Table, TableVariant, TableSize
+from app.gui.live_updates import LiveUpdates
+from app.gui.workers import AsyncService, default_thread_count
+
+# The database stack loads on first use, after the window is on screen
+user_service = lazy_import("app.services.user_service")
+change_feed = lazy_import("app.services.change_feed")
+import_service = lazy_import("app.services.import_service")
+snapshot = lazy_import("app.services.snapshot")
+
+SEARCH_DEBOUNCE_MS = 300
+
+# Application chrome, registered with the shared stylesheet by MainWindow
+APP_STYLES = """
+    QMainWindow {
+        background-color: $window_bg;
+    }
+    QGroupBox {
+        background-color: $surface;
+        border-radius: 8px;
+        border: 1px solid $border;
+        margin-top: 1em;
+        padding: 15px;
+    }
+    QGroupBox::title {
+        color: $text;
+        subcontrol-origin: margin;
+        left: 10px;
+        padding: 0 5px;
+    }
+    QTableView {
+        border: none;
+        background-color: $surface;
+        gridline-color: $gridline;
+    }
+    QTableView::item {
+        padding: 8px;
+    }
+    QHeaderView::section {
+        background-color: $header_bg;
+        padding: 8px;
+        border: none;
+        border-bottom: 1px solid $border;
+    }
+    QLabel {
+        color: $text;
+    }
+    QWidget#appHeader {
+        background-color: $surface;
+        border-bottom: 1px solid $border;
+    }
+    /* Every dialog, message box, progress and file dialog included: the
+       platform palette behind them stays light in the dark theme */
+    QDialog {
+        background-color: $surface;
+    }
+    QDialog QCheckBox, QDialog QRadioButton {
+        color: $text;
+    }
+    QDialog#editUserDialog QLineEdit {
+        padding: 8px;
+        border: 1px solid $field_border;
+        border-radius: 4px;
+        margin-bottom: 10px;
+    }
+"""
+
+# Bulk edit choices per field (EditOp values), with the placeholder of the value input
+BULK_EDIT_OPS = {
+    "name": [("set", "Set to", "New name"), ("replace", "Find and replace", "Replace with")],
+    "email": [("replace", "Find and replace", "Replace with"), ("domain", "Change domain", "example.com")],
+}
+
 
 
 class MainWindow(QMainWindow):
@@ -18,14 +95,35 @@ class MainWindow(QMainWindow):
     Main window class for the User Management System.
     Handles the main UI layout and user interactions.
     """
-    def __init__(self):
+    _database_done = pyqtSignal(object)  # Future of the startup database work
+    _snapshot_done = pyqtSignal(object)  # Future of the saved snapshot
+
+    def __init__(self, database=None):
+        """
+        ``database`` is the Future returned by ``startup.start_database()``
+        when the caller started it early; otherwise it is started here,
+        still before the UI is built.
+        """
         super().__init__()
+        self._database = database or startup.start_database()
+        # One worker until the schema check has loaded the settings
+        self.service = AsyncService(self, max_threads=1)
+        self.live_updates = LiveUpdates(self)
+        self._block_tasks = {}  # (generation, block) -> Task
+        # Blocks asked for while the database is not ready, or the snapshot not
+        # reconciled: (generation, block) -> (after, before); None afterwards
+        self._deferred_blocks = {}
+        self._snapshot = None  # shown until the database is ready
+        self._ready = False
+        self._count_task = None
+        self._count = None
+        self._query = ""
         self._setup_window_properties()
         self._setup_styles()
         self._create_ui_components()
         self._setup_layout()
         self._connect_signals()
-        self.load_users()
+        self._start_database()
 
     def _setup_window_properties(self):
         """Initialize basic window properties"""
@@ -34,41 +132,10 @@ class MainWindow(QMainWindow):
 
     def _setup_styles(self):
         """Setup the application stylesheet"""
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: #f5f5f5;
-            }
-            QGroupBox {
-                background-color: white;
-                border-radius: 8px;
-                border: 1px solid #e0e0e0;
-                margin-top: 1em;
-                padding: 15px;
-            }
-            QGroupBox::title {
-                color: #333;
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px;
-            }
-            QTableWidget {
-                border: none;
-                background-color: white;
-                gridline-color: #f0f0f0;
-            }
-            QTableWidget::item {
-                padding: 8px;
-            }
-            QHeaderView::section {
-                background-color: #f8f9fa;
-                padding: 8px;
-                border: none;
-                border-bottom: 1px solid #e0e0e0;
-            }
-            QLabel {
-                color: #333;
-            }
-        """)
+        # Part of the shared application stylesheet rather than a sheet on this
+        # window, which would take precedence over the widgets' own rules
+        styles.register_global("main_window", APP_STYLES)
+        styles.ensure_installed()
 
     def _create_ui_components(self):
         """Create all UI components"""
@@ -84,7 +151,9 @@ class MainWindow(QMainWindow):
     def _create_header(self):
         """Create the header section with title and user count"""
         header = QWidget()
-        header.setStyleSheet("background-color: white; border-bottom: 1px solid #e0e0e0;")
+        header.setObjectName("appHeader")
+        # A plain QWidget only paints a stylesheet background when asked to
+        header.setAttribute(Qt.WidgetAttribute.WA_StyledBackground, True)
         header_layout = QHBoxLayout(header)
         
         title_label = Label("User Management",size=LabelSize.XXL,variant=LabelVariant.DARK,bold=True)
@@ -94,6 +163,9 @@ class MainWindow(QMainWindow):
         
         self.user_count_label = Label("Total Users: 0",size=LabelSize.SM,variant=LabelVariant.MUTED)
         header_layout.addWidget(self.user_count_label)
+
+        self.theme_button = Button("Dark Mode", size=ButtonSize.SM, variant=ButtonVariant.GHOST)
+        header_layout.addWidget(self.theme_button)
         
         return header
 
@@ -126,11 +198,19 @@ class MainWindow(QMainWindow):
         
         # Add action buttons for bulk operations
         action_buttons = QHBoxLayout()
+        self.select_all_btn = Button("Select All", size=ButtonSize.SM, variant=ButtonVariant.GHOST)
+        action_buttons.addWidget(self.select_all_btn)
         self.edit_selected_btn = Button("Edit Selected", size=ButtonSize.SM, variant=ButtonVariant.OUTLINE)
         self.delete_selected_btn = Button("Delete Selected", size=ButtonSize.SM, variant=ButtonVariant.DESTRUCTIVE)
         action_buttons.addWidget(self.edit_selected_btn)
         action_buttons.addWidget(self.delete_selected_btn)
         action_buttons.addStretch()
+        self.search_input = Input(placeholder="Search name or email", size=InputSize.SM, variant=InputVariant.OUTLINE)
+        self.search_input.setMinimumWidth(250)
+        self.search_input.setClearButtonEnabled(True)
+        action_buttons.addWidget(self.search_input)
+        self.import_btn = Button("Import...", size=ButtonSize.SM, variant=ButtonVariant.SECONDARY)
+        action_buttons.addWidget(self.import_btn)
         table_layout.addLayout(action_buttons)
         
         # Create table with custom component
@@ -138,7 +218,8 @@ class MainWindow(QMainWindow):
             variant=TableVariant.DEFAULT,
             size=TableSize.DEFAULT,
             show_checkbox=True,
-            row_height=50
+            row_height=50,
+            paged=True
         )
         
         # Set headers
@@ -154,9 +235,6 @@ class MainWindow(QMainWindow):
         header = self.table.horizontalHeader()
         header.setSectionResizeMode(3, QHeaderView.ResizeMode.Stretch)
         
-        # Connect checkbox signal
-        self.table.checkbox_changed.connect(self._handle_row_highlight)
-        
         table_layout.addWidget(self.table)
         table_group.setLayout(table_layout)
         
@@ -175,47 +253,262 @@ class MainWindow(QMainWindow):
         container.setLayout(main_layout)
         self.setCentralWidget(container)
 
+        # Busy indicator shown while any service call is running
+        self.busy_label = Label("", size=LabelSize.SM, variant=LabelVariant.MUTED)
+        self.busy_bar = QProgressBar()
+        self.busy_bar.setRange(0, 0)
+        self.busy_bar.setMaximumWidth(120)
+        self.busy_bar.setMaximumHeight(12)
+        self.busy_bar.setTextVisible(False)
+        self.busy_bar.hide()
+        self.statusBar().addPermanentWidget(self.busy_label)
+        self.statusBar().addPermanentWidget(self.busy_bar)
+
     def _connect_signals(self):
         """Connect all button signals to their respective slots"""
         self.add_button.clicked.connect(self.add_user)
+        self.select_all_btn.clicked.connect(self.toggle_select_all)
+        self.theme_button.clicked.connect(self.toggle_theme)
         self.edit_selected_btn.clicked.connect(self.edit_selected_users)
         self.delete_selected_btn.clicked.connect(self.delete_selected_users)
+        self.table.block_requested.connect(self._fetch_block)
+        self.table.block_cancelled.connect(self._cancel_block)
+        self.import_btn.clicked.connect(self.import_users)
+        self.service.busy_changed.connect(self._set_busy)
+        self.live_updates.changes.connect(self._apply_remote_changes)
+        QShortcut(QKeySequence("Ctrl+Shift+M"), self, activated=self.dump_metrics)
+
+        # Wait for a pause in typing before querying
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.load_users)
+        self.search_input.textChanged.connect(self.search_timer.start)
+
+    def _set_busy(self, busy):
+        """Show or hide the busy indicator"""
+        self.busy_bar.setVisible(busy)
+        self.busy_label.setText("Working..." if busy else "")
+
+    def toggle_theme(self):
+        """Switch between the light and dark themes"""
+        dark = theme.current_theme() != "dark"
+        styles.set_theme("dark" if dark else "light")
+        self.theme_button.setText("Light Mode" if dark else "Dark Mode")
+
+    def _show_error(self, error):
+        """Report a failed background call"""
+        QMessageBox.critical(self, "Error", str(error))
+
+    def dump_metrics(self):
+        """Write the latency metrics collected so far to METRICS_DUMP_PATH"""
+        from app.core import metrics
+
+        try:
+            path = metrics.dump_json()
+        except OSError as e:
+            self._show_error(e)
+            return
+        self.statusBar().showMessage(f"Metrics written to {path}", 5000)
+
+    def closeEvent(self, event):
+        """Stop background work before the window goes away"""
+        self._save_snapshot()
+        self.live_updates.stop()
+        self.service.shutdown()
+        super().closeEvent(event)
+
+    def _start_database(self):
+        """
+        Show a loading state until the startup database work (schema check,
+        pool warm-up) is done; the first page is requested right after.
+        Meanwhile the rows saved at the last exit are shown, if any.
+        """
+        self.form_group.setEnabled(False)
+        self.table_group.setEnabled(False)
+        self.statusBar().showMessage("Connecting to the database...")
+        self._set_busy(True)
+        self._set_count(None)
+        self._snapshot_done.connect(self._show_snapshot)
+        startup.run_in_background("app.services.snapshot:load_snapshot", "snapshot").add_done_callback(
+            self._snapshot_done.emit
+        )
+        self._database_done.connect(self._database_finished)
+        # Runs on the startup thread, or right here if it is already done
+        self._database.add_done_callback(self._database_done.emit)
+
+    def _database_finished(self, future):
+        self._set_busy(self.service.is_busy())
+        error = future.exception()
+        if error is not None:
+            self._database_failed(error)
+        else:
+            self._database_ready()
+
+    def _database_ready(self):
+        startup.mark("database ready")
+        self._ready = True
+        self.service.set_max_threads(default_thread_count())
+        self.statusBar().clearMessage()
+        self.form_group.setEnabled(True)
+        self.table_group.setEnabled(True)
+        if self._snapshot is not None:
+            self._reconcile_snapshot()
+        else:
+            self.load_users()
+        self.live_updates.start()
+
+    def _database_failed(self, error):
+        self.statusBar().showMessage("Database unavailable")
+        if startup.enabled():
+            # --profile-startup runs unattended: report and quit rather than wait on a dialog
+            startup.mark("database failed")
+            print(f"Database unavailable: {error}", file=sys.stderr)
+            print(startup.report(), file=sys.stderr)
+            self.close()
+            QApplication.exit(1)
+            return
+        QMessageBox.critical(self, "Database Error", str(error))
+
+    def _show_snapshot(self, future):
+        """Show the rows saved at the last exit, unless the database beat it"""
+        saved = None if future.exception() else future.result()
+        if saved is None or self._ready:
+            return
+        startup.mark("snapshot shown")
+        self._snapshot = saved
+        self.table.preload_rows(saved.total, saved.rows)
+        self._set_count(saved.total)
+
+    def _reconcile_snapshot(self):
+        """Apply what changed since the snapshot was saved, instead of reloading"""
+        saved, self._snapshot = self._snapshot, None
+        self.live_updates.resync()
+
+        def reconciled(result):
+            if result is None:
+                self.load_users()
+                return
+            self.table.remove_keys(result.deleted)
+            for row in result.updated:
+                self.table.update_row(row[0], row)
+            for row in result.inserted:
+                self.table.insert_by_key(row)
+            self.table.set_total_rows(result.total)
+            self._set_count(result.total)
+            self._fetch_deferred_blocks()
+
+        def failed(error):
+            self._show_error(error)
+            self.load_users()
+
+        self._count_task = self.service.submit(
+            snapshot.reconcile, saved, on_result=reconciled, on_error=failed,
+        )
+
+    def _fetch_deferred_blocks(self):
+        deferred, self._deferred_blocks = self._deferred_blocks, None
+        generation = self.table.table_model.generation
+        for (block_generation, block), (after, before) in deferred.items():
+            # Older generations were cancelled or reset while waiting
+            if block_generation == generation:
+                self._fetch_block(block, generation, after, before)
+
+    def _save_snapshot(self):
+        """Keep the rows at the top of the full list for the next start"""
+        if self._deferred_blocks is not None or self._query or self._count is None:
+            return
+        snapshot.save_snapshot(self.table.leading_rows(), self._count)
 
     def load_users(self):
-        """Load and display all users in the table"""
-        users = get_all_users()
-        self.table.setRowCount(0)  # Clear existing rows
-        self.user_count_label.setText(f"Total Users: {len(users)}")
-
-        for user in users:
-            self.table.add_row([user.id, user.name, user.email])
-
-    def _handle_row_highlight(self, row, checked):
-        """Handle row highlighting when checkbox state changes"""
-        for col in range(self.table.columnCount()):
-            item = self.table.item(row, col)
-            if item:
-                item.setBackground(QColor("#e3f2fd" if checked else "white"))
-
-    def show_edit_dialog(self, user_id, name, email):
+        """Reset the table; blocks of rows are then fetched as they scroll into view"""
+        for task in [self._count_task, *self._block_tasks.values()]:
+            if task:
+                task.cancel()
+        self._block_tasks.clear()
+        self._deferred_blocks = None
+        self.table.clear_rows()
+        self.live_updates.resync()
+
+        self._query = self.search_input.text().strip()
+        self._set_count(None)
+
+        def counted(count):
+            self._set_count(count)
+            self.table.set_total_rows(count)
+
+        self._count_task = self.service.submit(
+            user_service.count_users, self._query, on_result=counted, on_error=self._show_error,
+        )
+        # Fetch the first screenful alongside the count rather than after it
+        self.table.request_block(0)
+
+    def _set_count(self, count):
+        """Show the number of users (or matches); None while it is being counted"""
+        self._count = count
+        label = "Matches" if self._query else "Total Users"
+        self.user_count_label.setText(f"{label}: {'...' if count is None else count}")
+
+    def _adjust_count(self, delta):
+        if self._count is not None:
+            self._set_count(self._count + delta)
+
+    def _user_row(self, user):
+        # The version is carried along (not shown) for the edit conflict check
+        return (user.id, user.name, user.email, user.version)
+
+    def _fetch_block(self, block, generation, after, before):
+        """Load one block of rows for the table, by key range when a nearby row is known"""
+        if self._deferred_blocks is not None:
+            self._deferred_blocks[(generation, block)] = (after, before)
+            return
+        size = self.table.table_model.block_size
+        key = (generation, block)
+
+        def loaded(result):
+            self._block_tasks.pop(key, None)
+            if self._query:
+                users, _ = result
+                first_hint = last_hint = None
+            else:
+                users, first_hint, last_hint = result
+            rows = [self._user_row(user) for user in users]
+            self.table.set_block(block, generation, rows, first_hint, last_hint)
+
+        def failed(error):
+            self._block_tasks.pop(key, None)
+            self.table.block_failed(block, generation)
+            # Retried with a backoff, so no dialog per attempt
+            self.statusBar().showMessage(f"Could not load users, retrying: {error}", 5000)
+
+        if self._query:
+            self._block_tasks[key] = self.service.submit(
+                user_service.search_users, self._query, page=block, page_size=size,
+                on_result=loaded, on_error=failed,
+            )
+        else:
+            # Seek to the nearest remembered row and skip the gap to the block
+            cursor, skip = after or before or (None, 0)
+            self._block_tasks[key] = self.service.submit(
+                user_service.get_users_block, block * size, size, skip=skip,
+                after=cursor if after else None, before=cursor if before else None,
+                on_result=loaded, on_error=failed,
+            )
+
+    def _cancel_block(self, block, generation):
+        """Drop the fetch of a block that scrolled out of reach before it started"""
+        task = self._block_tasks.pop((generation, block), None)
+        if task:
+            task.cancel()
+        if self._deferred_blocks:
+            self._deferred_blocks.pop((generation, block), None)
+
+    def show_edit_dialog(self, user_id, name, email, version=None):
         """Show dialog for editing user information"""
         dialog = QDialog(self)
         dialog.setWindowTitle("Edit User")
         dialog.setMinimumWidth(400)
-        dialog.setStyleSheet("""
-            QDialog {
-                background-color: white;
-            }
-            QLabel {
-                color: #333;
-            }
-            QLineEdit {
-                padding: 8px;
-                border: 1px solid #ddd;
-                border-radius: 4px;
-                margin-bottom: 10px;
-            }
-        """)
+        dialog.setObjectName("editUserDialog")
 
         layout = QVBoxLayout(dialog)
         layout.setSpacing(15)
@@ -252,9 +545,12 @@ class MainWindow(QMainWindow):
             if not new_name or not new_email:
                 QMessageBox.warning(dialog, "Error", "Please fill in all fields")
                 return
-            update_user(user_id, new_name, new_email)
+            self.service.submit(
+                user_service.update_user, user_id, new_name, new_email, expected_version=version,
+                on_result=lambda user: self._user_updated(user_id, user),
+                on_error=lambda error: self._update_failed(user_id, error),
+            )
             dialog.accept()
-            self.load_users()
 
         save_button.clicked.connect(save_changes)
         cancel_button.clicked.connect(dialog.reject)
@@ -268,11 +564,26 @@ class MainWindow(QMainWindow):
         if not name or not email:
             QMessageBox.warning(self, "Error", "Please fill in all fields")
             return
-        user = add_user(name, email)
-        QMessageBox.information(self, "Success", f"Added user: {user.name}")
-        self.name_input.clear()
-        self.email_input.clear()
-        self.load_users()
+        self.add_button.setDisabled(True)
+
+        def added(user):
+            self.add_button.setDisabled(False)
+            QMessageBox.information(self, "Success", f"Added user: {user.name}")
+            self.name_input.clear()
+            self.email_input.clear()
+            self.live_updates.expect(change_feed.ChangeOp.INSERT, [user.id])
+            if self._query:
+                # Whether the new user matches is the search's business
+                self.load_users()
+            else:
+                self.table.insert_by_key(self._user_row(user))
+                self._adjust_count(1)
+
+        def failed(error):
+            self.add_button.setDisabled(False)
+            self._show_error(error)
+
+        self.service.submit(user_service.add_user, name, email, on_result=added, on_error=failed)
 
     def delete_user(self, user_id):
         """Delete a user from the system"""
@@ -284,52 +595,316 @@ class MainWindow(QMainWindow):
         )
         
         if reply == QMessageBox.StandardButton.Yes:
-            delete_user(user_id)
+            self.service.submit(
+                user_service.delete_user, user_id,
+                on_result=lambda deleted: self._users_deleted([user_id] if deleted else []),
+                on_error=self._show_error,
+            )
+
+    def _user_updated(self, user_id, user):
+        """Apply the result of an edit to the table without reloading it"""
+        self.live_updates.expect(change_feed.ChangeOp.UPDATE, [user_id])
+        if user is None:
+            # Deleted elsewhere in the meantime
+            self._users_removed([user_id])
+        else:
+            self.table.update_row(user.id, self._user_row(user))
+
+    def _update_failed(self, user_id, error):
+        """Report a failed edit; on a conflict, show the row as it is now"""
+        if not isinstance(error, user_service.StaleUserError):
+            self._show_error(error)
+            return
+        QMessageBox.warning(
+            self, "Edit Conflict",
+            "This user was changed by someone else. The latest values are shown; "
+            "please make your edit again."
+        )
+        self.service.submit(
+            user_service.get_users_by_ids, [user_id],
+            on_result=lambda users: [self.table.update_row(user.id, self._user_row(user)) for user in users],
+            on_error=self._show_error,
+        )
+
+    def _users_deleted(self, user_ids):
+        """Apply this client's own deletes"""
+        self.live_updates.expect(change_feed.ChangeOp.DELETE, user_ids)
+        self._users_removed(user_ids)
+
+    def _users_removed(self, user_ids):
+        """Drop deleted users from the table without reloading it"""
+        removed = self.table.remove_keys(user_ids)
+        self._adjust_count(-removed)
+
+    def _recount(self):
+        """Count the rows again, and reload if rows that were not loaded went away"""
+        def counted(count):
+            if self._count is not None and count != self._count:
+                self.load_users()
+
+        self.service.submit(user_service.count_users, self._query, on_result=counted, on_error=self._show_error)
+
+    def _apply_remote_changes(self, batch):
+        """Bring the table up to date with changes made by other clients"""
+        if batch.reload:
             self.load_users()
+            return
+        if batch.deleted:
+            # Only loaded rows are known to be in the table; under a search
+            # the others may never have matched
+            loaded = self.table.loaded_keys()
+            self._users_removed(batch.deleted & loaded)
+            if batch.deleted - loaded:
+                self._recount()
+        changed = batch.inserted | batch.updated
+        if not changed:
+            return
+        if self._query and batch.inserted:
+            # New rows may or may not match the search
+            self.load_users()
+            return
+
+        def fetched(users):
+            for user in users:
+                if self.table.update_row(user.id, self._user_row(user)):
+                    continue
+                if user.id in batch.inserted:
+                    self.table.insert_by_key(self._user_row(user))
+                    self._adjust_count(1)
+
+        self.service.submit(user_service.get_users_by_ids, changed, on_result=fetched, on_error=self._show_error)
 
     def get_selected_users(self):
         """Get list of selected user IDs"""
-        selected_rows = self.table.get_selected_rows()
-        selected_users = []
-        for row in selected_rows:
-            user_id = int(self.table.item(row, 1).text())
-            selected_users.append(user_id)
-        return selected_users
+        return self.table.get_selected_keys()
+
+    def _selection(self):
+        """
+        (all matching, ids, count): with select-all active, every user
+        matching the search except ``ids``, most of which may never have
+        been loaded; otherwise just ``ids``. ``count`` is None while the
+        matches are still being counted.
+        """
+        all_matching, user_ids = self.table.get_selection()
+        if not all_matching:
+            return False, list(user_ids), len(user_ids)
+        count = None if self._count is None else self._count - len(user_ids)
+        return True, list(user_ids), count
+
+    def toggle_select_all(self):
+        """Check every row, or clear the check state if all are checked"""
+        if self.table.is_all_selected():
+            self.table.clear_selection()
+        else:
+            self.table.select_all()
 
     def edit_selected_users(self):
         """Edit the selected user"""
-        selected_users = self.get_selected_users()
-        if not selected_users:
+        all_matching, selected_users, count = self._selection()
+        if all_matching and count is None:
+            self.statusBar().showMessage("Still counting the selected users", 5000)
+            return
+        if not count:
             QMessageBox.warning(self, "Warning", "Please select a user to edit")
             return
         
-        if len(selected_users) > 1:
-            QMessageBox.warning(self, "Warning", "Please select only one user to edit")
+        if all_matching or count > 1:
+            self.show_bulk_edit_dialog(selected_users, all_matching, count)
             return
-            
+
         user_id = selected_users[0]
-        for row in range(self.table.rowCount()):
-            if int(self.table.item(row, 1).text()) == user_id:
-                name = self.table.item(row, 2).text()
-                email = self.table.item(row, 3).text()
-                self.show_edit_dialog(user_id, name, email)
-                break
+        row = self.table.find_row(user_id)
+        if row >= 0:
+            _, name, email, version = self.table.row_data(row)
+            self.show_edit_dialog(user_id, name, email, version)
+            return
+
+        # The row has scrolled out of the loaded blocks
+        def fetched(users):
+            if not users:
+                QMessageBox.warning(self, "Warning", "The selected user no longer exists")
+                return
+            user = users[0]
+            self.show_edit_dialog(user.id, user.name, user.email, user.version)
+
+        self.service.submit(user_service.get_users_by_ids, [user_id], on_result=fetched, on_error=self._show_error)
+
+    def show_bulk_edit_dialog(self, user_ids, all_matching=False, count=None):
+        """
+        Apply the same field transforms to every selected user at once. With
+        ``all_matching``, to every user matching the search except ``user_ids``
+        (``count`` of them).
+        """
+        if not all_matching:
+            count = len(user_ids)
+        dialog = QDialog(self)
+        dialog.setWindowTitle(f"Edit {count} Users")
+        dialog.setMinimumWidth(520)
+        dialog.setObjectName("editUserDialog")
+
+        layout = QVBoxLayout(dialog)
+        layout.setSpacing(15)
+        form_layout = QFormLayout()
+        form_layout.setSpacing(10)
+
+        editors = {}
+        for field, ops in BULK_EDIT_OPS.items():
+            mode = QComboBox()
+            mode.addItem("Keep", None)
+            for op, label, _ in ops:
+                mode.addItem(label, op)
+            find_input = QLineEdit()
+            find_input.setPlaceholderText("Find")
+            value_input = QLineEdit()
+
+            def update_inputs(_=None, mode=mode, find_input=find_input, value_input=value_input, ops=ops):
+                op = mode.currentData()
+                find_input.setVisible(op == "replace")
+                value_input.setEnabled(op is not None)
+                value_input.setPlaceholderText(next((hint for o, _, hint in ops if o == op), ""))
+
+            mode.currentIndexChanged.connect(update_inputs)
+            update_inputs()
+
+            row_layout = QHBoxLayout()
+            row_layout.addWidget(mode)
+            row_layout.addWidget(find_input)
+            row_layout.addWidget(value_input)
+            form_layout.addRow(f"{field.capitalize()}:", row_layout)
+            editors[field] = (mode, find_input, value_input)
+        layout.addLayout(form_layout)
+
+        button_layout = QHBoxLayout()
+        apply_button = Button("Apply", size=ButtonSize.SM)
+        cancel_button = Button("Cancel", size=ButtonSize.SM, variant=ButtonVariant.OUTLINE)
+        button_layout.addStretch()
+        button_layout.addWidget(apply_button)
+        button_layout.addWidget(cancel_button)
+        layout.addLayout(button_layout)
+
+        def apply_changes():
+            changes = [
+                user_service.FieldChange(
+                    field, user_service.EditOp(mode.currentData()), value_input.text().strip(), find_input.text()
+                )
+                for field, (mode, find_input, value_input) in editors.items()
+                if mode.currentData() is not None
+            ]
+            try:
+                user_service.validate_changes(changes, count)
+            except ValueError as exc:
+                QMessageBox.warning(dialog, "Error", str(exc).capitalize())
+                return
+            if all_matching:
+                self.service.submit(
+                    user_service.update_matching, changes, self._query, exclude=user_ids,
+                    on_result=lambda updated: self._users_bulk_updated(
+                        self.table.loaded_keys() - set(user_ids), updated
+                    ),
+                    on_error=self._show_error,
+                )
+            else:
+                self.service.submit(
+                    user_service.update_users, user_ids, changes,
+                    on_result=lambda updated: self._users_bulk_updated(user_ids, updated),
+                    on_error=self._show_error,
+                )
+            dialog.accept()
+
+        apply_button.clicked.connect(apply_changes)
+        cancel_button.clicked.connect(dialog.reject)
+
+        dialog.exec()
+
+    def _users_bulk_updated(self, user_ids, count):
+        """Refresh the visible rows touched by a bulk edit"""
+        self.live_updates.expect(change_feed.ChangeOp.UPDATE, user_ids, count)
+        self.statusBar().showMessage(f"Updated {count} users", 5000)
+        loaded = self.table.loaded_keys() & set(user_ids)
+        if loaded:
+            self.service.submit(
+                user_service.get_users_by_ids, loaded,
+                on_result=lambda users: [self.table.update_row(user.id, self._user_row(user)) for user in users],
+                on_error=self._show_error,
+            )
 
     def delete_selected_users(self):
         """Delete all selected users"""
-        selected_users = self.get_selected_users()
-        if not selected_users:
+        all_matching, selected_users, count = self._selection()
+        if all_matching and count is None:
+            self.statusBar().showMessage("Still counting the selected users", 5000)
+            return
+        if not count:
             QMessageBox.warning(self, "Warning", "Please select at least one user to delete")
             return
 
         reply = QMessageBox.question(
             self, 'Confirm Delete',
-            f'Are you sure you want to delete {len(selected_users)} selected users?',
+            f'Are you sure you want to delete {count} selected users?',
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
             QMessageBox.StandardButton.No
         )
         
         if reply == QMessageBox.StandardButton.Yes:
-            for user_id in selected_users:
-                delete_user(user_id)
+            self.table.clear_selection()
+            if all_matching:
+                self.service.submit(
+                    user_service.delete_matching, self._query, exclude=selected_users,
+                    on_result=self._matching_deleted,
+                    on_error=self._show_error,
+                )
+            else:
+                self.service.submit(
+                    user_service.delete_users, selected_users,
+                    on_result=self._users_deleted,
+                    on_error=self._show_error,
+                )
+
+    def _matching_deleted(self, count):
+        """Reload after a select-all delete, whose deleted ids are not known here"""
+        self.statusBar().showMessage(f"Deleted {count} users", 5000)
+        self.load_users()
+        self.live_updates.expect(change_feed.ChangeOp.DELETE, [], count)
+
+    def import_users(self):
+        """Bulk import users from a CSV or JSONL file"""
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Import Users", "", "User files (*.csv *.jsonl *.ndjson);;All files (*)"
+        )
+        if not path:
+            return
+
+        progress_dialog = QProgressDialog("Importing users...", "Cancel", 0, 100, self)
+        progress_dialog.setWindowTitle("Import")
+        progress_dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        progress_dialog.setMinimumDuration(0)
+
+        def report(value):
+            done, total = value
+            progress_dialog.setValue(int(done * 100 / total) if total else 100)
+
+        def finished(result):
+            progress_dialog.close()
+            message = f"Imported {result.imported} users."
+            if result.skipped:
+                details = "\n".join(f"Line {line}: {error}" for line, error in result.errors[:10])
+                message += f"\nSkipped {result.skipped} rows"
+                if result.duplicates:
+                    message += f", {result.duplicates} of them with an email already in use"
+                message += f".\n\n{details}"
+            QMessageBox.information(self, "Import Complete", message)
             self.load_users()
+
+        def failed(error):
+            progress_dialog.close()
+            QMessageBox.critical(self, "Import Failed", str(error))
+
+        # Cancelling aborts the worker at its next chunk and rolls the import back
+        task = self.service.submit(
+            import_service.import_users, path,
+            report_progress=True,
+            on_progress=report,
+            on_result=finished,
+            on_error=failed,
+        )
+        progress_dialog.canceled.connect(task.cancel)
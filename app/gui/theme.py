@@ -0,0 +1,109 @@
+from PyQt6.QtGui import QColor
+
+# Design tokens. Widget styles reference them as ``$token`` and never use
+# literal colours. The neutral scale runs from the background end (50) to
+# the foreground end (950); the dark theme flips it, so a style written
+# against the light theme reads correctly in both.
+LIGHT = {
+    "neutral_0": "#ffffff",
+    "neutral_50": "#f8fafc",
+    "neutral_100": "#f1f5f9",
+    "neutral_200": "#e2e8f0",
+    "neutral_300": "#cbd5e1",
+    "neutral_400": "#94a3b8",
+    "neutral_500": "#64748b",
+    "neutral_600": "#475569",
+    "neutral_700": "#334155",
+    "neutral_800": "#1e293b",
+    "neutral_900": "#0f172a",
+    "neutral_950": "#020817",
+    "primary_hover": "#1a2c4d",
+    "on_accent": "#ffffff",
+    "danger": "#ef4444",
+    "danger_hover": "#dc2626",
+    "danger_pressed": "#b91c1c",
+    "danger_subtle": "#fecaca",
+    "success": "#22c55e",
+    "success_hover": "#16a34a",
+    "success_pressed": "#15803d",
+    "success_subtle": "#dcfce7",
+    "warning": "#f59e0b",
+    "warning_hover": "#d97706",
+    "warning_pressed": "#b45309",
+    "warning_subtle": "#fef3c7",
+    "info": "#3b82f6",
+    "info_hover": "#2563eb",
+    "info_pressed": "#1d4ed8",
+    "info_subtle": "#dbeafe",
+    # Application chrome
+    "window_bg": "#f5f5f5",
+    "surface": "#ffffff",
+    "border": "#e0e0e0",
+    "text": "#333333",
+    "gridline": "#f0f0f0",
+    "header_bg": "#f8f9fa",
+    "header_fg": "#2c3e50",
+    "row_checked": "#e3f2fd",
+    "field_border": "#dddddd",
+}
+
+DARK = {
+    **LIGHT,
+    "neutral_0": "#020817",
+    "neutral_50": "#0f172a",
+    "neutral_100": "#1e293b",
+    "neutral_200": "#334155",
+    "neutral_300": "#475569",
+    "neutral_400": "#64748b",
+    "neutral_500": "#8391a7",
+    "neutral_600": "#94a3b8",
+    "neutral_700": "#cbd5e1",
+    "neutral_800": "#e2e8f0",
+    "neutral_900": "#f1f5f9",
+    "neutral_950": "#f8fafc",
+    "primary_hover": "#cbd5e1",
+    "danger_subtle": "#450a0a",
+    "success_subtle": "#052e16",
+    "warning_subtle": "#451a03",
+    "info_subtle": "#172554",
+    "window_bg": "#020817",
+    "surface": "#0b1120",
+    "border": "#1e293b",
+    "text": "#e2e8f0",
+    "gridline": "#1e293b",
+    "header_bg": "#111827",
+    "header_fg": "#cbd5e1",
+    "row_checked": "#1e3a5f",
+    "field_border": "#334155",
+}
+
+THEMES = {"light": LIGHT, "dark": DARK}
+DEFAULT_THEME = "light"
+
+_current = DEFAULT_THEME
+_colors = {}  # (theme, token) -> QColor
+
+
+def current_theme():
+    return _current
+
+
+def tokens(name=None):
+    return THEMES[name or _current]
+
+
+def set_current_theme(name):
+    """Record the active theme; styles.set_theme() also restyles the app"""
+    global _current
+    if name not in THEMES:
+        raise ValueError(f"Unknown theme: {name!r}")
+    _current = name
+
+
+def color(token):
+    """Shared QColor for ``token`` in the active theme, for painting code"""
+    key = (_current, token)
+    value = _colors.get(key)
+    if value is None:
+        value = _colors[key] = QColor(THEMES[_current][token])
+    return value
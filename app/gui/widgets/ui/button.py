@@ -5,6 +5,9 @@ from enum import Enum
 import sys
 import os
 
+from app.gui import fonts
+from app.gui.widgets.ui import styles
+
 class ButtonVariant(Enum):
     DEFAULT = "default"
     DESTRUCTIVE = "destructive"
@@ -28,6 +31,279 @@ class ButtonSize(Enum):
     COMPACT = "compact"  # Very compact size
     SQUARE = "square"  # Square button with equal width and height
 
+# Base styles with improved typography
+BUTTON_BASE_STYLE = """
+    QPushButton {
+        border-radius: 4px;
+        font-weight: 500;
+        text-align: center;
+        letter-spacing: -0.011em;
+        line-height: 1.6;
+    }
+    QPushButton:focus {
+        outline: none;
+    }
+"""
+
+# Size styles with better vertical alignment
+BUTTON_SIZE_STYLES = {
+    ButtonSize.DEFAULT: """
+        QPushButton {
+            padding: 4px 12px;
+            font-size: 12px;
+            min-height: 28px;
+        }
+    """,
+    ButtonSize.SM: """
+        QPushButton {
+            padding: 4px 12px;
+            font-size: 12px;
+            min-height: 26px;
+        }
+    """,
+    ButtonSize.LG: """
+        QPushButton {
+            padding: 6px 14px;
+            font-size: 14px;
+            min-height: 36px;
+        }
+    """,
+    ButtonSize.ICON: """
+        QPushButton {
+            padding: 8px;
+            font-size: 14px;
+            min-height: 40px;
+            min-width: 40px;
+        }
+    """,
+    ButtonSize.XXS: """
+        QPushButton {
+            padding: 2px 8px;
+            font-size: 10px;
+            min-height: 20px;
+            border-radius: 2px;
+        }
+    """,
+    ButtonSize.XXL: """
+        QPushButton {
+            padding: 8px 20px;
+            font-size: 16px;
+            min-height: 44px;
+        }
+    """,
+    ButtonSize.COMPACT: """
+        QPushButton {
+            padding: 1px 6px;
+            font-size: 10px;
+            min-height: 18px;
+            border-radius: 2px;
+        }
+    """,
+    ButtonSize.SQUARE: """
+        QPushButton {
+            padding: 8px;
+            font-size: 12px;
+            min-height: 32px;
+            min-width: 32px;
+        }
+    """
+}
+
+# Variant styles with refined colors
+BUTTON_VARIANT_STYLES = {
+    ButtonVariant.DEFAULT: """
+        QPushButton {
+            background-color: $neutral_950;
+            color: $neutral_0;
+            border: none;
+        }
+        QPushButton:hover {
+            background-color: $primary_hover;
+        }
+        QPushButton:pressed {
+            background-color: $neutral_900;
+        }
+        QPushButton:disabled {
+            background-color: $neutral_200;
+            color: $neutral_400;
+        }
+    """,
+    ButtonVariant.DESTRUCTIVE: """
+        QPushButton {
+            background-color: $danger;
+            color: $on_accent;
+            border: none;
+        }
+        QPushButton:hover {
+            background-color: $danger_hover;
+        }
+        QPushButton:pressed {
+            background-color: $danger_pressed;
+        }
+        QPushButton:disabled {
+            background-color: $danger_subtle;
+            color: $danger;
+        }
+    """,
+    ButtonVariant.OUTLINE: """
+        QPushButton {
+            background-color: transparent;
+            color: $neutral_950;
+            border: 1px solid $neutral_200;
+        }
+        QPushButton:hover {
+            background-color: $neutral_50;
+            border-color: $neutral_300;
+        }
+        QPushButton:pressed {
+            background-color: $neutral_100;
+        }
+        QPushButton:disabled {
+            color: $neutral_400;
+            border-color: $neutral_200;
+        }
+    """,
+    ButtonVariant.SECONDARY: """
+        QPushButton {
+            background-color: $neutral_100;
+            color: $neutral_900;
+            border: none;
+        }
+        QPushButton:hover {
+            background-color: $neutral_200;
+        }
+        QPushButton:pressed {
+            background-color: $neutral_300;
+        }
+        QPushButton:disabled {
+            background-color: $neutral_50;
+            color: $neutral_400;
+        }
+    """,
+    ButtonVariant.GHOST: """
+        QPushButton {
+            background-color: transparent;
+            color: $neutral_900;
+            border: none;
+        }
+        QPushButton:hover {
+            background-color: $neutral_100;
+        }
+        QPushButton:pressed {
+            background-color: $neutral_200;
+        }
+        QPushButton:disabled {
+            color: $neutral_400;
+        }
+    """,
+    ButtonVariant.LINK: """
+        QPushButton {
+            background-color: transparent;
+            color: $neutral_900;
+            border: none;
+            text-decoration: underline;
+            padding: 0;
+        }
+        QPushButton:hover {
+            color: $neutral_800;
+        }
+        QPushButton:pressed {
+            color: $neutral_900;
+        }
+        QPushButton:disabled {
+            color: $neutral_400;
+        }
+    """,
+    ButtonVariant.SUCCESS: """
+        QPushButton {
+            background-color: $success;
+            color: $on_accent;
+            border: none;
+        }
+        QPushButton:hover {
+            background-color: $success_hover;
+        }
+        QPushButton:pressed {
+            background-color: $success_pressed;
+        }
+        QPushButton:disabled {
+            background-color: $success_subtle;
+            color: $success;
+        }
+    """,
+    ButtonVariant.WARNING: """
+        QPushButton {
+            background-color: $warning;
+            color: $on_accent;
+            border: none;
+        }
+        QPushButton:hover {
+            background-color: $warning_hover;
+        }
+        QPushButton:pressed {
+            background-color: $warning_pressed;
+        }
+        QPushButton:disabled {
+            background-color: $warning_subtle;
+            color: $warning;
+        }
+    """,
+    ButtonVariant.INFO: """
+        QPushButton {
+            background-color: $info;
+            color: $on_accent;
+            border: none;
+        }
+        QPushButton:hover {
+            background-color: $info_hover;
+        }
+        QPushButton:pressed {
+            background-color: $info_pressed;
+        }
+        QPushButton:disabled {
+            background-color: $info_subtle;
+            color: $info;
+        }
+    """,
+    ButtonVariant.DARK: """
+        QPushButton {
+            background-color: $neutral_900;
+            color: $neutral_0;
+            border: none;
+        }
+        QPushButton:hover {
+            background-color: $neutral_800;
+        }
+        QPushButton:pressed {
+            background-color: $neutral_700;
+        }
+        QPushButton:disabled {
+            background-color: $neutral_800;
+            color: $neutral_500;
+        }
+    """,
+    ButtonVariant.LIGHT: """
+        QPushButton {
+            background-color: $neutral_50;
+            color: $neutral_900;
+            border: 1px solid $neutral_200;
+        }
+        QPushButton:hover {
+            background-color: $neutral_100;
+        }
+        QPushButton:pressed {
+            background-color: $neutral_200;
+        }
+        QPushButton:disabled {
+            background-color: $neutral_50;
+            color: $neutral_400;
+            border-color: $neutral_200;
+        }
+    """
+}
+
+styles.register("button", "QPushButton", BUTTON_BASE_STYLE, BUTTON_SIZE_STYLES, BUTTON_VARIANT_STYLES)
+
 class Button(QPushButton):
     def __init__(self, text, parent=None, variant=ButtonVariant.DEFAULT, 
                  size=ButtonSize.DEFAULT, icon=None, disabled=False):
@@ -40,291 +316,27 @@ class Button(QPushButton):
         if icon:
             self.setIcon(icon)
         
-        # Setup font 
-        font = QFont()
-        font.setFamily("Inter, sans-serif")
-        font.setWeight(QFont.Weight.Medium)
-        self.setFont(font)
+        # Shared, already-resolved font from the registry
+        self.setFont(fonts.get_font(QFont.Weight.Medium))
         
         # Apply styling
         self.apply_styling()
     
     def apply_styling(self):
-        # Base styles with improved typography
-        base_style = """
-            QPushButton {
-                border-radius: 4px;
-                font-weight: 500;
-                text-align: center;
-                letter-spacing: -0.011em;
-                line-height: 1.6;
-            }
-            QPushButton:focus {
-                outline: none;
-            }
-        """
-        
-        # Size styles with better vertical alignment
-        size_styles = {
-            ButtonSize.DEFAULT: """
-                QPushButton {
-                    padding: 4px 12px;
-                    font-size: 12px;
-                    min-height: 28px;
-                }
-            """,
-            ButtonSize.SM: """
-                QPushButton {
-                    padding: 4px 12px;
-                    font-size: 12px;
-                    min-height: 26px;
-                }
-            """,
-            ButtonSize.LG: """
-                QPushButton {
-                    padding: 6px 14px;
-                    font-size: 14px;
-                    min-height: 36px;
-                }
-            """,
-            ButtonSize.ICON: """
-                QPushButton {
-                    padding: 8px;
-                    font-size: 14px;
-                    min-height: 40px;
-                    min-width: 40px;
-                }
-            """,
-            ButtonSize.XXS: """
-                QPushButton {
-                    padding: 2px 8px;
-                    font-size: 10px;
-                    min-height: 20px;
-                    border-radius: 2px;
-                }
-            """,
-            ButtonSize.XXL: """
-                QPushButton {
-                    padding: 8px 20px;
-                    font-size: 16px;
-                    min-height: 44px;
-                }
-            """,
-            ButtonSize.COMPACT: """
-                QPushButton {
-                    padding: 1px 6px;
-                    font-size: 10px;
-                    min-height: 18px;
-                    border-radius: 2px;
-                }
-            """,
-            ButtonSize.SQUARE: """
-                QPushButton {
-                    padding: 8px;
-                    font-size: 12px;
-                    min-height: 32px;
-                    min-width: 32px;
-                }
-            """
-        }
-        
-        # Variant styles with refined colors
-        variant_styles = {
-            ButtonVariant.DEFAULT: """
-                QPushButton {
-                    background-color: #020817;
-                    color: #ffffff;
-                    border: none;
-                }
-                QPushButton:hover {
-                    background-color: #1a2c4d;
-                }
-                QPushButton:pressed {
-                    background-color: #0f172a;
-                }
-                QPushButton:disabled {
-                    background-color: #e2e8f0;
-                    color: #94a3b8;
-                }
-            """,
-            ButtonVariant.DESTRUCTIVE: """
-                QPushButton {
-                    background-color: #ef4444;
-                    color: #ffffff;
-                    border: none;
-                }
-                QPushButton:hover {
-                    background-color: #dc2626;
-                }
-                QPushButton:pressed {
-                    background-color: #b91c1c;
-                }
-                QPushButton:disabled {
-                    background-color: #fecaca;
-                    color: #ef4444;
-                }
-            """,
-            ButtonVariant.OUTLINE: """
-                QPushButton {
-                    background-color: transparent;
-                    color: #020817;
-                    border: 1px solid #e2e8f0;
-                }
-                QPushButton:hover {
-                    background-color: #f8fafc;
-                    border-color: #cbd5e1;
-                }
-                QPushButton:pressed {
-                    background-color: #f1f5f9;
-                }
-                QPushButton:disabled {
-                    color: #94a3b8;
-                    border-color: #e2e8f0;
-                }
-            """,
-            ButtonVariant.SECONDARY: """
-                QPushButton {
-                    background-color: #f1f5f9;
-                    color: #0f172a;
-                    border: none;
-                }
-                QPushButton:hover {
-                    background-color: #e2e8f0;
-                }
-                QPushButton:pressed {
-                    background-color: #cbd5e1;
-                }
-                QPushButton:disabled {
-                    background-color: #f8fafc;
-                    color: #94a3b8;
-                }
-            """,
-            ButtonVariant.GHOST: """
-                QPushButton {
-                    background-color: transparent;
-                    color: #0f172a;
-                    border: none;
-                }
-                QPushButton:hover {
-                    background-color: #f1f5f9;
-                }
-                QPushButton:pressed {
-                    background-color: #e2e8f0;
-                }
-                QPushButton:disabled {
-                    color: #94a3b8;
-                }
-            """,
-            ButtonVariant.LINK: """
-                QPushButton {
-                    background-color: transparent;
-                    color: #0f172a;
-                    border: none;
-                    text-decoration: underline;
-                    padding: 0;
-                }
-                QPushButton:hover {
-                    color: #1e293b;
-                }
-                QPushButton:pressed {
-                    color: #0f172a;
-                }
-                QPushButton:disabled {
-                    color: #94a3b8;
-                }
-            """,
-            ButtonVariant.SUCCESS: """
-                QPushButton {
-                    background-color: #22c55e;
-                    color: #ffffff;
-                    border: none;
-                }
-                QPushButton:hover {
-                    background-color: #16a34a;
-                }
-                QPushButton:pressed {
-                    background-color: #15803d;
-                }
-                QPushButton:disabled {
-                    background-color: #dcfce7;
-                    color: #22c55e;
-                }
-            """,
-            ButtonVariant.WARNING: """
-                QPushButton {
-                    background-color: #f59e0b;
-                    color: #ffffff;
-                    border: none;
-                }
-                QPushButton:hover {
-                    background-color: #d97706;
-                }
-                QPushButton:pressed {
-                    background-color: #b45309;
-                }
-                QPushButton:disabled {
-                    background-color: #fef3c7;
-                    color: #f59e0b;
-                }
-            """,
-            ButtonVariant.INFO: """
-                QPushButton {
-                    background-color: #3b82f6;
-                    color: #ffffff;
-                    border: none;
-                }
-                QPushButton:hover {
-                    background-color: #2563eb;
-                }
-                QPushButton:pressed {
-                    background-color: #1d4ed8;
-                }
-                QPushButton:disabled {
-                    background-color: #dbeafe;
-                    color: #3b82f6;
-                }
-            """,
-            ButtonVariant.DARK: """
-                QPushButton {
-                    background-color: #0f172a;
-                    color: #ffffff;
-                    border: none;
-                }
-                QPushButton:hover {
-                    background-color: #1e293b;
-                }
-                QPushButton:pressed {
-                    background-color: #334155;
-                }
-                QPushButton:disabled {
-                    background-color: #1e293b;
-                    color: #64748b;
-                }
-            """,
-            ButtonVariant.LIGHT: """
-                QPushButton {
-                    background-color: #f8fafc;
-                    color: #0f172a;
-                    border: 1px solid #e2e8f0;
-                }
-                QPushButton:hover {
-                    background-color: #f1f5f9;
-                }
-                QPushButton:pressed {
-                    background-color: #e2e8f0;
-                }
-                QPushButton:disabled {
-                    background-color: #f8fafc;
-                    color: #94a3b8;
-                    border-color: #e2e8f0;
-                }
-            """
-        }
-        
-        # Combine styles
-        combined_style = base_style + size_styles[self.size] + variant_styles[self.variant]
-        self.setStyleSheet(combined_style)
-        
+        # Styles live in the shared application stylesheet; only tag this widget
+        styles.apply(self, "button", self.variant, self.size)
+
+    def set_variant(self, variant):
+        """Change button variant"""
+        self.variant = variant
+        self.apply_styling()
+
+    def set_size(self, size):
+        """Change button size"""
+        self.size = size
+        self.apply_styling()
+        self.updateGeometry()
+
     def sizeHint(self):
         if self.size == ButtonSize.ICON:
             return QSize(40, 40)
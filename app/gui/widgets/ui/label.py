@@ -3,6 +3,9 @@ from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont
 from enum import Enum
 
+from app.gui import fonts
+from app.gui.widgets.ui import styles
+
 class LabelVariant(Enum):
     DEFAULT = "default"
     PRIMARY = "primary"
@@ -24,6 +27,116 @@ class LabelSize(Enum):
     XXL = "xxl"  # Extra extra large
     COMPACT = "compact"  # Very compact size
 
+# Base styles
+LABEL_BASE_STYLE = """
+    QLabel {
+        letter-spacing: -0.011em;
+        line-height: 1.4;
+    }
+"""
+
+# Size styles
+LABEL_SIZE_STYLES = {
+    LabelSize.DEFAULT: """
+        QLabel {
+            font-size: 14px;
+            padding: 2px 0;
+        }
+    """,
+    LabelSize.SM: """
+        QLabel {
+            font-size: 13px;
+            padding: 1px 0;
+        }
+    """,
+    LabelSize.XS: """
+        QLabel {
+            font-size: 12px;
+            padding: 1px 0;
+        }
+    """,
+    LabelSize.LG: """
+        QLabel {
+            font-size: 16px;
+            padding: 3px 0;
+        }
+    """,
+    LabelSize.XXS: """
+        QLabel {
+            font-size: 11px;
+            padding: 0;
+        }
+    """,
+    LabelSize.XXL: """
+        QLabel {
+            font-size: 18px;
+            padding: 4px 0;
+        }
+    """,
+    LabelSize.COMPACT: """
+        QLabel {
+            font-size: 10px;
+            padding: 0;
+        }
+    """
+}
+
+# Variant styles
+LABEL_VARIANT_STYLES = {
+    LabelVariant.DEFAULT: """
+        QLabel {
+            color: $neutral_900;
+        }
+    """,
+    LabelVariant.PRIMARY: """
+        QLabel {
+            color: $info;
+        }
+    """,
+    LabelVariant.SECONDARY: """
+        QLabel {
+            color: $neutral_500;
+        }
+    """,
+    LabelVariant.SUCCESS: """
+        QLabel {
+            color: $success;
+        }
+    """,
+    LabelVariant.WARNING: """
+        QLabel {
+            color: $warning;
+        }
+    """,
+    LabelVariant.ERROR: """
+        QLabel {
+            color: $danger;
+        }
+    """,
+    LabelVariant.INFO: """
+        QLabel {
+            color: $info;
+        }
+    """,
+    LabelVariant.DARK: """
+        QLabel {
+            color: $neutral_900;
+        }
+    """,
+    LabelVariant.LIGHT: """
+        QLabel {
+            color: $neutral_50;
+        }
+    """,
+    LabelVariant.MUTED: """
+        QLabel {
+            color: $neutral_400;
+        }
+    """
+}
+
+styles.register("label", "QLabel", LABEL_BASE_STYLE, LABEL_SIZE_STYLES, LABEL_VARIANT_STYLES)
+
 class Label(QLabel):
     def __init__(self, text="", parent=None, variant=LabelVariant.DEFAULT, 
                  size=LabelSize.DEFAULT, bold=False, italic=False, 
@@ -34,127 +147,14 @@ class Label(QLabel):
         self.size = size
         self.setAlignment(align)
         
-        # Setup font
-        font = QFont()
-        font.setFamily("Inter, sans-serif")
-        font.setBold(bold)
-        font.setItalic(italic)
-        self.setFont(font)
+        # Shared, already-resolved font from the registry
+        self.setFont(fonts.get_font(self._weight(bold), italic=italic))
 
         self.apply_styling()
     
     def apply_styling(self):
-        # Base styles
-        base_style = """
-            QLabel {
-                letter-spacing: -0.011em;
-                line-height: 1.4;
-            }
-        """
-        
-        # Size styles
-        size_styles = {
-            LabelSize.DEFAULT: """
-                QLabel {
-                    font-size: 14px;
-                    padding: 2px 0;
-                }
-            """,
-            LabelSize.SM: """
-                QLabel {
-                    font-size: 13px;
-                    padding: 1px 0;
-                }
-            """,
-            LabelSize.XS: """
-                QLabel {
-                    font-size: 12px;
-                    padding: 1px 0;
-                }
-            """,
-            LabelSize.LG: """
-                QLabel {
-                    font-size: 16px;
-                    padding: 3px 0;
-                }
-            """,
-            LabelSize.XXS: """
-                QLabel {
-                    font-size: 11px;
-                    padding: 0;
-                }
-            """,
-            LabelSize.XXL: """
-                QLabel {
-                    font-size: 18px;
-                    padding: 4px 0;
-                }
-            """,
-            LabelSize.COMPACT: """
-                QLabel {
-                    font-size: 10px;
-                    padding: 0;
-                }
-            """
-        }
-        
-        # Variant styles
-        variant_styles = {
-            LabelVariant.DEFAULT: """
-                QLabel {
-                    color: #0f172a;
-                }
-            """,
-            LabelVariant.PRIMARY: """
-                QLabel {
-                    color: #3b82f6;
-                }
-            """,
-            LabelVariant.SECONDARY: """
-                QLabel {
-                    color: #64748b;
-                }
-            """,
-            LabelVariant.SUCCESS: """
-                QLabel {
-                    color: #22c55e;
-                }
-            """,
-            LabelVariant.WARNING: """
-                QLabel {
-                    color: #f59e0b;
-                }
-            """,
-            LabelVariant.ERROR: """
-                QLabel {
-                    color: #ef4444;
-                }
-            """,
-            LabelVariant.INFO: """
-                QLabel {
-                    color: #3b82f6;
-                }
-            """,
-            LabelVariant.DARK: """
-                QLabel {
-                    color: #0f172a;
-                }
-            """,
-            LabelVariant.LIGHT: """
-                QLabel {
-                    color: #f8fafc;
-                }
-            """,
-            LabelVariant.MUTED: """
-                QLabel {
-                    color: #94a3b8;
-                }
-            """
-        }
-        
-        # Combine styles
-        combined_style = base_style + size_styles[self.size] + variant_styles[self.variant]
-        self.setStyleSheet(combined_style)
+        # Styles live in the shared application stylesheet; only tag this widget
+        styles.apply(self, "label", self.variant, self.size)
 
     def set_text(self, text):
         """Set text with current styling"""
@@ -162,15 +162,15 @@ class Label(QLabel):
 
     def set_bold(self, bold=True):
         """Set bold font weight"""
-        font = self.font()
-        font.setBold(bold)
-        self.setFont(font)
+        self.setFont(fonts.get_font(self._weight(bold), italic=self.font().italic()))
 
     def set_italic(self, italic=True):
         """Set italic font style"""
-        font = self.font()
-        font.setItalic(italic)
-        self.setFont(font)
+        self.setFont(fonts.get_font(self.font().weight(), italic=italic))
+
+    @staticmethod
+    def _weight(bold):
+        return QFont.Weight.Bold if bold else QFont.Weight.Normal
 
     def set_align(self, align):
         """Set text alignment"""
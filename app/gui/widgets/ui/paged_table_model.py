@@ -0,0 +1,377 @@
+import bisect
+import time
+from collections import OrderedDict
+
+from PyQt6.QtCore import QModelIndex, pyqtSignal
+
+from app.gui.widgets.ui.table_model import TableModel, _ranges_descending
+
+DEFAULT_BLOCK_SIZE = 200
+DEFAULT_MAX_BLOCKS = 20
+
+# Cursors remembered for re-fetching evicted blocks by key range: one
+# small entry per visited block boundary, keyed by row index and capped.
+MAX_HINTS = 10000
+
+
+class PagedTableModel(TableModel):
+    """
+    Table model over a row set far larger than what is kept in memory.
+
+    ``rowCount`` is the total number of rows, but only ``max_blocks`` blocks
+    of ``block_size`` rows are held, in LRU order; painting a row touches
+    its block. A row whose block is missing shows a placeholder and the
+    block is requested through ``block_requested(block, generation, after,
+    before)``. The owner loads it on a worker and answers with
+    ``set_block``, or ``block_failed`` on error; a failed block is requested
+    again when painted after a backoff.
+
+    ``after`` and ``before`` are ``(cursor, gap)`` pairs built from the
+    cursors the owner handed over with earlier blocks: the nearest
+    remembered row above the block (or below it), and the number of rows
+    between that row and the block. Blocks next to loaded or evicted ones
+    have a gap of 0 and are read purely by key range; otherwise the owner
+    seeks to the cursor and skips ``gap`` rows, which is never more than
+    the offset from the top. Only the closer of the two is given; with
+    neither, the owner has to seek by offset.
+
+    Requests for blocks far from the newest one are dropped with
+    ``block_cancelled`` so dragging the scrollbar does not queue a fetch
+    for every block passed on the way.
+
+    Rows must be in ascending key order. Single rows can then be inserted,
+    updated and removed in place, even when their block is not loaded:
+    only the loaded rows are re-bucketed, so a mutation costs at most
+    ``max_blocks * block_size`` steps however large the table is.
+    """
+    block_requested = pyqtSignal(int, int, object, object)  # block, generation, after, before
+    block_cancelled = pyqtSignal(int, int)  # block, generation
+
+    def __init__(self, parent=None, show_checkbox=True, key_column=0,
+                 block_size=DEFAULT_BLOCK_SIZE, max_blocks=DEFAULT_MAX_BLOCKS):
+        super().__init__(parent, show_checkbox=show_checkbox, key_column=key_column)
+        self.block_size = block_size
+        self.max_blocks = max_blocks
+        self._total = 0
+        self._generation = 0
+        self._blocks = OrderedDict()  # block -> list of row tuples
+        self._pending = set()
+        self._failed = {}  # block -> monotonic time it may be requested again
+        self._hints = OrderedDict()  # row index -> cursor of that row
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._total
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return False
+
+    # Loading
+
+    def reset(self, total=0):
+        """Drop every block and start over with ``total`` rows"""
+        self.beginResetModel()
+        self._generation += 1
+        self._total = total
+        self._blocks.clear()
+        self._pending.clear()
+        self._failed.clear()
+        self._failures = 0
+        self._hints.clear()
+        self.endResetModel()
+
+    def clear(self):
+        self._all_checked = False
+        self._toggled = set()
+        self.reset(0)
+
+    @property
+    def generation(self):
+        return self._generation
+
+    def set_total(self, total):
+        """Grow or shrink the row count, e.g. once a count query returns"""
+        if total > self._total:
+            self.beginInsertRows(QModelIndex(), self._total, total - 1)
+            self._total = total
+            self.endInsertRows()
+        elif total < self._total:
+            self.beginRemoveRows(QModelIndex(), total, self._total - 1)
+            self._total = total
+            last_block = (total - 1) // self.block_size if total else -1
+            for block in [block for block in self._blocks if block > last_block]:
+                del self._blocks[block]
+            self.endRemoveRows()
+
+    def request_block(self, block):
+        """Ask for ``block`` unless it is loaded or already on its way"""
+        if self._is_complete(block) or block in self._pending:
+            return
+        if block in self._failed:
+            if time.monotonic() < self._failed[block]:
+                return
+            del self._failed[block]
+        # Anything far from the newest request is no longer on screen
+        for stale in [other for other in self._pending if abs(other - block) > self.max_blocks // 2]:
+            self._pending.discard(stale)
+            self.block_cancelled.emit(stale, self._generation)
+        self._pending.add(block)
+        self.block_requested.emit(block, self._generation, *self._seek_hints(block))
+
+    def set_block(self, block, generation, rows, first_hint=None, last_hint=None):
+        """Store a block delivered for ``block_requested``"""
+        if generation != self._generation or block not in self._pending:
+            return
+        self._pending.discard(block)
+        self._failures = 0
+        rows = [tuple(row) for row in rows]
+        start = block * self.block_size
+
+        if len(rows) < self.block_size:
+            # A short block is the end of the data, whatever the count said
+            self.set_total(start + len(rows))
+        elif start + len(rows) > self._total:
+            self.set_total(start + len(rows))
+        if not rows:
+            return
+
+        self._blocks[block] = rows
+        self._blocks.move_to_end(block)
+        while len(self._blocks) > self.max_blocks:
+            self._blocks.popitem(last=False)
+        for row, hint in ((start, first_hint), (start + len(rows) - 1, last_hint)):
+            if hint is not None:
+                self._hints[row] = hint
+                self._hints.move_to_end(row)
+        while len(self._hints) > MAX_HINTS:
+            self._hints.popitem(last=False)
+
+        self.dataChanged.emit(
+            self.index(start, 0), self.index(start + len(rows) - 1, self.columnCount() - 1)
+        )
+
+    def block_failed(self, block, generation):
+        """
+        Hold off requesting a block whose load failed. Returns the backoff in
+        milliseconds, or None if the request was already abandoned.
+        """
+        if generation != self._generation or block not in self._pending:
+            return None
+        self._pending.discard(block)
+        delay = self._back_off()
+        self._failed[block] = self._retry_at
+        return delay
+
+    def loaded_blocks(self):
+        return list(self._blocks)
+
+    def preload(self, total, rows):
+        """
+        Start over with ``total`` rows, the first of which are ``rows``, e.g.
+        from a saved snapshot; only what fits in ``max_blocks`` is kept.
+        """
+        rows = rows[:self.max_blocks * self.block_size]
+        self.reset(max(total, len(rows)))
+        for start in range(0, len(rows), self.block_size):
+            self._blocks[start // self.block_size] = [tuple(row) for row in rows[start:start + self.block_size]]
+
+    def leading_rows(self):
+        """The loaded rows from the top of the table down to the first gap"""
+        rows = []
+        block = 0
+        while block in self._blocks:
+            rows.extend(self._blocks[block])
+            if len(self._blocks[block]) < self.block_size:
+                break
+            block += 1
+        return rows
+
+    # Row deltas
+
+    def update_row(self, key, values):
+        row = self.find_row(key)
+        if row < 0:
+            return False
+        block, offset = divmod(row, self.block_size)
+        self._blocks[block][offset] = tuple(values)
+        self.dataChanged.emit(self.index(row, 0), self.index(row, self.columnCount() - 1))
+        return True
+
+    def remove_keys(self, keys):
+        """
+        Remove the rows holding ``keys``, which must all exist.
+
+        A key that is not loaded lies in the unloaded gap between the loaded
+        rows around it in key order; a row at the end of that gap is removed
+        in its place, which shifts the loaded rows after it correctly.
+        """
+        keys = set(keys)
+        self._toggled -= keys
+        entries = sorted(self._loaded_rows())
+        loaded = {values[self.key_column]: row for row, values in entries}
+        ordered_keys = [values[self.key_column] for _, values in entries]
+
+        rows = {loaded[key] for key in keys if key in loaded}
+        for key in sorted(keys - loaded.keys()):
+            position = bisect.bisect_left(ordered_keys, key)
+            previous = entries[position - 1][0] if position else -1
+            candidate = (entries[position][0] if position < len(entries) else self._total) - 1
+            while candidate in rows:
+                candidate -= 1
+            if candidate > previous:
+                rows.add(candidate)
+                self._drop_hints(previous, candidate)
+
+        for first, last in _ranges_descending(rows):
+            count = last - first + 1
+            self.beginRemoveRows(QModelIndex(), first, last)
+            self._total -= count
+            self._remap(lambda row: row if row < first else (None if row <= last else row - count))
+            self.endRemoveRows()
+        return len(rows)
+
+    def insert_by_key(self, values):
+        """Insert a row before the first loaded row with a greater key"""
+        values = tuple(values)
+        entries = sorted(self._loaded_rows())
+        ordered_keys = [row_values[self.key_column] for _, row_values in entries]
+        position = bisect.bisect_right(ordered_keys, values[self.key_column])
+        row = entries[position][0] if position < len(entries) else self._total
+        self._drop_hints(entries[position - 1][0] if position else -1, row)
+        self.insert_row(row, values)
+
+    def _remap(self, new_row, added=None):
+        """
+        Move the loaded rows and hints to new row indices after an insert or
+        removal; ``new_row`` returns None for removed rows.
+
+        Blocks are rebuilt from the moved rows, keeping only the leading run
+        of each one; an incomplete block is fetched again when painted.
+        Fetches still in flight were made against the old layout and are
+        abandoned.
+        """
+        moved = {}
+        order = []
+        for row, values in self._loaded_rows():
+            index = new_row(row)
+            if index is not None:
+                moved[index] = values
+                order.append(index // self.block_size)
+        for index, values in (added or {}).items():
+            moved[index] = values
+            order.append(index // self.block_size)
+
+        blocks = OrderedDict()
+        for block in reversed(list(dict.fromkeys(reversed(order)))):
+            start = block * self.block_size
+            run = []
+            for index in range(start, min(start + self.block_size, self._total)):
+                values = moved.get(index)
+                if values is None:
+                    break
+                run.append(values)
+            if run:
+                blocks[block] = run
+        self._blocks = blocks
+
+        hints = OrderedDict()
+        for row, hint in self._hints.items():
+            index = new_row(row)
+            if index is not None:
+                hints[index] = hint
+        self._hints = hints
+
+        for block in self._pending:
+            self.block_cancelled.emit(block, self._generation)
+        self._pending.clear()
+        self._failed.clear()
+        self._generation += 1
+
+    def _seek_hints(self, block):
+        """(after, before) for ``block_requested``: whichever is fewest rows away"""
+        start = block * self.block_size
+        end = start + self.block_size
+        above = max((row for row in self._hints if row < start), default=None)
+        below = min((row for row in self._hints if row >= end), default=None)
+        choices = [(start, None, None)]
+        if above is not None:
+            choices.append((start - above - 1, (self._hints[above], start - above - 1), None))
+        if below is not None:
+            choices.append((below - end, None, (self._hints[below], below - end)))
+        _, after, before = min(choices, key=lambda choice: choice[0])
+        return after, before
+
+    def _drop_hints(self, after, before):
+        """
+        Forget the cursors of unloaded rows strictly between ``after`` and
+        ``before``: a row changed somewhere among them, so their exact
+        positions are no longer known.
+        """
+        for row in [row for row in self._hints if after < row < before]:
+            del self._hints[row]
+
+    def _is_complete(self, block):
+        rows = self._blocks.get(block)
+        if rows is None:
+            return False
+        return len(rows) == self.block_size or block * self.block_size + len(rows) >= self._total
+
+    # Row storage used by TableModel
+
+    def _values(self, row):
+        block, offset = divmod(row, self.block_size)
+        rows = self._blocks.get(block)
+        if rows is None:
+            self.request_block(block)
+            return None
+        self._blocks.move_to_end(block)
+        if offset < len(rows):
+            return rows[offset]
+        self.request_block(block)
+        return None
+
+    def _loaded_rows(self):
+        for block, rows in list(self._blocks.items()):
+            start = block * self.block_size
+            for offset, values in enumerate(rows):
+                yield start + offset, values
+
+    # Direct row operations. Rows beyond what the blocks can hold are
+    # requested through block_requested like any evicted block.
+
+    def set_rows(self, rows):
+        """Replace every row"""
+        rows = [tuple(row) for row in rows]
+        self.preload(len(rows), rows)
+
+    def append_rows(self, rows):
+        """Append rows after the last one with a single insert notification"""
+        rows = [tuple(row) for row in rows]
+        if not rows:
+            return
+        first = self._total
+        # A short block in flight would end the table before the new rows
+        for block in [block for block in self._pending if (block + 1) * self.block_size > first]:
+            self._pending.discard(block)
+            self.block_cancelled.emit(block, self._generation)
+
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self._total += len(rows)
+        for index, values in enumerate(rows, start=first):
+            block, offset = divmod(index, self.block_size)
+            if offset == 0:
+                self._blocks[block] = []
+            stored = self._blocks.get(block)
+            # Blocks hold a leading run of rows; a row after a gap is left out
+            if stored is not None and len(stored) == offset:
+                stored.append(values)
+                self._blocks.move_to_end(block)
+        while len(self._blocks) > self.max_blocks:
+            self._blocks.popitem(last=False)
+        self.endInsertRows()
+
+    def insert_row(self, row_index, values):
+        """Insert a row at ``row_index``, shifting the rows below it"""
+        self.beginInsertRows(QModelIndex(), row_index, row_index)
+        self._total += 1
+        self._remap(lambda index: index + 1 if index >= row_index else index, {row_index: tuple(values)})
+        self.endInsertRows()
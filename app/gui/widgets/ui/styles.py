@@ -0,0 +1,180 @@
+"""
+Application-wide stylesheet shared by the custom widgets.
+
+Each widget module registers its base, size and variant styles once. They
+are compiled into a single stylesheet installed on the QApplication, with
+every rule scoped by dynamic properties::
+
+    QPushButton[uiComponent="button"]            base rules
+    QPushButton[uiSize="sm"]                     size rules
+    QPushButton[uiVariant="destructive"]:hover   variant rules
+
+A widget then only sets its properties; Qt parses the stylesheet once
+instead of once per widget, and changing a variant or size is a property
+flip plus a repolish.
+
+Colours are written as ``$token`` references into ``app.gui.theme``. The
+sheet is compiled once per theme and cached, so switching themes is a
+single ``QApplication.setStyleSheet`` call.
+"""
+import logging
+import re
+import time
+from contextlib import contextmanager
+from string import Template
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QApplication
+
+from app.gui import theme
+
+COMPONENT_PROPERTY = "uiComponent"
+VARIANT_PROPERTY = "uiVariant"
+SIZE_PROPERTY = "uiSize"
+
+_RULE = re.compile(r"([^{}]+)\{([^{}]*)\}")
+
+_components = {}  # name -> (widget selector, base css, size css by enum, variant css by enum)
+_globals = {}  # name -> unscoped css placed before the component rules
+_compiled = {}  # theme name -> stylesheet
+_installed = None  # (application, stylesheet) last installed
+_suspended = False  # see suspended()
+
+# Duration of the most recent compile and apply, in milliseconds
+last_timings = {"compile_ms": 0.0, "apply_ms": 0.0}
+
+logger = logging.getLogger(__name__)
+
+
+def register(name, selector, base, sizes, variants):
+    """Register the styles of a widget class under ``name``"""
+    _components[name] = (selector, base, sizes, variants)
+    _compiled.clear()
+
+
+def register_global(name, css):
+    """Register plain application rules, e.g. the main window's layout styles"""
+    _globals[name] = css
+    _compiled.clear()
+
+
+def _scope(css, selector, condition):
+    """Qualify every rule in ``css`` with ``selector[condition]``"""
+    scoped = selector + condition
+
+    def qualify(part):
+        part = part.strip()
+        if part.startswith(selector):
+            return scoped + part[len(selector):]
+        # Sub-widgets such as the table's header view
+        return f"{scoped} {part}"
+
+    rules = []
+    for selectors, body in _RULE.findall(css):
+        qualified = ", ".join(qualify(part) for part in selectors.split(","))
+        rules.append(f"{qualified} {{{body}}}")
+    return "\n".join(rules)
+
+
+def _build_template():
+    sections = list(_globals.values())
+    # Same cascade as the old per-widget sheets: base, then size, then variant
+    for name, (selector, base, _, _) in _components.items():
+        sections.append(_scope(base, selector, f'[{COMPONENT_PROPERTY}="{name}"]'))
+    for selector, _, sizes, _ in _components.values():
+        for size, css in sizes.items():
+            sections.append(_scope(css, selector, f'[{SIZE_PROPERTY}="{size.value}"]'))
+    for selector, _, _, variants in _components.values():
+        for variant, css in variants.items():
+            sections.append(_scope(css, selector, f'[{VARIANT_PROPERTY}="{variant.value}"]'))
+    return "\n".join(sections)
+
+
+def compile_stylesheet(theme_name=None):
+    """Return the combined stylesheet for a theme, building it on first use"""
+    theme_name = theme_name or theme.current_theme()
+    stylesheet = _compiled.get(theme_name)
+    if stylesheet is None:
+        started = time.perf_counter()
+        stylesheet = Template(_build_template()).substitute(theme.tokens(theme_name))
+        _compiled[theme_name] = stylesheet
+        last_timings["compile_ms"] = (time.perf_counter() - started) * 1000
+    return stylesheet
+
+
+def clear_compiled():
+    """Forget the compiled stylesheets, so the next use compiles cold (benchmarks)"""
+    _compiled.clear()
+
+
+def standalone_stylesheet(name, variant, size):
+    """The unshared per-widget stylesheet the widgets used to build (benchmarks)"""
+    _, base, sizes, variants = _components[name]
+    return Template(base + sizes[size] + variants[variant]).substitute(theme.tokens())
+
+
+def ensure_installed():
+    """Install the compiled stylesheet on the application if it is not current"""
+    global _installed
+    app = QApplication.instance()
+    if app is None or _suspended:
+        return
+    stylesheet = compile_stylesheet()
+    if _installed is not None and _installed[0] is app and _installed[1] is stylesheet:
+        return
+    started = time.perf_counter()
+    app.setStyleSheet(stylesheet)
+    last_timings["apply_ms"] = (time.perf_counter() - started) * 1000
+    _installed = (app, stylesheet)
+
+
+@contextmanager
+def suspended():
+    """
+    Run without the shared stylesheet: the application sheet is removed and
+    widgets are not tagged, as before it existed (benchmarks).
+    """
+    global _installed, _suspended
+    app = QApplication.instance()
+    _suspended = True
+    if app is not None:
+        app.setStyleSheet("")
+    _installed = None
+    try:
+        yield
+    finally:
+        _suspended = False
+        ensure_installed()
+
+
+def set_theme(name):
+    """
+    Switch every widget to theme ``name`` with one application-wide update.
+
+    Returns the compile and apply durations; compiling is skipped when the
+    theme's stylesheet is already cached.
+    """
+    theme.set_current_theme(name)
+    last_timings["compile_ms"] = 0.0
+    ensure_installed()
+    logger.debug(
+        "Theme %s: compiled in %.2f ms, applied in %.2f ms",
+        name, last_timings["compile_ms"], last_timings["apply_ms"],
+    )
+    return dict(last_timings)
+
+
+def apply(widget, name, variant, size):
+    """Tag ``widget`` with its component, variant and size properties"""
+    if _suspended:
+        return
+    ensure_installed()
+    widget.setProperty(COMPONENT_PROPERTY, name)
+    widget.setProperty(VARIANT_PROPERTY, variant.value)
+    widget.setProperty(SIZE_PROPERTY, size.value)
+    # Widgets that were already polished must be repolished to pick up the change
+    if widget.testAttribute(Qt.WidgetAttribute.WA_WState_Polished):
+        style = widget.style()
+        style.unpolish(widget)
+        style.polish(widget)
+        widget.update()
@@ -1,11 +1,11 @@
-from PyQt6.QtWidgets import (
-    QTableWidget, QTableWidgetItem, QHeaderView,
-    QWidget, QHBoxLayout, QCheckBox
-)
-from PyQt6.QtCore import Qt, pyqtSignal
-from PyQt6.QtGui import QColor
+from PyQt6.QtWidgets import QTableView, QHeaderView, QAbstractItemView
+from PyQt6.QtCore import Qt, QModelIndex, QTimer, pyqtSignal
 from enum import Enum
 
+from app.gui.widgets.ui import styles
+from app.gui.widgets.ui.paged_table_model import PagedTableModel
+from app.gui.widgets.ui.table_model import CheckBoxDelegate, TableModel
+
 class TableVariant(Enum):
     DEFAULT = "default"
     STRIPED = "striped"
@@ -18,10 +18,94 @@ class TableSize(Enum):
     LG = "lg"
     COMPACT = "compact"
 
-class Table(QTableWidget):
+# Base styles
+TABLE_BASE_STYLE = """
+    QTableView {
+        border: none;
+        background-color: $surface;
+        color: $neutral_900;
+        gridline-color: $gridline;
+    }
+    QTableView::item {
+        padding: 8px;
+    }
+"""
+
+# Size styles
+TABLE_SIZE_STYLES = {
+    TableSize.DEFAULT: """
+        QTableView::item {
+            padding: 8px;
+        }
+    """,
+    TableSize.SM: """
+        QTableView::item {
+            padding: 6px;
+        }
+    """,
+    TableSize.LG: """
+        QTableView::item {
+            padding: 10px;
+        }
+    """,
+    TableSize.COMPACT: """
+        QTableView::item {
+            padding: 4px;
+        }
+    """
+}
+
+# Variant styles
+TABLE_VARIANT_STYLES = {
+    TableVariant.DEFAULT: """
+        QTableView {
+            border: none;
+        }
+    """,
+    TableVariant.STRIPED: """
+        QTableView {
+            alternate-background-color: $header_bg;
+        }
+    """,
+    TableVariant.BORDERED: """
+        QTableView {
+            border: 1px solid $border;
+        }
+        QTableView::item {
+            border-bottom: 1px solid $border;
+        }
+    """,
+    TableVariant.COMPACT: """
+        QTableView::item {
+            padding: 2px;
+        }
+    """
+}
+
+# Header styles
+TABLE_HEADER_STYLE = """
+    QHeaderView::section {
+        background-color: $header_bg;
+        padding: 8px;
+        border: none;
+        border-bottom: 1px solid $border;
+        font-weight: bold;
+        color: $header_fg;
+    }
+"""
+
+styles.register(
+    "table", "QTableView",
+    TABLE_BASE_STYLE + TABLE_HEADER_STYLE, TABLE_SIZE_STYLES, TABLE_VARIANT_STYLES
+)
+
+class Table(QTableView):
     # Custom signals
     row_selected = pyqtSignal(int)  # Emits row index when selected
     checkbox_changed = pyqtSignal(int, bool)  # Emits row index and checked state
+    fetch_requested = pyqtSignal()  # More rows are wanted; answer with fetch_finished()
+    block_requested = pyqtSignal(int, int, object, object)  # Paged tables: answer with set_block()
+    block_cancelled = pyqtSignal(int, int)
 
     def __init__(
         self,
@@ -30,7 +114,9 @@ class Table(QTableWidget):
         size=TableSize.DEFAULT,
         show_checkbox=True,
         row_height=50,
-        selection_mode=QTableWidget.SelectionMode.NoSelection
+        selection_mode=QAbstractItemView.SelectionMode.NoSelection,
+        prefetch_rows=100,
+        paged=False
     ):
         super().__init__(parent)
         
@@ -38,167 +124,212 @@ class Table(QTableWidget):
         self.size = size
         self.show_checkbox = show_checkbox
         self.row_height = row_height
+        self.selection_mode = selection_mode
+        self.prefetch_rows = prefetch_rows
+
+        if paged:
+            # Bounded block cache: only the blocks around the viewport stay loaded
+            self.table_model = PagedTableModel(self, show_checkbox=show_checkbox)
+            self.table_model.block_requested.connect(self.block_requested)
+            self.table_model.block_cancelled.connect(self.block_cancelled)
+        else:
+            self.table_model = TableModel(self, show_checkbox=show_checkbox)
+        self.table_model.checked_changed.connect(self.checkbox_changed)
+        self.table_model.fetch_requested.connect(self.fetch_requested)
+        self.setModel(self.table_model)
+        if show_checkbox:
+            self.checkbox_delegate = CheckBoxDelegate(self)
+            self.setItemDelegateForColumn(0, self.checkbox_delegate)
         
         self._setup_table()
         self._apply_styling()
 
     def _setup_table(self):
         """Setup basic table properties"""
-        self.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
-        self.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.setSelectionMode(QTableWidget.SelectionMode.NoSelection)
-        self.verticalHeader().setVisible(False)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.setSelectionMode(self.selection_mode)
         self.setAlternatingRowColors(self.variant == TableVariant.STRIPED)
+        self.horizontalHeader().setDefaultAlignment(Qt.AlignmentFlag.AlignCenter)
+
+        # Every row has the same fixed height, so the view can map scroll
+        # position to rows arithmetically and paints only the visible ones
+        vertical_header = self.verticalHeader()
+        vertical_header.setVisible(False)
+        vertical_header.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        vertical_header.setDefaultSectionSize(self.row_height)
+
+        # Qt only asks for more rows once the scrollbar hits the bottom; check
+        # after every scroll, resize and load instead, so the next page is
+        # requested while ``prefetch_rows`` rows are still left to scroll
+        self._prefetch_timer = QTimer(self)
+        self._prefetch_timer.setSingleShot(True)
+        self._prefetch_timer.setInterval(0)
+        self._prefetch_timer.timeout.connect(self._prefetch)
+        self.verticalScrollBar().valueChanged.connect(self._prefetch_timer.start)
+        self.table_model.rowsInserted.connect(self._prefetch_timer.start)
+        self.table_model.modelReset.connect(self._prefetch_timer.start)
+
+    def _prefetch(self):
+        """Request more rows if the viewport is not filled or nearly scrolled through"""
+        model = self.table_model
+        last_visible = self.rowAt(self.viewport().height() - 1)
+        if isinstance(model, PagedTableModel):
+            # Load the blocks on screen plus prefetch_rows either side of it
+            rows = model.rowCount()
+            if not rows:
+                return
+            first_visible = max(self.rowAt(0), 0)
+            if last_visible < 0:
+                last_visible = rows - 1
+            first = max(first_visible - self.prefetch_rows, 0) // model.block_size
+            last = min(last_visible + self.prefetch_rows, rows - 1) // model.block_size
+            visible = range(first_visible // model.block_size, last_visible // model.block_size + 1)
+            for block in [*visible, *range(first, last + 1)]:
+                model.request_block(block)
+            return
+        if not model.canFetchMore(QModelIndex()):
+            return
+        if last_visible < 0 or model.rowCount() - 1 - last_visible <= self.prefetch_rows:
+            model.fetchMore(QModelIndex())
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._prefetch_timer.start()
 
     def _apply_styling(self):
         """Apply styling based on variant and size"""
-        # Base styles
-        base_style = """
-            QTableWidget {
-                border: none;
-                background-color: white;
-                gridline-color: #f0f0f0;
-            }
-            QTableWidget::item {
-                padding: 8px;
-            }
-        """
-        
-        # Size styles
-        size_styles = {
-            TableSize.DEFAULT: """
-                QTableWidget::item {
-                    padding: 8px;
-                }
-            """,
-            TableSize.SM: """
-                QTableWidget::item {
-                    padding: 6px;
-                }
-            """,
-            TableSize.LG: """
-                QTableWidget::item {
-                    padding: 10px;
-                }
-            """,
-            TableSize.COMPACT: """
-                QTableWidget::item {
-                    padding: 4px;
-                }
-            """
-        }
-        
-        # Variant styles
-        variant_styles = {
-            TableVariant.DEFAULT: """
-                QTableWidget {
-                    border: none;
-                }
-            """,
-            TableVariant.STRIPED: """
-                QTableWidget {
-                    alternate-background-color: #f8f9fa;
-                }
-            """,
-            TableVariant.BORDERED: """
-                QTableWidget {
-                    border: 1px solid #e0e0e0;
-                }
-                QTableWidget::item {
-                    border-bottom: 1px solid #e0e0e0;
-                }
-            """,
-            TableVariant.COMPACT: """
-                QTableWidget::item {
-                    padding: 2px;
-                }
-            """
-        }
-        
-        # Header styles
-        header_style = """
-            QHeaderView::section {
-                background-color: #f8f9fa;
-                padding: 8px;
-                border: none;
-                border-bottom: 1px solid #e0e0e0;
-                font-weight: bold;
-                color: #2c3e50;
-            }
-        """
-        
-        # Combine all styles
-        self.setStyleSheet(
-            base_style +
-            size_styles[self.size] +
-            variant_styles[self.variant] +
-            header_style
-        )
+        # Styles live in the shared application stylesheet; only tag this widget
+        styles.apply(self, "table", self.variant, self.size)
 
     def set_headers(self, headers):
         """Set table headers"""
-        self.setColumnCount(len(headers))
-        self.setHorizontalHeaderLabels(headers)
-        
-        # Set header alignment
-        for i in range(len(headers)):
-            header_item = self.horizontalHeaderItem(i)
-            if header_item:
-                header_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.table_model.set_headers(headers)
 
     def add_row(self, data, row_index=None):
         """Add a row to the table"""
         if row_index is None:
-            row_index = self.rowCount()
-        
-        self.insertRow(row_index)
-        self.setRowHeight(row_index, self.row_height)
-        
-        # Add checkbox if enabled
-        if self.show_checkbox:
-            checkbox = QCheckBox()
-            checkbox_widget = QWidget()
-            checkbox_layout = QHBoxLayout(checkbox_widget)
-            checkbox_layout.addWidget(checkbox)
-            checkbox_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            checkbox_layout.setContentsMargins(0, 0, 0, 0)
-            
-            # Connect checkbox signal
-            checkbox.stateChanged.connect(
-                lambda state, r=row_index: self.checkbox_changed.emit(r, state == Qt.CheckState.Checked.value)
-            )
-            
-            self.setCellWidget(row_index, 0, checkbox_widget)
-            start_col = 1
-        else:
-            start_col = 0
-        
-        # Add data cells
-        for col, value in enumerate(data):
-            item = QTableWidgetItem(str(value))
-            if col == 0 and not self.show_checkbox:  # ID column
-                item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.setItem(row_index, col + start_col, item)
+            row_index = self.table_model.rowCount()
+        self.table_model.insert_row(row_index, data)
+
+    def set_rows(self, rows):
+        """Replace all rows at once"""
+        self.table_model.set_rows(rows)
+
+    def append_rows(self, rows):
+        """Append many rows with a single model update"""
+        self.table_model.append_rows(rows)
+
+    def clear_rows(self):
+        """Remove all rows"""
+        self.table_model.clear()
+
+    def set_can_fetch_more(self, can_fetch):
+        """Enable incremental loading; fetch_requested fires as rows are needed"""
+        self.table_model.set_can_fetch_more(can_fetch)
+        self._prefetch_timer.start()
+
+    def fetch_finished(self, rows, has_more):
+        """Append a page loaded in answer to fetch_requested"""
+        self.table_model.fetch_finished(rows, has_more)
+        self._prefetch_timer.start()
+
+    def fetch_failed(self):
+        """Report that loading for fetch_requested failed; it is retried after a backoff"""
+        delay = self.table_model.fetch_failed()
+        QTimer.singleShot(delay, self._prefetch_timer.start)
+
+    def reset_rows(self, total=0):
+        """Paged tables: drop all blocks and show ``total`` placeholder rows"""
+        self.table_model.reset(total)
+
+    def set_total_rows(self, total):
+        """Paged tables: adjust the row count without dropping loaded blocks"""
+        self.table_model.set_total(total)
+
+    def set_block(self, block, generation, rows, first_hint=None, last_hint=None):
+        """Paged tables: deliver a block loaded for block_requested"""
+        self.table_model.set_block(block, generation, rows, first_hint, last_hint)
+
+    def block_failed(self, block, generation):
+        """Paged tables: the load failed; the block is requested again after a backoff"""
+        delay = self.table_model.block_failed(block, generation)
+        if delay is not None:
+            # Placeholders request their block again when repainted
+            QTimer.singleShot(delay, self.viewport().update)
+
+    def preload_rows(self, total, rows):
+        """Paged tables: show ``total`` rows whose first ``rows`` are already known"""
+        self.table_model.preload(total, rows)
+
+    def leading_rows(self):
+        """Paged tables: the loaded rows from the top down to the first unloaded block"""
+        return self.table_model.leading_rows()
+
+    def request_block(self, block):
+        self.table_model.request_block(block)
+
+    def update_row(self, key, values):
+        """Update the row holding ``key`` in place; False if it is not loaded"""
+        return self.table_model.update_row(key, values)
+
+    def remove_keys(self, keys):
+        """Remove the rows holding ``keys``, keeping scroll position and checks"""
+        return self.table_model.remove_keys(keys)
+
+    def insert_by_key(self, values):
+        """Insert a row at its place in key order"""
+        self.table_model.insert_by_key(values)
+
+    def row_data(self, row):
+        """Return the values of a row, without the checkbox column"""
+        return self.table_model.row_data(row)
+
+    def rowCount(self):
+        return self.table_model.rowCount()
+
+    def columnCount(self):
+        return self.table_model.columnCount()
 
     def get_selected_rows(self):
         """Get list of selected row indices"""
-        selected_rows = []
-        for row in range(self.rowCount()):
-            if self.show_checkbox:
-                checkbox_widget = self.cellWidget(row, 0)
-                checkbox = checkbox_widget.findChild(QCheckBox)
-                if checkbox and checkbox.isChecked():
-                    selected_rows.append(row)
-        return selected_rows
+        if not self.show_checkbox:
+            return []
+        return self.table_model.checked_rows()
+
+    def get_selected_keys(self):
+        """Get the keys (first data column) of all checked rows"""
+        if not self.show_checkbox:
+            return []
+        return self.table_model.checked_keys()
+
+    def get_selection(self):
+        """
+        (all selected, keys): when every row is selected, ``keys`` are the
+        rows excluded since; otherwise they are the selected rows
+        """
+        if not self.show_checkbox:
+            return False, set()
+        return self.table_model.selection()
+
+    def loaded_keys(self):
+        """Keys of the rows currently held in memory"""
+        return self.table_model.loaded_keys()
+
+    def find_row(self, key):
+        """Return the index of the row whose key is ``key``, or -1"""
+        return self.table_model.find_row(key)
+
+    def select_all(self):
+        """Check every row, including rows loaded later"""
+        self.table_model.check_all()
+
+    def is_all_selected(self):
+        return self.table_model.all_checked()
 
     def clear_selection(self):
         """Clear all checkboxes"""
-        for row in range(self.rowCount()):
-            if self.show_checkbox:
-                checkbox_widget = self.cellWidget(row, 0)
-                checkbox = checkbox_widget.findChild(QCheckBox)
-                if checkbox:
-                    checkbox.setChecked(False)
+        self.table_model.clear_checked()
 
     def set_variant(self, variant):
         """Change table variant"""
@@ -209,4 +340,4 @@ class Table(QTableWidget):
     def set_size(self, size):
         """Change table size"""
         self.size = size
-        self._apply_styling() 
\ No newline at end of file
+        self._apply_styling() 
@@ -0,0 +1,352 @@
+import bisect
+import time
+
+from PyQt6.QtCore import Qt, QAbstractTableModel, QEvent, QModelIndex, QRect, pyqtSignal
+from PyQt6.QtWidgets import QApplication, QStyle, QStyledItemDelegate, QStyleOptionButton
+
+from app.gui import theme
+
+# Failed loads are retried after this delay, doubled per consecutive failure
+RETRY_DELAY_MS = 1000
+MAX_RETRY_DELAY_MS = 30000
+
+
+class TableModel(QAbstractTableModel):
+    """
+    Row store behind ``Table``.
+
+    Rows are kept as plain tuples and only turned into display text when
+    the view asks for a visible cell, so no per-cell objects exist. When
+    ``show_checkbox`` is set, column 0 is a check column and the data
+    columns follow it.
+
+    Check state is tracked by row key (the value in data column
+    ``key_column``), not by row index, so it survives rows being inserted
+    or reloaded. "Select all" is stored as a flag plus the set of keys
+    toggled since, which keeps select-all and clear O(1) and listing the
+    checked keys O(selected).
+
+    Rows can also be loaded incrementally through Qt's ``canFetchMore`` /
+    ``fetchMore`` protocol: ``fetchMore`` only emits ``fetch_requested``,
+    the owner loads the next page asynchronously and hands it back with
+    ``fetch_finished``, or calls ``fetch_failed`` so it is retried after a
+    backoff. At most one fetch is outstanding at a time.
+    """
+    checked_changed = pyqtSignal(int, bool)  # row index, checked state
+    fetch_requested = pyqtSignal()
+
+    placeholder = "…"  # shown in rows whose values are not loaded yet
+
+    def __init__(self, parent=None, show_checkbox=True, key_column=0):
+        super().__init__(parent)
+        self.show_checkbox = show_checkbox
+        self.key_column = key_column
+        self._headers = []
+        self._rows = []
+        self._all_checked = False
+        self._toggled = set()  # keys whose state differs from _all_checked
+        self._can_fetch = False
+        self._fetching = False
+        self._failures = 0  # consecutive failed loads
+        self._retry_at = 0.0  # monotonic time before which a failed load is not retried
+
+    # Qt model interface
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._headers)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return (
+            not parent.isValid() and self._can_fetch and not self._fetching
+            and time.monotonic() >= self._retry_at
+        )
+
+    def fetchMore(self, parent=QModelIndex()):
+        if self.canFetchMore(parent):
+            self._fetching = True
+            self.fetch_requested.emit()
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            if section < len(self._headers):
+                return self._headers[section]
+        return None
+
+    def flags(self, index):
+        flags = Qt.ItemFlag.ItemIsEnabled
+        if self._is_check_column(index.column()) and self._values(index.row()) is not None:
+            flags |= Qt.ItemFlag.ItemIsUserCheckable
+        return flags
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+
+        if role == Qt.ItemDataRole.BackgroundRole:
+            return theme.color("row_checked") if self.show_checkbox and self.is_checked(row) else None
+
+        if self._is_check_column(column):
+            if role == Qt.ItemDataRole.CheckStateRole:
+                return Qt.CheckState.Checked if self.is_checked(row) else Qt.CheckState.Unchecked
+            return None
+
+        values = self._values(row)
+        data_column = column - 1 if self.show_checkbox else column
+        if role == Qt.ItemDataRole.DisplayRole:
+            if values is None:
+                return self.placeholder
+            if data_column >= len(values):
+                return None
+            return str(values[data_column])
+        if role == Qt.ItemDataRole.TextAlignmentRole and data_column == 0 and not self.show_checkbox:
+            return Qt.AlignmentFlag.AlignCenter  # ID column
+        return None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if role != Qt.ItemDataRole.CheckStateRole or not self._is_check_column(index.column()):
+            return False
+        checked = Qt.CheckState(value) == Qt.CheckState.Checked
+        self.set_checked(index.row(), checked)
+        return True
+
+    # Bulk row operations
+
+    def set_headers(self, headers):
+        self.beginResetModel()
+        self._headers = list(headers)
+        self.endResetModel()
+
+    def set_rows(self, rows):
+        """Replace every row with a single model reset"""
+        self.beginResetModel()
+        self._rows = [tuple(row) for row in rows]
+        self.endResetModel()
+
+    def append_rows(self, rows):
+        """Append rows with a single insert notification"""
+        rows = [tuple(row) for row in rows]
+        if not rows:
+            return
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self._rows.extend(rows)
+        self.endInsertRows()
+
+    def insert_row(self, row_index, values):
+        self.beginInsertRows(QModelIndex(), row_index, row_index)
+        self._rows.insert(row_index, tuple(values))
+        self.endInsertRows()
+
+    def clear(self):
+        """Remove all rows and forget the check state and pending fetch"""
+        self._all_checked = False
+        self._toggled = set()
+        self._can_fetch = False
+        self._fetching = False
+        self._failures = 0
+        self._retry_at = 0.0
+        self.set_rows([])
+
+    # Incremental loading
+
+    def set_can_fetch_more(self, can_fetch):
+        """Declare whether more rows exist beyond the ones loaded"""
+        self._can_fetch = can_fetch
+
+    def fetch_finished(self, rows, has_more):
+        """Append a page delivered for ``fetch_requested``"""
+        self._fetching = False
+        self._failures = 0
+        self._can_fetch = has_more
+        self.append_rows(rows)
+
+    def fetch_failed(self):
+        """
+        The load for ``fetch_requested`` failed; more rows are still expected.
+        Returns the delay in milliseconds before ``canFetchMore`` allows a retry.
+        """
+        self._fetching = False
+        return self._back_off()
+
+    def is_fetching(self):
+        return self._fetching
+
+    def _back_off(self):
+        self._failures += 1
+        delay = min(RETRY_DELAY_MS * 2 ** (self._failures - 1), MAX_RETRY_DELAY_MS)
+        self._retry_at = time.monotonic() + delay / 1000
+        return delay
+
+    # Row deltas, applied in place of a reload
+
+    def update_row(self, key, values):
+        """Replace the values of the row holding ``key``; False if it is not loaded"""
+        row = self.find_row(key)
+        if row < 0:
+            return False
+        self._rows[row] = tuple(values)
+        self.dataChanged.emit(self.index(row, 0), self.index(row, self.columnCount() - 1))
+        return True
+
+    def remove_keys(self, keys):
+        """Remove the rows holding ``keys`` and forget their check state"""
+        keys = set(keys)
+        self._toggled -= keys
+        rows = [row for row, values in self._loaded_rows() if values[self.key_column] in keys]
+        for first, last in _ranges_descending(rows):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self._rows[first:last + 1]
+            self.endRemoveRows()
+        return len(rows)
+
+    def insert_by_key(self, values):
+        """Insert a row at its place in ascending key order"""
+        values = tuple(values)
+        keys = [row[self.key_column] for row in self._rows]
+        self.insert_row(bisect.bisect_right(keys, values[self.key_column]), values)
+
+    def row_data(self, row):
+        return self._values(row)
+
+    def row_key(self, row):
+        values = self._values(row)
+        return None if values is None else values[self.key_column]
+
+    def find_row(self, key):
+        """Row index holding ``key``, or -1"""
+        for row, values in self._loaded_rows():
+            if values[self.key_column] == key:
+                return row
+        return -1
+
+    def loaded_keys(self):
+        """Keys of every row held in memory"""
+        return {values[self.key_column] for _, values in self._loaded_rows()}
+
+    def _values(self, row):
+        """Values of ``row``, or None while they are not loaded"""
+        return self._rows[row]
+
+    def _loaded_rows(self):
+        """(row index, values) of every row held in memory"""
+        return enumerate(self._rows)
+
+    # Check state
+
+    def is_key_checked(self, key):
+        return self._all_checked != (key in self._toggled)
+
+    def is_checked(self, row):
+        return self.is_key_checked(self.row_key(row))
+
+    def set_checked(self, row, checked):
+        key = self.row_key(row)
+        if key is None or self.is_key_checked(key) == checked:
+            return
+        self._toggled ^= {key}
+        self.dataChanged.emit(self.index(row, 0), self.index(row, self.columnCount() - 1))
+        self.checked_changed.emit(row, checked)
+
+    def check_all(self):
+        self._all_checked = True
+        self._toggled = set()
+        self._emit_all_changed()
+
+    def clear_checked(self):
+        self._all_checked = False
+        self._toggled = set()
+        self._emit_all_changed()
+
+    def all_checked(self):
+        return self._all_checked and not self._toggled
+
+    def checked_keys(self):
+        """
+        Keys of every checked row; O(selected) unless select-all is active.
+        With select-all, only rows held in memory are listed; use
+        ``selection`` when rows may not be loaded.
+        """
+        if not self._all_checked:
+            return list(self._toggled)
+        return [values[self.key_column] for _, values in self._loaded_rows() if values[self.key_column] not in self._toggled]
+
+    def selection(self):
+        """
+        (all checked, keys): with select-all active every row except ``keys``
+        is checked, including rows never loaded; otherwise only ``keys`` are
+        """
+        return self._all_checked, set(self._toggled)
+
+    def checked_rows(self):
+        if not self._all_checked and not self._toggled:
+            return []
+        return [row for row, values in self._loaded_rows() if self.is_key_checked(values[self.key_column])]
+
+    def _emit_all_changed(self):
+        # One notification repaints whatever is visible
+        rows = self.rowCount()
+        if rows:
+            self.dataChanged.emit(self.index(0, 0), self.index(rows - 1, self.columnCount() - 1))
+
+    def _is_check_column(self, column):
+        return self.show_checkbox and column == 0
+
+
+def _ranges_descending(rows):
+    """Group row indices into (first, last) runs, last run first"""
+    ranges = []
+    for row in sorted(set(rows)):
+        if ranges and ranges[-1][1] == row - 1:
+            ranges[-1][1] = row
+        else:
+            ranges.append([row, row])
+    return [tuple(pair) for pair in reversed(ranges)]
+
+
+class CheckBoxDelegate(QStyledItemDelegate):
+    """Paints a centered checkbox from CheckStateRole and toggles it on click"""
+
+    def paint(self, painter, option, index):
+        style = option.widget.style() if option.widget else QApplication.style()
+        self.initStyleOption(option, index)
+        # Background only (selection, alternating colours, highlight)
+        option.features &= ~option.ViewItemFeature.HasCheckIndicator
+        option.text = ""
+        style.drawControl(QStyle.ControlElement.CE_ItemViewItem, option, painter, option.widget)
+
+        checkbox = QStyleOptionButton()
+        checkbox.rect = self._indicator_rect(option, style)
+        checkbox.state = QStyle.StateFlag.State_Enabled
+        checked = index.data(Qt.ItemDataRole.CheckStateRole) == Qt.CheckState.Checked
+        checkbox.state |= QStyle.StateFlag.State_On if checked else QStyle.StateFlag.State_Off
+        style.drawPrimitive(QStyle.PrimitiveElement.PE_IndicatorCheckBox, checkbox, painter, option.widget)
+
+    def editorEvent(self, event, model, option, index):
+        if not index.flags() & Qt.ItemFlag.ItemIsUserCheckable:
+            return False
+        toggles = (
+            event.type() == QEvent.Type.MouseButtonRelease
+            and event.button() == Qt.MouseButton.LeftButton
+            and option.rect.contains(event.position().toPoint())
+        ) or (
+            event.type() == QEvent.Type.KeyPress
+            and event.key() in (Qt.Key.Key_Space, Qt.Key.Key_Select)
+        )
+        if not toggles:
+            # Swallow presses and double clicks so they do not reach the view
+            return event.type() in (QEvent.Type.MouseButtonPress, QEvent.Type.MouseButtonDblClick)
+        checked = index.data(Qt.ItemDataRole.CheckStateRole) == Qt.CheckState.Checked
+        new_state = Qt.CheckState.Unchecked if checked else Qt.CheckState.Checked
+        return model.setData(index, new_state.value, Qt.ItemDataRole.CheckStateRole)
+
+    @staticmethod
+    def _indicator_rect(option, style):
+        width = style.pixelMetric(QStyle.PixelMetric.PM_IndicatorWidth, None, option.widget)
+        height = style.pixelMetric(QStyle.PixelMetric.PM_IndicatorHeight, None, option.widget)
+        rect = QRect(0, 0, width, height)
+        rect.moveCenter(option.rect.center())
+        return rect
@@ -0,0 +1,153 @@
+import inspect
+import threading
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+def default_thread_count():
+    """Worker threads per service: more than pooled connections would only queue on the pool"""
+    # Imported here, off the path to the first window; the settings load pydantic
+    from app.core.config import settings
+
+    return max(1, min(4, settings.DB_POOL_SIZE))
+
+
+class TaskCancelled(Exception):
+    """Raised inside a worker when its task has been cancelled"""
+
+
+class Task(QObject):
+    """
+    Handle for a function running on the worker pool.
+
+    Signals are emitted from the worker thread and delivered on the GUI
+    thread. Generator functions report each yielded item through
+    ``progress``; plain functions can report through ``report()``.
+    """
+    progress = pyqtSignal(object)
+    result = pyqtSignal(object)
+    error = pyqtSignal(object)
+    finished = pyqtSignal()
+
+    def __init__(self, fn, args, kwargs, parent=None):
+        super().__init__(parent)
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        """Ask the task to stop; no further results are delivered"""
+        self._cancelled.set()
+
+    def is_cancelled(self):
+        return self._cancelled.is_set()
+
+    def report(self, *values):
+        """Progress callback for worker code; aborts the task once cancelled"""
+        if self.is_cancelled():
+            raise TaskCancelled()
+        self.progress.emit(values[0] if len(values) == 1 else values)
+
+
+class _TaskRunnable(QRunnable):
+    def __init__(self, task):
+        super().__init__()
+        self.task = task
+
+    def run(self):
+        task = self.task
+        try:
+            if task.is_cancelled():
+                return
+            value = task.fn(*task.args, **task.kwargs)
+            if inspect.isgenerator(value):
+                try:
+                    for item in value:
+                        if task.is_cancelled():
+                            return
+                        task.progress.emit(item)
+                finally:
+                    value.close()
+                value = None
+            if not task.is_cancelled():
+                task.result.emit(value)
+        except TaskCancelled:
+            pass
+        except Exception as exc:
+            if not task.is_cancelled():
+                task.error.emit(exc)
+        finally:
+            task.finished.emit()
+
+
+class AsyncService(QObject):
+    """
+    Runs blocking service calls on a QThreadPool so the GUI thread never
+    waits on the database.
+
+    ``busy_changed`` fires when the first task starts and when the last one
+    finishes, which is enough to drive a busy indicator.
+    """
+    busy_changed = pyqtSignal(bool)
+
+    def __init__(self, parent=None, max_threads=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads or default_thread_count())
+        self._tasks = set()
+
+    def submit(self, fn, *args, on_result=None, on_error=None, on_progress=None,
+               report_progress=False, **kwargs):
+        """
+        Run ``fn(*args, **kwargs)`` on a worker thread and return its Task.
+
+        Callbacks run on the GUI thread and are skipped once the task is
+        cancelled. With ``report_progress`` the task's ``report`` method is
+        passed to ``fn`` as its ``progress`` keyword argument.
+        """
+        task = Task(fn, args, kwargs, self)
+        if report_progress:
+            kwargs["progress"] = task.report
+
+        def guarded(callback):
+            def deliver(value):
+                if not task.is_cancelled():
+                    callback(value)
+            return deliver
+
+        if on_result:
+            task.result.connect(guarded(on_result))
+        if on_error:
+            task.error.connect(guarded(on_error))
+        if on_progress:
+            task.progress.connect(guarded(on_progress))
+        task.finished.connect(lambda: self._finish(task))
+
+        self._tasks.add(task)
+        if len(self._tasks) == 1:
+            self.busy_changed.emit(True)
+        self.pool.start(_TaskRunnable(task))
+        return task
+
+    def _finish(self, task):
+        self._tasks.discard(task)
+        task.deleteLater()
+        if not self._tasks:
+            self.busy_changed.emit(False)
+
+    def set_max_threads(self, count):
+        self.pool.setMaxThreadCount(count)
+
+    def is_busy(self):
+        return bool(self._tasks)
+
+    def cancel_all(self):
+        for task in list(self._tasks):
+            task.cancel()
+
+    def shutdown(self, timeout_ms=3000):
+        """Cancel outstanding work and wait for running workers to exit"""
+        self.cancel_all()
+        self.pool.clear()
+        self.pool.waitForDone(timeout_ms)
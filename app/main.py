@@ -1,11 +1,68 @@
 import sys
-from PyQt6.QtWidgets import QApplication
-from app.gui.main_window import MainWindow
-from app.db.init_db import init_db
 
-if __name__ == "__main__":
-    init_db() # Khoi tao database
-    app = QApplication(sys.argv)
-    window = MainWindow()
+from app.core import startup
+
+
+def _watch_startup(window):
+    """
+    --profile-startup: mark the first paint and the first paint after the
+    initial rows have loaded, then print the report and quit.
+    """
+    from PyQt6.QtCore import QEvent, QObject
+
+    class Watcher(QObject):
+        painted = False
+        loaded = False
+
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Type.Paint:
+                if obj is window and not self.painted:
+                    self.painted = True
+                    startup.mark("first paint")
+                elif obj is window.table.viewport() and self.loaded:
+                    startup.mark("first rows painted")
+                    window.table.viewport().removeEventFilter(self)
+                    print(startup.report(), file=sys.stderr)
+                    window.close()
+            return False
+
+        def busy_changed(self, busy):
+            # The first idle moment after the schema check: count and first block are in
+            if not busy and window.table_group.isEnabled() and not self.loaded:
+                self.loaded = True
+                startup.mark("initial load done")
+                window.table.viewport().update()
+
+    watcher = Watcher(window)
+    window.installEventFilter(watcher)
+    window.table.viewport().installEventFilter(watcher)
+    window.service.busy_changed.connect(watcher.busy_changed)
+
+
+def main(argv=None):
+    argv = list(sys.argv if argv is None else argv)
+    if "--profile-startup" in argv:
+        argv.remove("--profile-startup")
+        startup.enable()
+    # Database imports, schema check and pool warm-up overlap with building the UI
+    database = startup.start_database()
+
+    with startup.span("import Qt"):
+        from PyQt6.QtWidgets import QApplication
+    app = QApplication(argv)
+    with startup.span("fonts"):
+        from app.gui.fonts import get_font, load_fonts
+        load_fonts()  # Register bundled fonts once, before any widget exists
+        app.setFont(get_font())
+    with startup.span("import main window"):
+        from app.gui.main_window import MainWindow
+    with startup.span("build main window"):
+        window = MainWindow(database)
+    if startup.enabled():
+        _watch_startup(window)
     window.show()
-    sys.exit(app.exec())
\ No newline at end of file
+    return app.exec()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
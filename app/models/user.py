@@ -1,7 +1,89 @@
+from sqlalchemy import Index, func, text
 from sqlmodel import SQLModel, Field
 
+NAME_MAX_LENGTH = 255
+EMAIL_MAX_LENGTH = 255
+
 class User(SQLModel, table=True):
     __tablename__ = "Users"
     id: int | None = Field(default=None, primary_key=True)
-    name: str
-    email: str
+    name: str = Field(max_length=NAME_MAX_LENGTH)
+    email: str = Field(max_length=EMAIL_MAX_LENGTH)
+    # Bumped by every update; lets an edit check nobody changed the row since it was read
+    version: int = Field(default=1, sa_column_kwargs={"server_default": text("1"), "nullable": False})
+
+
+# Indexes are applied to existing databases by app.db.migrations.
+# (column, id) pairs back keyset pagination in name/email order.
+Index("ux_Users_email", User.email, unique=True)
+Index("ix_Users_name_id", User.name, User.id)
+# Case-insensitive lookups and sorting
+Index("ix_Users_lower_name", func.lower(User.name))
+Index("ix_Users_lower_email", func.lower(User.email))
+
+# Substring search indexes that have no portable SQLAlchemy construct:
+# trigram GIN indexes on PostgreSQL, an FTS5 trigram table on SQLite.
+SEARCH_INDEX_DDL = {
+    "postgresql": [
+        'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+        'CREATE INDEX IF NOT EXISTS "ix_Users_name_trgm" ON "Users" USING gin (lower(name) gin_trgm_ops)',
+        'CREATE INDEX IF NOT EXISTS "ix_Users_email_trgm" ON "Users" USING gin (lower(email) gin_trgm_ops)',
+    ],
+    "sqlite": [
+        'CREATE VIRTUAL TABLE IF NOT EXISTS "Users_fts" USING fts5('
+        "name, email, content='Users', content_rowid='id', tokenize='trigram')",
+        'CREATE TRIGGER IF NOT EXISTS "Users_fts_ai" AFTER INSERT ON "Users" BEGIN '
+        'INSERT INTO "Users_fts"(rowid, name, email) VALUES (new.id, new.name, new.email); END',
+        'CREATE TRIGGER IF NOT EXISTS "Users_fts_ad" AFTER DELETE ON "Users" BEGIN '
+        'INSERT INTO "Users_fts"("Users_fts", rowid, name, email) VALUES (\'delete\', old.id, old.name, old.email); END',
+        'CREATE TRIGGER IF NOT EXISTS "Users_fts_au" AFTER UPDATE ON "Users" BEGIN '
+        'INSERT INTO "Users_fts"("Users_fts", rowid, name, email) VALUES (\'delete\', old.id, old.name, old.email); '
+        'INSERT INTO "Users_fts"(rowid, name, email) VALUES (new.id, new.name, new.email); END',
+    ],
+}
+
+# Change feed for other clients (app.services.change_feed). PostgreSQL
+# publishes one NOTIFY per statement on CHANGE_CHANNEL with the payload
+# "<op>:<id>,<id>,..." ("<op>:*" when more than CHANGE_NOTIFY_MAX_IDS rows
+# changed); SQLite, which has no NOTIFY, appends to a log table that
+# clients poll.
+CHANGE_CHANNEL = "users_changed"
+CHANGE_LOG_TABLE = "Users_changes"
+CHANGE_NOTIFY_MAX_IDS = 500
+
+CHANGE_FEED_DDL = {
+    "postgresql": [
+        'CREATE OR REPLACE FUNCTION "Users_notify_change"() RETURNS trigger AS $$ '
+        'DECLARE changed bigint; ids text; '
+        'BEGIN '
+        "IF TG_OP = 'DELETE' THEN "
+        f'SELECT count(*), string_agg(id::text, \',\') INTO changed, ids FROM (SELECT id FROM old_rows LIMIT {CHANGE_NOTIFY_MAX_IDS + 1}) s; '
+        'ELSE '
+        f'SELECT count(*), string_agg(id::text, \',\') INTO changed, ids FROM (SELECT id FROM new_rows LIMIT {CHANGE_NOTIFY_MAX_IDS + 1}) s; '
+        'END IF; '
+        'IF changed = 0 THEN RETURN NULL; END IF; '
+        f"IF changed > {CHANGE_NOTIFY_MAX_IDS} THEN ids := '*'; END IF; "
+        f"PERFORM pg_notify('{CHANGE_CHANNEL}', TG_OP || ':' || ids); "
+        'RETURN NULL; '
+        'END $$ LANGUAGE plpgsql',
+        'DROP TRIGGER IF EXISTS "Users_notify_insert" ON "Users"',
+        'CREATE TRIGGER "Users_notify_insert" AFTER INSERT ON "Users" REFERENCING NEW TABLE AS new_rows '
+        'FOR EACH STATEMENT EXECUTE FUNCTION "Users_notify_change"()',
+        'DROP TRIGGER IF EXISTS "Users_notify_update" ON "Users"',
+        'CREATE TRIGGER "Users_notify_update" AFTER UPDATE ON "Users" REFERENCING NEW TABLE AS new_rows '
+        'FOR EACH STATEMENT EXECUTE FUNCTION "Users_notify_change"()',
+        'DROP TRIGGER IF EXISTS "Users_notify_delete" ON "Users"',
+        'CREATE TRIGGER "Users_notify_delete" AFTER DELETE ON "Users" REFERENCING OLD TABLE AS old_rows '
+        'FOR EACH STATEMENT EXECUTE FUNCTION "Users_notify_change"()',
+    ],
+    "sqlite": [
+        f'CREATE TABLE IF NOT EXISTS "{CHANGE_LOG_TABLE}" ('
+        'seq INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER NOT NULL, op TEXT NOT NULL)',
+        f'CREATE TRIGGER IF NOT EXISTS "Users_changes_ai" AFTER INSERT ON "Users" BEGIN '
+        f'INSERT INTO "{CHANGE_LOG_TABLE}"(user_id, op) VALUES (new.id, \'INSERT\'); END',
+        f'CREATE TRIGGER IF NOT EXISTS "Users_changes_au" AFTER UPDATE ON "Users" BEGIN '
+        f'INSERT INTO "{CHANGE_LOG_TABLE}"(user_id, op) VALUES (new.id, \'UPDATE\'); END',
+        f'CREATE TRIGGER IF NOT EXISTS "Users_changes_ad" AFTER DELETE ON "Users" BEGIN '
+        f'INSERT INTO "{CHANGE_LOG_TABLE}"(user_id, op) VALUES (old.id, \'DELETE\'); END',
+    ],
+}
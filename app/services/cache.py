@@ -0,0 +1,101 @@
+import threading
+import time
+from collections import OrderedDict
+
+MISSING = object()
+
+
+class LRUCache:
+    """
+    Thread-safe mapping bounded by entry count, with an optional TTL.
+
+    The least recently used entry is evicted once ``maxsize`` is exceeded;
+    entries older than ``ttl`` seconds are treated as misses and dropped.
+    Hit, miss, eviction and expiration counters are kept for ``stats()``.
+
+    ``generation`` changes whenever entries are dropped as stale (``pop``,
+    ``discard_where``, ``clear``). A loader reads it before querying and
+    passes it to ``put``, which then skips a value an invalidation raced.
+    """
+
+    def __init__(self, maxsize=1024, ttl=None, clock=time.monotonic):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data = OrderedDict()  # key -> (stored_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._generation = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=MISSING):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            stored_at, value = entry
+            if self.ttl is not None and self._clock() - stored_at > self.ttl:
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    @property
+    def generation(self):
+        return self._generation
+
+    def put(self, key, value, generation=None):
+        """Store ``value``; False if ``generation`` is given and out of date"""
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return False
+            self._data[key] = (self._clock(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+            return True
+
+    def pop(self, key):
+        with self._lock:
+            self._generation += 1
+            entry = self._data.pop(key, None)
+            return MISSING if entry is None else entry[1]
+
+    def discard_where(self, predicate):
+        """Drop every entry for which ``predicate(key, value)`` is true"""
+        with self._lock:
+            self._generation += 1
+            doomed = [key for key, (_, value) in self._data.items() if predicate(key, value)]
+            for key in doomed:
+                del self._data[key]
+            return len(doomed)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
@@ -0,0 +1,205 @@
+import logging
+import select
+import threading
+import time
+from dataclasses import dataclass
+from enum import Enum
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.db.session import engine as default_engine
+from app.models.user import CHANGE_CHANNEL, CHANGE_LOG_TABLE, CHANGE_NOTIFY_MAX_IDS
+from app.services.user_service import clear_caches, invalidate_users
+
+logger = logging.getLogger(__name__)
+
+
+class ChangeOp(Enum):
+    INSERT = "INSERT"
+    UPDATE = "UPDATE"
+    DELETE = "DELETE"
+    RELOAD = "RELOAD"  # too many changes to list; reload everything
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    op: ChangeOp
+    user_id: int | None = None
+
+
+@dataclass
+class ChangeBatch:
+    """Net effect of a batch of events, one operation per user"""
+    inserted: set
+    updated: set
+    deleted: set
+    reload: bool = False
+
+
+def coalesce(events):
+    """
+    Reduce events to their net effect in order, e.g. an insert followed by
+    an update is an insert, an insert followed by a delete is nothing.
+    """
+    batch = ChangeBatch(set(), set(), set())
+    for event in events:
+        if event.op == ChangeOp.RELOAD:
+            batch.reload = True
+            continue
+        user_id = event.user_id
+        if event.op == ChangeOp.INSERT:
+            if user_id in batch.deleted:
+                batch.deleted.discard(user_id)
+                batch.updated.add(user_id)
+            else:
+                batch.inserted.add(user_id)
+        elif event.op == ChangeOp.UPDATE:
+            if user_id not in batch.inserted:
+                batch.updated.add(user_id)
+        elif user_id in batch.inserted:
+            batch.inserted.discard(user_id)
+        else:
+            batch.updated.discard(user_id)
+            batch.deleted.add(user_id)
+    return batch
+
+
+def parse_notification(payload):
+    """Turn a ``"<op>:<id>,<id>"`` NOTIFY payload into events"""
+    op, _, ids = payload.partition(":")
+    if ids == "*":
+        return [ChangeEvent(ChangeOp.RELOAD)]
+    op = ChangeOp(op)
+    return [ChangeEvent(op, int(user_id)) for user_id in ids.split(",") if user_id]
+
+
+class ChangeListener:
+    """
+    Background thread that collects changes made by any client and hands
+    them to ``callback(events, read_at)`` in batches, from the listener
+    thread; ``read_at`` is the ``time.monotonic()`` at which they were read.
+
+    Cached users and pages touched by a batch are invalidated before the
+    callback runs, so whatever the callback reads back is current.
+    """
+
+    def __init__(self, callback, engine=None):
+        self.callback = callback
+        self.engine = engine or default_engine
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name=type(self).__name__, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=2.0):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.listen()
+            except Exception:
+                logger.exception("Change feed failed; retrying")
+                self._stop.wait(settings.CHANGE_POLL_INTERVAL)
+
+    def listen(self):
+        raise NotImplementedError
+
+    def deliver(self, events, read_at):
+        if not events:
+            return
+        if any(event.op == ChangeOp.RELOAD for event in events):
+            clear_caches()
+        else:
+            invalidate_users({event.user_id for event in events})
+        self.callback(events, read_at)
+
+
+class NotifyListener(ChangeListener):
+    """LISTEN on the PostgreSQL channel fed by the Users triggers (psycopg2)"""
+
+    def listen(self):
+        # A dedicated connection outside the pool: it stays idle in LISTEN
+        connection = self.engine.raw_connection()
+        connection.detach()
+        dbapi_connection = connection.dbapi_connection
+        try:
+            dbapi_connection.autocommit = True
+            with dbapi_connection.cursor() as cursor:
+                cursor.execute(f"LISTEN {CHANGE_CHANNEL}")
+            while not self._stop.is_set():
+                # Wake up regularly to notice stop()
+                if not select.select([dbapi_connection], [], [], settings.CHANGE_POLL_INTERVAL)[0]:
+                    continue
+                read_at = time.monotonic()
+                # Keep collecting for a short window so bursts arrive as one batch
+                events = []
+                deadline = time.monotonic() + settings.CHANGE_BATCH_WINDOW
+                while True:
+                    dbapi_connection.poll()
+                    while dbapi_connection.notifies:
+                        events.extend(parse_notification(dbapi_connection.notifies.pop(0).payload))
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or not select.select([dbapi_connection], [], [], remaining)[0]:
+                        break
+                self.deliver(events, read_at)
+        finally:
+            connection.close()
+
+
+class PollingListener(ChangeListener):
+    """Poll the SQLite change-log table written by the Users triggers"""
+
+    PRUNE_EVERY = 60  # polls
+
+    def listen(self):
+        with self.engine.connect() as connection:
+            last_seq = connection.execute(text(f'SELECT max(seq) FROM "{CHANGE_LOG_TABLE}"')).scalar() or 0
+        polls = 0
+        while not self._stop.wait(settings.CHANGE_POLL_INTERVAL):
+            read_at = time.monotonic()
+            with self.engine.connect() as connection:
+                rows = connection.execute(
+                    text(f'SELECT seq, user_id, op FROM "{CHANGE_LOG_TABLE}" '
+                         'WHERE seq > :last ORDER BY seq LIMIT :limit'),
+                    {"last": last_seq, "limit": CHANGE_NOTIFY_MAX_IDS + 1},
+                ).all()
+                if len(rows) > CHANGE_NOTIFY_MAX_IDS or (rows and rows[0].seq > last_seq + 1 and last_seq):
+                    # Too many to apply one by one, or pruned before we saw them
+                    last_seq = connection.execute(text(f'SELECT max(seq) FROM "{CHANGE_LOG_TABLE}"')).scalar()
+                    events = [ChangeEvent(ChangeOp.RELOAD)]
+                else:
+                    if rows:
+                        last_seq = rows[-1].seq
+                    events = [ChangeEvent(ChangeOp(row.op), row.user_id) for row in rows]
+
+                polls += 1
+                if polls % self.PRUNE_EVERY == 0:
+                    connection.execute(
+                        text(f'DELETE FROM "{CHANGE_LOG_TABLE}" WHERE seq <= :last - :keep'),
+                        {"last": last_seq, "keep": settings.CHANGE_LOG_RETENTION},
+                    )
+                    connection.commit()
+            self.deliver(events, read_at)
+
+
+def create_listener(callback, engine=None):
+    """
+    Return the listener suited to the database, or None when live updates
+    are disabled or unsupported (PostgreSQL drivers other than psycopg2,
+    in-memory SQLite).
+    """
+    engine = engine or default_engine
+    if not settings.CHANGE_FEED_ENABLED:
+        return None
+    dialect = engine.dialect
+    if dialect.name == "postgresql" and dialect.driver == "psycopg2":
+        return NotifyListener(callback, engine)
+    if dialect.name == "sqlite" and engine.url.database not in (None, "", ":memory:"):
+        return PollingListener(callback, engine)
+    return None
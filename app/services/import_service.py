@@ -0,0 +1,206 @@
+import csv
+import io
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from enum import Enum
+
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.db.session import engine as default_engine
+from app.models.user import EMAIL_MAX_LENGTH, NAME_MAX_LENGTH, User
+from app.services.user_service import clear_caches
+
+IMPORT_CHUNK_SIZE = 5000
+MAX_REPORTED_ERRORS = 100
+
+# Temporary table COPY writes into, so rows with existing emails can be skipped
+STAGING_TABLE = "Users_import"
+
+EMAIL_PATTERN = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+
+class ImportFormat(Enum):
+    CSV = "csv"
+    JSONL = "jsonl"
+
+
+@dataclass
+class ImportResult:
+    """Outcome of an import: rows written, rows rejected and why"""
+    imported: int = 0
+    skipped: int = 0  # every row not imported, including duplicates
+    duplicates: int = 0  # rows skipped because their email was already in the table
+    errors: list = field(default_factory=list)  # (line number, message)
+
+    def reject(self, line_no, message):
+        self.skipped += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line_no, message))
+
+    def skip_existing(self, count):
+        self.skipped += count
+        self.duplicates += count
+
+
+def detect_format(path):
+    """Guess the file format from its extension"""
+    extension = os.path.splitext(path)[1].lower()
+    # Plain .json is usually a top-level array, which is not streamed
+    if extension in (".jsonl", ".ndjson"):
+        return ImportFormat.JSONL
+    if extension in (".csv", ".txt"):
+        return ImportFormat.CSV
+    raise ValueError(f"Cannot infer import format from {path!r}")
+
+
+def validate_record(record):
+    """Return a clean (name, email) pair or raise ValueError"""
+    if not isinstance(record, dict):
+        raise ValueError("expected an object with name and email")
+    name = str(record.get("name") or "").strip()
+    email = str(record.get("email") or "").strip()
+    if not name:
+        raise ValueError("name is required")
+    if len(name) > NAME_MAX_LENGTH:
+        raise ValueError(f"name is longer than {NAME_MAX_LENGTH} characters")
+    if not EMAIL_PATTERN.match(email):
+        raise ValueError(f"invalid email {email!r}")
+    if len(email) > EMAIL_MAX_LENGTH:
+        raise ValueError(f"email is longer than {EMAIL_MAX_LENGTH} characters")
+    return name, email
+
+
+def _read_records(text, fmt):
+    """Yield (line number, raw record) pairs from an open text stream"""
+    if fmt == ImportFormat.CSV:
+        reader = csv.DictReader(text)
+        missing = {"name", "email"} - set(reader.fieldnames or ())
+        if missing:
+            raise ValueError(f"CSV header is missing: {', '.join(sorted(missing))}")
+        for record in reader:
+            yield reader.line_num, record
+    else:
+        for line_no, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_no, json.loads(line)
+            except json.JSONDecodeError as exc:
+                yield line_no, exc
+
+
+def iter_chunks(raw, fmt, result, chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    Yield lists of at most ``chunk_size`` validated (name, email) rows.
+
+    Only the current chunk is held in memory; rejected rows, including a
+    repeated email within the chunk, are recorded on ``result`` instead of
+    being yielded. Repeats across chunks are left to the database.
+    """
+    text = io.TextIOWrapper(raw, encoding="utf-8-sig", newline="")
+    chunk = []
+    emails = set()
+    for line_no, record in _read_records(text, fmt):
+        if isinstance(record, Exception):
+            result.reject(line_no, f"invalid JSON: {record}")
+            continue
+        try:
+            name, email = validate_record(record)
+        except ValueError as exc:
+            result.reject(line_no, str(exc))
+            continue
+        if email in emails:
+            result.reject(line_no, f"duplicate email {email!r}")
+            continue
+        emails.add(email)
+        chunk.append((name, email))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+            emails = set()
+    if chunk:
+        yield chunk
+
+
+def _copy_chunk(connection, rows):
+    """
+    Stream a chunk through PostgreSQL COPY FROM STDIN (psycopg2 only) into a
+    temporary table, then move it over skipping existing emails. Returns
+    the number of rows inserted.
+    """
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+    table = User.__tablename__
+    dbapi_connection = connection.connection.dbapi_connection
+    with dbapi_connection.cursor() as cursor:
+        cursor.execute(
+            f'CREATE TEMPORARY TABLE IF NOT EXISTS "{STAGING_TABLE}" (name text, email text) ON COMMIT DROP'
+        )
+        cursor.copy_expert(
+            f'COPY "{STAGING_TABLE}" (name, email) FROM STDIN WITH (FORMAT csv)', buffer
+        )
+        cursor.execute(
+            f'INSERT INTO "{table}" (name, email) SELECT name, email FROM "{STAGING_TABLE}" '
+            'ON CONFLICT DO NOTHING'
+        )
+        inserted = cursor.rowcount
+        cursor.execute(f'TRUNCATE "{STAGING_TABLE}"')
+    return inserted
+
+
+def _insert_chunk(connection, rows):
+    """
+    Insert a chunk with a single executemany, skipping rows whose email
+    already exists on SQLite and PostgreSQL. Returns the number inserted.
+    """
+    dialect = connection.dialect
+    if dialect.name == "postgresql":
+        statement = postgresql.insert(User.__table__).on_conflict_do_nothing()
+    elif dialect.name == "sqlite":
+        statement = sqlite.insert(User.__table__).on_conflict_do_nothing()
+    else:
+        statement = insert(User.__table__)
+    parameters = [{"name": name, "email": email} for name, email in rows]
+    if dialect.supports_sane_multi_rowcount:
+        return connection.execute(statement, parameters).rowcount
+    if dialect.insert_executemany_returning:
+        return len(connection.execute(statement.returning(User.id), parameters).all())
+    connection.execute(statement, parameters)
+    return len(rows)
+
+
+def import_users(path, fmt=None, chunk_size=IMPORT_CHUNK_SIZE, progress=None, engine=None):
+    """
+    Import users from a CSV (with ``name,email`` header) or JSONL file.
+
+    The file is streamed in chunks of ``chunk_size`` rows. On psycopg2 each
+    chunk is sent with ``COPY FROM STDIN``; other drivers fall back to a
+    batched ``executemany``. The whole import runs in one transaction.
+
+    ``progress`` is called as ``progress(bytes_read, total_bytes)`` after
+    every chunk. Invalid rows are skipped and reported on the result, as
+    are rows whose email is already taken.
+    """
+    fmt = fmt or detect_format(path)
+    engine = engine or default_engine
+    result = ImportResult()
+    total_bytes = os.path.getsize(path)
+
+    with open(path, "rb") as raw, engine.begin() as connection:
+        write_chunk = _copy_chunk if connection.dialect.driver == "psycopg2" else _insert_chunk
+        for chunk in iter_chunks(raw, fmt, result, chunk_size):
+            inserted = write_chunk(connection, chunk)
+            result.imported += inserted
+            result.skip_existing(len(chunk) - inserted)
+            if progress:
+                progress(raw.tell(), total_bytes)
+
+    # Rows were written behind the service layer's back
+    clear_caches()
+    if progress:
+        progress(total_bytes, total_bytes)
+    return result
@@ -0,0 +1,223 @@
+"""
+On-disk snapshot of the first rows of the user list.
+
+``MainWindow`` saves the rows it has loaded from the top of the list when
+it closes, and on the next launch shows them before the database is even
+connected. ``reconcile()`` then reads the same id range from the database
+and returns only the differences.
+
+File layout (little-endian), read through ``mmap``::
+
+    header  magic "USRS", format version, flags, schema version,
+            source (hash of DATABASE_URL), total users, row count, CRC-32
+    rows    id (int64), version (int32), name length, email length (uint16),
+            followed by the UTF-8 name and email
+
+A file that is too large, from another format, schema or database, or
+whose CRC does not match is discarded.
+
+Importing this module loads the settings but not the database stack.
+"""
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import zlib
+from dataclasses import dataclass
+
+from app.core.config import settings
+
+MAGIC = b"USRS"
+FORMAT_VERSION = 1
+# app.db.migrations.LATEST_VERSION, repeated so loading needs no database
+# imports; save_snapshot() refuses to write if the two disagree
+SCHEMA_VERSION = 6
+
+HEADER = struct.Struct("<4sHHIQQII")
+ROW = struct.Struct("<qiHH")
+
+logger = logging.getLogger(__name__)
+
+
+class SnapshotError(ValueError):
+    """The snapshot file is corrupt or does not belong to this database"""
+
+
+@dataclass
+class Snapshot:
+    total: int
+    rows: list  # (id, name, email, version) tuples in id order
+    schema_version: int
+
+
+@dataclass
+class Reconciliation:
+    """What changed in the snapshot's id range since it was saved"""
+    total: int
+    inserted: list  # rows
+    updated: list  # rows
+    deleted: list  # ids
+
+
+def _source():
+    """Identifies the database a snapshot was taken from, without storing its URL"""
+    digest = hashlib.blake2b(settings.DATABASE_URL.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def _path(path):
+    return path or settings.SNAPSHOT_PATH
+
+
+def discard(path=None):
+    try:
+        os.remove(_path(path))
+    except FileNotFoundError:
+        pass
+
+
+def save_snapshot(rows, total, path=None):
+    """
+    Write ``rows`` (the first rows of the list, in id order) atomically.
+    Rows past SNAPSHOT_MAX_BYTES are left out. Returns the number written;
+    0 when snapshots are disabled or the file could not be written.
+    """
+    from app.db.migrations import LATEST_VERSION
+
+    if not settings.SNAPSHOT_ENABLED:
+        return 0
+    if LATEST_VERSION != SCHEMA_VERSION:
+        logger.warning("Not saving snapshot: SCHEMA_VERSION is %d, schema is %d", SCHEMA_VERSION, LATEST_VERSION)
+        return 0
+    path = _path(path)
+    payload = bytearray()
+    limit = settings.SNAPSHOT_MAX_BYTES - HEADER.size
+    written = 0
+    try:
+        for user_id, name, email, version in rows:
+            name_bytes = name.encode()
+            email_bytes = email.encode()
+            record = ROW.pack(user_id, version, len(name_bytes), len(email_bytes)) + name_bytes + email_bytes
+            if len(payload) + len(record) > limit:
+                break
+            payload += record
+            written += 1
+
+        header = HEADER.pack(
+            MAGIC, FORMAT_VERSION, 0, SCHEMA_VERSION, _source(), total, written, zlib.crc32(payload)
+        )
+        temporary = f"{path}.tmp"
+        with open(temporary, "wb") as handle:
+            handle.write(header)
+            handle.write(payload)
+        os.replace(temporary, path)
+    except (OSError, struct.error):
+        logger.warning("Could not write snapshot %s", path, exc_info=True)
+        return 0
+    return written
+
+
+def _read(view):
+    magic, format_version, _, schema_version, source, total, count, crc = HEADER.unpack_from(view)
+    if magic != MAGIC or format_version != FORMAT_VERSION:
+        raise SnapshotError("not a snapshot of this format")
+    if schema_version != SCHEMA_VERSION:
+        raise SnapshotError(f"written for schema version {schema_version}")
+    if source != _source():
+        raise SnapshotError("taken from another database")
+    if zlib.crc32(view[HEADER.size:]) != crc:
+        raise SnapshotError("checksum mismatch")
+
+    rows = []
+    offset = HEADER.size
+    for _ in range(count):
+        user_id, version, name_length, email_length = ROW.unpack_from(view, offset)
+        offset += ROW.size
+        name = str(view[offset:offset + name_length], "utf-8")
+        offset += name_length
+        email = str(view[offset:offset + email_length], "utf-8")
+        offset += email_length
+        rows.append((user_id, name, email, version))
+    if offset != len(view):
+        raise SnapshotError("trailing data")
+    return Snapshot(total, rows, schema_version)
+
+
+def load_snapshot(path=None):
+    """Return the saved Snapshot, or None if there is none or it is unusable"""
+    if not settings.SNAPSHOT_ENABLED:
+        return None
+    path = _path(path)
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return None
+    if size > settings.SNAPSHOT_MAX_BYTES or size < HEADER.size:
+        logger.info("Discarding snapshot %s: %d bytes", path, size)
+        discard(path)
+        return None
+    try:
+        with open(path, "rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view:
+                return _read(view)
+    except (SnapshotError, struct.error, UnicodeDecodeError) as exc:
+        logger.info("Discarding snapshot %s: %s", path, exc)
+        discard(path)
+        return None
+    except OSError:
+        logger.warning("Could not read snapshot %s", path, exc_info=True)
+        return None
+
+
+def diff_rows(old, new):
+    """
+    Compare two lists of rows sorted by id in one merge walk; returns
+    (inserted rows, updated rows, deleted ids) that turn ``old`` into ``new``.
+    """
+    inserted, updated, deleted = [], [], []
+    i = j = 0
+    while i < len(old) and j < len(new):
+        old_id, new_id = old[i][0], new[j][0]
+        if old_id == new_id:
+            if old[i] != new[j]:
+                updated.append(new[j])
+            i += 1
+            j += 1
+        elif old_id < new_id:
+            deleted.append(old_id)
+            i += 1
+        else:
+            inserted.append(new[j])
+            j += 1
+    deleted.extend(row[0] for row in old[i:])
+    inserted.extend(new[j:])
+    return inserted, updated, deleted
+
+
+def reconcile(snapshot):
+    """
+    Read the snapshot's id range back from the database and diff it.
+
+    Returns None when the differences cannot be applied as deltas and the
+    list should be reloaded: the schema changed, or rows were added inside
+    the range (e.g. reused ids) and pushed some snapshot rows out of it.
+    """
+    from app.db.migrations import LATEST_VERSION
+    from app.services.user_service import count_users, get_users_page
+
+    if snapshot.schema_version != LATEST_VERSION:
+        return None
+    total = count_users()
+    if not snapshot.rows:
+        return Reconciliation(total, [], [], [])
+
+    # New users get higher ids, so the first len(rows) users cover the range
+    limit = len(snapshot.rows)
+    users, _ = get_users_page(None, limit, "id")
+    current = [(user.id, user.name, user.email, user.version) for user in users]
+    last_id = snapshot.rows[-1][0]
+    if len(current) == limit and current[-1][0] < last_id:
+        return None
+    current = [row for row in current if row[0] <= last_id]
+    return Reconciliation(total, *diff_rows(snapshot.rows, current))
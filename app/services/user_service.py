@@ -1,36 +1,646 @@
-from app.db.session import get_session
-from app.models.user import User
+import base64
+import json
+import re
+from dataclasses import dataclass
+from enum import Enum
+
+from app.core.config import settings
+from app.core.metrics import timed
+from app.db.session import SQLITE_UNICODE_LOWER, get_session
+from app.models.user import EMAIL_MAX_LENGTH, NAME_MAX_LENGTH, User
+from app.services.cache import LRUCache, MISSING
+from sqlalchemy import and_, case, delete, func, insert, or_, select as sa_select, text, true, tuple_, update
+from sqlalchemy.orm import configure_mappers
 from sqlmodel import select
 
+DEFAULT_PAGE_SIZE = 500
+DEFAULT_SEARCH_PAGE_SIZE = 100
+
+# Shortest query the trigram indexes can serve; shorter ones scan with LIKE
+MIN_TRIGRAM_QUERY = 3
+
+# Upper bound on the ids bound into a single IN (...) list. Keeps each
+# statement well below the bind-parameter limits of SQLite and psycopg2.
+ID_CHUNK_SIZE = 1000
+
+# Columns a page may be ordered by. Every order is made unique by adding the
+# primary key as a tie-breaker, so a (value, id) pair is always a valid cursor.
+ORDER_COLUMNS = {
+    "id": User.id,
+    "name": User.name,
+    "email": User.email,
+}
+
+# Columns read back by INSERT/UPDATE ... RETURNING
+USER_COLUMNS = (User.id, User.name, User.email, User.version)
+
+
+class StaleUserError(Exception):
+    """The user was changed by someone else after the caller read it"""
+
+
+class EditOp(Enum):
+    SET = "set"
+    REPLACE = "replace"
+    DOMAIN = "domain"  # email only: keep the local part, swap the domain (needs an "@")
+
+
+@dataclass(frozen=True)
+class FieldChange:
+    """One transform applied by ``update_users`` to ``field`` ("name" or "email")"""
+    field: str
+    op: EditOp
+    value: str  # new value, replacement text or new domain
+    find: str = ""  # text to replace (REPLACE only)
+
+
+DOMAIN_PATTERN = re.compile(r"^[^@\s]+\.[^@\s]+$")
+
+
+# Users by id, and page results keyed by (order_by, cursor, limit). Users are
+# cached as plain (id, name, email, version) tuples: the User instances handed
+# out are mutable and go to other threads, so every hit builds fresh ones.
+_user_cache = LRUCache(settings.USER_CACHE_SIZE, settings.USER_CACHE_TTL)
+_page_cache = LRUCache(settings.PAGE_CACHE_SIZE, settings.PAGE_CACHE_TTL)
+
+
+_CACHED_FIELDS = ("id", "name", "email", "version")
+configure_mappers()
+_new_user = User.__mapper__.class_manager.new_instance
+
+
+def _freeze(user):
+    return (user.id, user.name, user.email, user.version)
+
+
+def _thaw(row):
+    # Built like the ORM builds loaded rows, skipping the validating __init__
+    user = _new_user()
+    user.__dict__.update(zip(_CACHED_FIELDS, row))
+    return user
+
+
+def _cache_users(users, generation=None):
+    for user in users:
+        _user_cache.put(user.id, _freeze(user), generation)
+
+
+def cache_stats():
+    """Hit/miss/eviction counters of the user and page caches"""
+    return {"users": _user_cache.stats(), "pages": _page_cache.stats()}
+
+
+def clear_caches():
+    """Forget everything cached, e.g. after writes made outside this module"""
+    _user_cache.clear()
+    _page_cache.clear()
+
+
+def _invalidate(user_ids):
+    """
+    Drop cached state that may include any of ``user_ids``.
+
+    Id-ordered pages know the id range they cover, so only the pages whose
+    range contains an affected id are dropped. Pages in name or email order
+    are dropped on every write, since a changed value can move a row to any
+    page.
+    """
+    user_ids = set(user_ids)
+    for user_id in user_ids:
+        _user_cache.pop(user_id)
+
+    def affected(key, entry):
+        order_by = key[0]
+        if order_by != "id":
+            return True
+        # Both bounds are stored as (lower, upper] whatever the page direction
+        lower, upper = entry[2], entry[3]
+        return any(
+            (lower is None or user_id > lower) and (upper is None or user_id <= upper)
+            for user_id in user_ids
+        )
 
-def get_all_users():
+    _page_cache.discard_where(affected)
+
+
+def invalidate_users(user_ids):
+    """Drop cached state for users changed by another client"""
+    _invalidate(user_ids)
+
+
+def encode_cursor(order_by: str, user: User) -> str:
+    """Build the opaque cursor pointing just after ``user`` in ``order_by`` order"""
+    key = [user.id] if order_by == "id" else [getattr(user, order_by), user.id]
+    raw = json.dumps([order_by, key], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor: str, order_by: str):
+    """Return the key stored in ``cursor``, checking it belongs to ``order_by``"""
+    try:
+        cursor_order, key = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError) as exc:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from exc
+    if cursor_order != order_by:
+        raise ValueError(f"Cursor was issued for order {cursor_order!r}, not {order_by!r}")
+    return key
+
+
+@timed
+def get_users_page(cursor: str | None = None, limit: int = DEFAULT_PAGE_SIZE, order_by: str = "id",
+                   backward: bool = False, skip: int = 0):
+    """
+    Return one page of users and the cursor of the next page.
+
+    Pages are read with keyset pagination: the query seeks past the last key
+    of the previous page on the ordering index instead of using OFFSET, so
+    every page costs the same no matter how deep into the table it is.
+    The returned cursor is None once the last page has been read.
+
+    With ``backward`` the page holds the rows just *before* ``cursor``
+    (still in ascending order), and the returned cursor continues backward
+    from its first row.
+
+    ``skip`` passes over that many rows after the cursor (before it, when
+    ``backward``) with an OFFSET, for a page known to lie a few rows away
+    from a remembered cursor.
+    """
+    if order_by not in ORDER_COLUMNS:
+        raise ValueError(f"Unsupported order: {order_by!r}")
+    if limit <= 0:
+        raise ValueError("limit must be positive")
+    if backward and cursor is None:
+        raise ValueError("a backward page needs a cursor")
+    if skip < 0:
+        raise ValueError("skip must not be negative")
+
+    cache_key = (order_by, cursor, limit, backward, skip)
+    cached = _page_cache.get(cache_key)
+    if cached is not MISSING:
+        return [_thaw(row) for row in cached[0]], cached[1]
+    # Taken before querying: a write committed meanwhile must not be cached over
+    user_generation, page_generation = _user_cache.generation, _page_cache.generation
+
+    column = ORDER_COLUMNS[order_by]
+    ordering = [User.id] if order_by == "id" else [column, User.id]
+    if backward:
+        ordering = [expression.desc() for expression in ordering]
+    statement = select(User).order_by(*ordering)
+
+    key = None
+    if cursor is not None:
+        key = decode_cursor(cursor, order_by)
+        position = User.id if order_by == "id" else tuple_(column, User.id)
+        bound = key[0] if order_by == "id" else tuple_(*key)
+        statement = statement.where(position < bound if backward else position > bound)
+
+    # Fetch one extra row to know whether another page exists without a COUNT
     with get_session() as session:
-        return session.exec(select(User)).all()
+        users = session.exec(statement.offset(skip or None).limit(limit + 1)).all()
+
+    next_cursor = None
+    if len(users) > limit:
+        users = users[:limit]
+        next_cursor = encode_cursor(order_by, users[-1])
+    if backward:
+        users.reverse()
+
+    _cache_users(users, user_generation)
+    lower = upper = None
+    if order_by == "id":
+        # Remember the id range this page (and any skipped rows) covers for precise invalidation
+        if backward:
+            lower = users[0].id - 1 if next_cursor else None
+            upper = key[0] - 1
+        else:
+            lower = key[0] if key else None
+            upper = users[-1].id if next_cursor else None
+    rows = tuple(_freeze(user) for user in users)
+    _page_cache.put(cache_key, (rows, next_cursor, lower, upper), page_generation)
+    return users, next_cursor
+
+
+@timed
+def get_users_block(offset: int, limit: int = DEFAULT_PAGE_SIZE, order_by: str = "id",
+                    after: str | None = None, before: str | None = None, skip: int = 0):
+    """
+    Return the users at rows ``offset`` to ``offset + limit`` and the cursors
+    of the first and last of them.
+
+    ``after`` (the cursor of a row above the block) or ``before`` (the
+    cursor of a row below it) let the block be read with ``get_users_page``
+    by seeking to that key, then skipping the ``skip`` rows between it and
+    the block. Without either, the rows are reached by skipping ``offset``
+    rows from the top; either way a scroll jump costs one query, and the
+    OFFSET only spans the distance to the nearest known cursor.
+    """
+    if before is not None and after is None:
+        users, _ = get_users_page(before, limit, order_by, backward=True, skip=skip)
+    else:
+        users, _ = get_users_page(after, limit, order_by, skip=offset if after is None else skip)
+    if not users:
+        return users, None, None
+    return users, encode_cursor(order_by, users[0]), encode_cursor(order_by, users[-1])
+
+
+def iter_user_pages(page_size: int = DEFAULT_PAGE_SIZE, order_by: str = "id"):
+    """
+    Yield successive pages of users until the table is exhausted. Each page
+    fetch is timed as ``get_users_page``, without the caller's work between
+    pages.
+    """
+    cursor = None
+    while True:
+        users, cursor = get_users_page(cursor, page_size, order_by)
+        if users:
+            yield users
+        if cursor is None:
+            return
+
+
+def get_all_users(page_size: int = DEFAULT_PAGE_SIZE, order_by: str = "id"):
+    """Stream every user, holding at most one page in memory at a time"""
+    for users in iter_user_pages(page_size, order_by):
+        yield from users
+
+
+_fts_available = None
+
+
+def _has_fts(session):
+    """Whether the SQLite FTS5 search table exists (checked once)"""
+    global _fts_available
+    if _fts_available is None:
+        _fts_available = session.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'Users_fts'")
+        ).first() is not None
+    return _fts_available
+
+
+def _escape_like(value):
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
 
 
+def _search_filter(session, query, mode):
+    """Build the WHERE clause matching ``query`` against name and email"""
+    query = query.strip().lower()
+    sqlite = session.get_bind().dialect.name == "sqlite"
+    if mode == "contains":
+        if len(query) >= MIN_TRIGRAM_QUERY and sqlite and _has_fts(session):
+            phrase = '"' + query.replace('"', '""') + '"'
+            matches = sa_select(text("rowid")).select_from(text('"Users_fts"')).where(
+                text('"Users_fts" MATCH :phrase').bindparams(phrase=phrase)
+            )
+            return User.id.in_(matches)
+        # Served by the lower(...) gin_trgm_ops indexes on PostgreSQL; queries
+        # too short for a trigram are a plain scan, but still match anywhere
+        pattern = "%" + _escape_like(query) + "%"
+    else:
+        # Also served by the trigram indexes on PostgreSQL
+        pattern = _escape_like(query) + "%"
+    lower = func.lower
+    if sqlite and not query.isascii():
+        # The built-in lower() would leave "É" as it is and never match "é".
+        # ASCII queries keep it: the Python function costs about twice as
+        # much per scanned row, and only the Kelvin sign and dotted capital
+        # I fold to ASCII letters, which those queries then miss.
+        lower = getattr(func, SQLITE_UNICODE_LOWER)
+    return or_(
+        lower(User.name).like(pattern, escape="\\"),
+        lower(User.email).like(pattern, escape="\\"),
+    )
+
+
+def _matching_filter(session, query, mode, exclude):
+    """WHERE clause for every user matching ``query`` (all when empty) except the ids in ``exclude``"""
+    if mode not in ("prefix", "contains"):
+        raise ValueError(f"Unsupported search mode: {mode!r}")
+    conditions = [_search_filter(session, query, mode)] if query.strip() else []
+    exclude = list(dict.fromkeys(exclude))
+    for start in range(0, len(exclude), ID_CHUNK_SIZE):
+        conditions.append(User.id.not_in(exclude[start:start + ID_CHUNK_SIZE]))
+    return and_(true(), *conditions)
+
+
+@timed
+def search_users(query: str = "", sort: str = "id", direction: str = "asc", page: int = 0,
+                 page_size: int = DEFAULT_SEARCH_PAGE_SIZE, mode: str = "contains"):
+    """
+    Return one page of users whose name or email matches ``query``.
+
+    ``mode`` is "prefix" or "contains"; matching is case-insensitive. Rows
+    are sorted in SQL by ``sort`` ("id", "name" or "email") in ``direction``
+    ("asc" or "desc"), with the id as tie-breaker. Returns the users and
+    whether a further page exists.
+    """
+    if sort not in ORDER_COLUMNS:
+        raise ValueError(f"Unsupported sort: {sort!r}")
+    if direction not in ("asc", "desc"):
+        raise ValueError(f"Unsupported direction: {direction!r}")
+    if mode not in ("prefix", "contains"):
+        raise ValueError(f"Unsupported search mode: {mode!r}")
+    if page < 0 or page_size <= 0:
+        raise ValueError("page must be >= 0 and page_size positive")
+
+    column = ORDER_COLUMNS[sort]
+    if sort != "id":
+        column = func.lower(column)
+    ordering = [column, User.id] if sort != "id" else [column]
+    if direction == "desc":
+        ordering = [expression.desc() for expression in ordering]
+
+    with get_session() as session:
+        statement = select(User).order_by(*ordering)
+        if query.strip():
+            statement = statement.where(_search_filter(session, query, mode))
+        statement = statement.offset(page * page_size).limit(page_size + 1)
+        users = session.exec(statement).all()
+
+    return users[:page_size], len(users) > page_size
+
+
+@timed
+def count_users(query: str = "", mode: str = "contains"):
+    """Number of users, or of users matching ``query`` as in ``search_users``"""
+    if mode not in ("prefix", "contains"):
+        raise ValueError(f"Unsupported search mode: {mode!r}")
+    with get_session() as session:
+        statement = sa_select(func.count()).select_from(User)
+        if query.strip():
+            statement = statement.where(_search_filter(session, query, mode))
+        return session.execute(statement).scalar_one()
+
+
+@timed
+def get_user(user_id: int):
+    """Return a user by id, served from the cache when possible"""
+    cached = _user_cache.get(user_id)
+    if cached is not MISSING:
+        return _thaw(cached)
+    generation = _user_cache.generation
+    with get_session() as session:
+        user = session.get(User, user_id)
+    if user:
+        _user_cache.put(user_id, _freeze(user), generation)
+    return user
+
+
+@timed
+def get_users_by_ids(ids):
+    """Return the users that still exist among ``ids``, in id order"""
+    ids = list(dict.fromkeys(ids))
+    users = []
+    generation = _user_cache.generation
+    with get_session() as session:
+        for start in range(0, len(ids), ID_CHUNK_SIZE):
+            chunk = ids[start:start + ID_CHUNK_SIZE]
+            users.extend(session.exec(select(User).where(User.id.in_(chunk))).all())
+    _cache_users(users, generation)
+    return sorted(users, key=lambda user: user.id)
+
+
+def _user_from_row(row):
+    return User(id=row.id, name=row.name, email=row.email, version=row.version)
+
+
+@timed
 def add_user(name: str, email: str):
+    """
+    Insert a user with one ``INSERT ... RETURNING`` round trip.
+
+    Without RETURNING (SQLite before 3.35) the new id comes from the
+    cursor's lastrowid instead; nothing is read back either way.
+    """
+    statement = insert(User).values(name=name, email=email)
+    with get_session() as session:
+        if session.get_bind().dialect.insert_returning:
+            user = _user_from_row(session.execute(statement.returning(*USER_COLUMNS)).one())
+        else:
+            result = session.execute(statement)
+            user = User(id=result.inserted_primary_key[0], name=name, email=email, version=1)
+        session.commit()
+    _invalidate([user.id])
+    _user_cache.put(user.id, _freeze(user))
+    return user
+
+def validate_changes(changes, count=1):
+    """Raise ValueError unless ``changes`` can be applied to ``count`` users"""
+    fields = [change.field for change in changes]
+    if not changes:
+        raise ValueError("no changes given")
+    if len(set(fields)) != len(fields):
+        raise ValueError("only one change per field")
+    limits = {"name": NAME_MAX_LENGTH, "email": EMAIL_MAX_LENGTH}
+    for change in changes:
+        if change.field not in limits:
+            raise ValueError(f"Unsupported field: {change.field!r}")
+        if len(change.value) > limits[change.field]:
+            raise ValueError(f"{change.field} is longer than {limits[change.field]} characters")
+        if change.op == EditOp.SET:
+            if not change.value.strip():
+                raise ValueError(f"{change.field} cannot be empty")
+            if change.field == "email" and count > 1:
+                raise ValueError("emails are unique; set them one user at a time")
+        elif change.op == EditOp.REPLACE:
+            if not change.find:
+                raise ValueError("text to replace is required")
+        elif change.op == EditOp.DOMAIN:
+            if change.field != "email":
+                raise ValueError("only emails have a domain")
+            if not DOMAIN_PATTERN.match(change.value):
+                raise ValueError(f"invalid domain {change.value!r}")
+
+
+def _change_expression(change, dialect_name):
+    """SQL expression computing the new value of ``change.field``"""
+    column = ORDER_COLUMNS[change.field]
+    if change.op == EditOp.SET:
+        return change.value
+    if change.op == EditOp.REPLACE:
+        return func.replace(column, change.find, change.value)
+    # Everything up to and including the "@", then the new domain; a value
+    # without an "@" has no domain to swap and is left as it is
+    at = func.strpos(column, "@") if dialect_name == "postgresql" else func.instr(column, "@")
+    return case((at > 0, func.substr(column, 1, at).concat(change.value)), else_=column)
+
+
+def _reject_empty_results(session, condition, changes, dialect_name):
+    """
+    Raise ValueError if a REPLACE with blank replacement text would leave
+    the name or email of any user matching ``condition`` empty
+    """
+    for change in changes:
+        if change.op != EditOp.REPLACE or change.value.strip():
+            continue
+        emptied = func.trim(_change_expression(change, dialect_name)) == ""
+        count = session.execute(sa_select(func.count()).select_from(User).where(condition, emptied)).scalar_one()
+        if count:
+            raise ValueError(f"replacing {change.find!r} would leave {count} {change.field}s empty")
+
+
+def _changed_filter(changes, dialect_name):
+    """WHERE clause for the rows ``changes`` would actually alter"""
+    return or_(*(
+        ORDER_COLUMNS[change.field] != _change_expression(change, dialect_name) for change in changes
+    ))
+
+
+def _update_values(changes, dialect_name):
+    """SET clause of an UPDATE applying ``changes`` and bumping the version"""
+    values = {change.field: _change_expression(change, dialect_name) for change in changes}
+    values["version"] = User.version + 1
+    return values
+
+
+@timed
+def update_users(ids, changes):
+    """
+    Apply ``changes`` (FieldChange transforms) to every user in ``ids`` and
+    return the number of rows updated.
+
+    The transforms are computed by the database, one set-based
+    ``UPDATE ... WHERE id IN (...)`` per chunk of ``ID_CHUNK_SIZE`` ids, all
+    in one transaction; every row written has its version bumped as by
+    ``update_user``. Rows the changes would leave as they are, e.g. a
+    REPLACE whose text they do not contain, are neither written nor
+    counted. Nothing is written if a REPLACE would leave some value empty.
+    """
+    ids = list(dict.fromkeys(ids))
+    if not ids:
+        return 0
+    validate_changes(changes, len(ids))
+
+    updated = 0
     with get_session() as session:
-        user = User(name=name, email=email)
-        session.add(user)
+        dialect_name = session.get_bind().dialect.name
+        values = _update_values(changes, dialect_name)
+        changed = _changed_filter(changes, dialect_name)
+        for start in range(0, len(ids), ID_CHUNK_SIZE):
+            chunk = ids[start:start + ID_CHUNK_SIZE]
+            _reject_empty_results(session, User.id.in_(chunk), changes, dialect_name)
+            result = session.execute(update(User).where(User.id.in_(chunk), changed).values(**values))
+            updated += result.rowcount
         session.commit()
-        session.refresh(user)
-        return user
+    _invalidate(ids)
+    return updated
+
 
+@timed
+def update_matching(changes, query: str = "", mode: str = "contains", exclude=()):
+    """
+    Apply ``changes`` to every user matching ``query`` as in ``search_users``
+    (every user when empty) except the ids in ``exclude``, with a single
+    UPDATE, and return the number of rows updated. This is what a "select
+    all" covers when most of the selected rows were never loaded. As in
+    ``update_users``, rows left as they are are not written or counted.
+    """
+    with get_session() as session:
+        condition = _matching_filter(session, query, mode, exclude)
+        count = session.execute(sa_select(func.count()).select_from(User).where(condition)).scalar_one()
+        if not count:
+            return 0
+        validate_changes(changes, count)
+        dialect_name = session.get_bind().dialect.name
+        _reject_empty_results(session, condition, changes, dialect_name)
+        statement = update(User).where(condition, _changed_filter(changes, dialect_name)).values(
+            **_update_values(changes, dialect_name)
+        )
+        result = session.execute(statement.execution_options(synchronize_session=False))
+        session.commit()
+    clear_caches()
+    return result.rowcount
+
+
+@timed
 def delete_user(user_id: int):
+    """Delete a user; returns whether it existed"""
     with get_session() as session:
-        user = session.get(User, user_id)
-        if user:
-            session.delete(user)
-            session.commit()
+        result = session.execute(delete(User).where(User.id == user_id))
+        session.commit()
+    _invalidate([user_id])
+    return result.rowcount > 0
+
+@timed
+def delete_users(ids):
+    """
+    Delete every user whose id is in ``ids`` and return the ids removed.
 
-def update_user(user_id: int, name: str, email: str):
+    Ids are deleted with one ``DELETE ... WHERE id IN (...)`` per chunk of
+    ``ID_CHUNK_SIZE``, all inside a single transaction, so either every
+    chunk is applied or none is. Where the database supports
+    ``DELETE ... RETURNING`` the removed ids come back from the delete
+    itself; otherwise they are selected first in the same transaction.
+    """
+    ids = list(dict.fromkeys(ids))
+    if not ids:
+        return []
+
+    deleted = []
     with get_session() as session:
-        user = session.get(User, user_id)
-        if user:
-            user.name = name
-            user.email = email
-            session.commit()
-            session.refresh(user)
-            return user
-        return None
+        returning = session.get_bind().dialect.delete_returning
+        for start in range(0, len(ids), ID_CHUNK_SIZE):
+            chunk = ids[start:start + ID_CHUNK_SIZE]
+            statement = delete(User).where(User.id.in_(chunk))
+            if returning:
+                deleted.extend(session.execute(statement.returning(User.id)).scalars())
+            else:
+                deleted.extend(session.execute(sa_select(User.id).where(User.id.in_(chunk))).scalars())
+                session.execute(statement)
+        session.commit()
+    _invalidate(ids)
+    return deleted
 
+
+@timed
+def delete_matching(query: str = "", mode: str = "contains", exclude=()):
+    """
+    Delete every user matching ``query`` as in ``search_users`` (every user
+    when empty) except the ids in ``exclude``, with a single DELETE, and
+    return the number deleted.
+    """
+    with get_session() as session:
+        condition = _matching_filter(session, query, mode, exclude)
+        result = session.execute(delete(User).where(condition).execution_options(synchronize_session=False))
+        session.commit()
+    clear_caches()
+    return result.rowcount
+
+@timed
+def update_user(user_id: int, name: str, email: str, expected_version: int | None = None):
+    """
+    Update a user with one ``UPDATE ... RETURNING`` round trip and return
+    it, or None if it does not exist.
+
+    Every update bumps the row's version. With ``expected_version`` the
+    update only applies if the row is still at that version, and
+    StaleUserError is raised otherwise: an optimistic check that needs no
+    SELECT and no row lock. Without RETURNING the row is read back in the
+    same transaction, which only happens on old, local SQLite versions.
+    """
+    statement = update(User).where(User.id == user_id).values(
+        name=name, email=email, version=User.version + 1
+    )
+    if expected_version is not None:
+        statement = statement.where(User.version == expected_version)
+
+    with get_session() as session:
+        if session.get_bind().dialect.update_returning:
+            row = session.execute(statement.returning(*USER_COLUMNS)).first()
+        else:
+            result = session.execute(statement)
+            row = None
+            if result.rowcount:
+                row = session.execute(sa_select(*USER_COLUMNS).where(User.id == user_id)).first()
+        if row is None and expected_version is not None:
+            # Only the failure path tells a missing row from a stale one
+            if session.execute(sa_select(User.id).where(User.id == user_id)).first() is not None:
+                session.rollback()
+                _invalidate([user_id])
+                raise StaleUserError(f"User {user_id} was changed by someone else")
+        session.commit()
+    _invalidate([user_id])
+    if row is None:
+        return None
+    user = _user_from_row(row)
+    _user_cache.put(user_id, _freeze(user))
+    return user
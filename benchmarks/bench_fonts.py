@@ -0,0 +1,61 @@
+"""
+Startup font cost: loading the bundled fonts once versus resolving a family
+list in every widget.
+
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_fonts --count 2000
+
+Reports how long ``fonts.load_fonts()`` took to register the files in
+``app/assets/fonts`` and resolve the family, then builds ``--count`` fonts
+both ways and forces each one to be resolved through its metrics, as a
+widget does on first layout.
+"""
+import argparse
+import sys
+import time
+
+from PyQt6.QtGui import QFont, QFontMetrics
+from PyQt6.QtWidgets import QApplication
+
+from app.gui import fonts
+
+WEIGHTS = [QFont.Weight.Normal, QFont.Weight.Medium, QFont.Weight.Bold]
+
+
+def per_widget(count):
+    """The old pattern: a fresh QFont with a family list per widget"""
+    started = time.perf_counter()
+    for i in range(count):
+        font = QFont()
+        font.setFamily("Inter, sans-serif")
+        font.setWeight(WEIGHTS[i % len(WEIGHTS)])
+        QFontMetrics(font).height()
+    return time.perf_counter() - started
+
+
+def registry(count):
+    started = time.perf_counter()
+    for i in range(count):
+        QFontMetrics(fonts.get_font(WEIGHTS[i % len(WEIGHTS)])).height()
+    return time.perf_counter() - started
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--count", type=int, default=2000, help="fonts to build per mode")
+    args = parser.parse_args(argv)
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    fonts.load_fonts()
+    stats = fonts.load_stats
+    print(f"family: {stats['family']} ({stats['files']} font files)")
+    print(f"load:   {stats['load_ms']:.2f} ms   resolve: {stats['resolve_ms']:.2f} ms")
+
+    print(f"{'mode':<11} {'fonts':>8} {'total ms':>10} {'us/font':>10}")
+    for mode, run in (("per-widget", per_widget), ("registry", registry)):
+        elapsed = run(args.count)
+        print(f"{mode:<11} {args.count:>8} {elapsed * 1000:>10.1f} {elapsed / args.count * 1e6:>10.1f}")
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
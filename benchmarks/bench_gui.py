@@ -0,0 +1,280 @@
+"""
+Headless GUI performance harness with budgets.
+
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_gui
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_gui --rows 100000
+
+Measures, against a database seeded with ``--rows`` synthetic users:
+
+- ``MainWindow`` construction, time to first paint and time until the first
+  rows are painted, then a ``load_users()`` reload;
+- ``Table`` population (``set_rows`` plus a paint) at every ``--sizes``,
+  ``add_row`` per row, memory per loaded row, checkbox toggle latency and
+  select-all;
+- construction of ``Button``, ``Input``, ``Label`` and ``Table`` in every
+  variant and size.
+
+Every metric is compared with ``--budgets`` (default
+``benchmarks/gui_budgets.json``); the run exits with status 1 when any
+budget is exceeded or has no result, e.g. a ``table.populate_ms`` size
+left out of ``--sizes``. Results are written as JSON to ``--out``.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+import tracemalloc
+
+from PyQt6.QtCore import QEvent, QObject, Qt
+from PyQt6.QtWidgets import QApplication
+
+from benchmarks.synthetic import synthetic_users
+
+BUDGETS_FILE = os.path.join(os.path.dirname(__file__), "gui_budgets.json")
+HEADERS = ["ID", "Name", "Email", "Version"]
+ADD_ROW_COUNT = 2000  # add_row is per-row; more only measures the same thing longer
+MEMORY_ROWS = 100000
+TOGGLES = 200
+WAIT_TIMEOUT = 30.0
+
+
+class PaintRecorder(QObject):
+    """Remembers when the watched widget was last painted"""
+
+    def __init__(self, widget):
+        super().__init__(widget)
+        self.last_paint = None
+        widget.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint:
+            self.last_paint = time.perf_counter()
+        return False
+
+
+def wait_until(predicate, timeout=WAIT_TIMEOUT):
+    """Process events until ``predicate()`` holds; False on timeout"""
+    deadline = time.perf_counter() + timeout
+    while not predicate():
+        if time.perf_counter() > deadline:
+            return False
+        QApplication.processEvents()
+        time.sleep(0.0005)
+    return True
+
+
+def ms(seconds):
+    return round(seconds * 1000, 3)
+
+
+def synthetic_rows(count):
+    return [(index + 1, name, email, 1) for index, (name, email) in enumerate(synthetic_users(count))]
+
+
+def wait_rows_painted(window, viewport):
+    """Wait for the first block of rows, then for the paint that shows it"""
+    if not wait_until(lambda: window.table.table_model.loaded_blocks()):
+        raise SystemExit("No rows were loaded into MainWindow")
+    loaded_at = time.perf_counter()
+    window.table.viewport().update()
+    if not wait_until(lambda: viewport.last_paint is not None and viewport.last_paint >= loaded_at):
+        raise SystemExit("Rows were loaded into MainWindow but never painted")
+    return viewport.last_paint
+
+
+def bench_main_window(results):
+    from app.gui.main_window import MainWindow
+
+    started = time.perf_counter()
+    window = MainWindow()
+    results["main_window.init_ms"] = ms(time.perf_counter() - started)
+
+    viewport = PaintRecorder(window.table.viewport())
+    painted = PaintRecorder(window)
+    shown = time.perf_counter()
+    window.resize(1000, 700)
+    window.show()
+    if not wait_until(lambda: painted.last_paint is not None):
+        raise SystemExit("MainWindow was never painted")
+    results["main_window.first_paint_ms"] = ms(painted.last_paint - shown)
+
+    first_rows = wait_rows_painted(window, viewport)
+    results["main_window.first_rows_ms"] = ms(first_rows - started)
+
+    started = time.perf_counter()
+    window.load_users()  # drops every block synchronously
+    results["main_window.load_users_ms"] = ms(wait_rows_painted(window, viewport) - started)
+
+    window.close()
+    window.deleteLater()
+    QApplication.processEvents()
+
+
+def build_table(show_checkbox=True):
+    from app.gui.widgets.ui.table import Table
+
+    table = Table(show_checkbox=show_checkbox)
+    table.set_headers(([""] if show_checkbox else []) + HEADERS)
+    table.resize(1000, 600)
+    table.show()
+    QApplication.processEvents()
+    return table
+
+
+def bench_table(results, sizes):
+    for size in sizes:
+        rows = synthetic_rows(size)
+        table = build_table()
+        started = time.perf_counter()
+        table.set_rows(rows)
+        table.viewport().repaint()
+        results[f"table.populate_ms.{size}"] = ms(time.perf_counter() - started)
+
+        if size == max(sizes):
+            bench_toggles(results, table)
+        table.close()
+        table.deleteLater()
+        del rows
+        QApplication.processEvents()
+
+    rows = synthetic_rows(ADD_ROW_COUNT)
+    table = build_table()
+    started = time.perf_counter()
+    for row in rows:
+        table.add_row(row)
+    table.viewport().repaint()
+    results["table.add_row_us"] = round((time.perf_counter() - started) / len(rows) * 1e6, 2)
+    table.close()
+    table.deleteLater()
+
+    # Rows plus the model's bookkeeping, as held for every loaded user
+    count = min(max(sizes), MEMORY_ROWS)
+    table = build_table()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    table.set_rows(synthetic_rows(count))
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    results["table.bytes_per_row"] = round(used / count, 1)
+    table.close()
+    table.deleteLater()
+    QApplication.processEvents()
+
+
+def bench_toggles(results, table):
+    """Check/uncheck visible rows one at a time, each followed by a paint"""
+    model = table.table_model
+    visible = max(table.rowAt(table.viewport().height() - 1), 1)
+    latencies = []
+    for i in range(TOGGLES):
+        index = model.index(i % visible, 0)
+        state = Qt.CheckState.Unchecked if model.is_checked(index.row()) else Qt.CheckState.Checked
+        started = time.perf_counter()
+        model.setData(index, state.value, Qt.ItemDataRole.CheckStateRole)
+        table.viewport().repaint()
+        latencies.append(time.perf_counter() - started)
+    latencies.sort()
+    results["table.toggle_p50_ms"] = ms(latencies[len(latencies) // 2])
+    results["table.toggle_p99_ms"] = ms(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))])
+
+    started = time.perf_counter()
+    table.select_all()
+    table.viewport().repaint()
+    table.get_selected_keys()
+    results["table.select_all_ms"] = ms(time.perf_counter() - started)
+    table.clear_selection()
+
+
+def bench_widgets(results, count):
+    from benchmarks.bench_widget_styles import WIDGETS, build
+
+    for name, factory, variants, sizes in WIDGETS:
+        elapsed, built = build(name, factory, variants, sizes, count, per_widget=False)
+        results[f"widget.{name}_us"] = round(elapsed / built * 1e6, 2)
+
+
+def check_budgets(results, budgets):
+    """
+    Return (metric, value, budget) for every budget exceeded, and the
+    budgeted metrics that have no result
+    """
+    exceeded = [
+        (metric, results[metric], budget)
+        for metric, budget in budgets.items()
+        if metric in results and results[metric] > budget
+    ]
+    missing = [metric for metric in budgets if metric not in results]
+    return exceeded, missing
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=10000, help="synthetic users seeded for MainWindow")
+    parser.add_argument("--db", help="database URL (default: sqlite:///bench-<rows>.db)")
+    parser.add_argument("--sizes", default="1000,100000,1000000", help="comma-separated table sizes to populate")
+    parser.add_argument("--count", type=int, default=10, help="repetitions of every widget variant/size")
+    parser.add_argument("--budgets", default=BUDGETS_FILE, help="JSON file of metric -> maximum")
+    parser.add_argument("--out", default="bench_gui.json", help="results file")
+    args = parser.parse_args(argv)
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    logging.getLogger("app.slow_query").setLevel(logging.ERROR)
+    # Settings are read when app.core.config is first imported
+    os.environ["DATABASE_URL"] = args.db or f"sqlite:///bench-{args.rows}.db"
+    os.environ.setdefault("CHANGE_FEED_ENABLED", "false")
+    os.environ.setdefault("SNAPSHOT_ENABLED", "false")  # measure the cold path
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    from app.db.init_db import init_db
+    from app.gui.fonts import get_font, load_fonts
+    from benchmarks.bench_user_service import git_commit, seed
+
+    load_fonts()
+    app.setFont(get_font())
+    init_db()
+    seed(args.rows, 0)
+
+    results = {}
+    bench_main_window(results)
+    bench_table(results, sizes)
+    bench_widgets(results, args.count)
+
+    with open(args.budgets, encoding="utf-8") as handle:
+        budgets = json.load(handle)
+    exceeded, missing = check_budgets(results, budgets)
+
+    width = max(len(metric) for metric in [*results, *missing])
+    for metric, value in results.items():
+        budget = budgets.get(metric)
+        status = "" if budget is None else ("  OVER" if value > budget else "  ok")
+        print(f"{metric:<{width}} {value:>12.2f} {'' if budget is None else f'/ {budget}':>12}{status}")
+    for metric in missing:
+        print(f"{metric:<{width}} {'-':>12} {f'/ {budgets[metric]}':>12}  MISSING")
+
+    with open(args.out, "w", encoding="utf-8") as handle:
+        json.dump({
+            "benchmark": "gui",
+            "commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "platform": QApplication.platformName(),
+            "rows": args.rows,
+            "results": results,
+            "budgets": budgets,
+            "exceeded": [metric for metric, _, _ in exceeded],
+            "missing": missing,
+        }, handle, indent=2)
+    print(f"results written to {args.out}")
+    app.quit()
+
+    if exceeded or missing:
+        for metric, value, budget in exceeded:
+            print(f"budget exceeded: {metric} = {value} > {budget}", file=sys.stderr)
+        for metric in missing:
+            print(f"budget not measured: {metric}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Theme compile and switch time on a busy window.
+
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_theme_switch --widgets 400
+
+Builds a window holding ``--widgets`` instances of each custom widget,
+then toggles between the light and dark themes and reports the cold
+compile time and the per-switch apply time against a 60 fps frame.
+"""
+import argparse
+import statistics
+import sys
+import time
+
+from PyQt6.QtWidgets import QApplication, QVBoxLayout, QWidget
+
+from app.gui import theme
+from app.gui.widgets.ui import styles
+from app.gui.widgets.ui.button import Button
+from app.gui.widgets.ui.input import Input
+from app.gui.widgets.ui.label import Label
+from app.gui.widgets.ui.table import Table
+
+FRAME_MS = 1000 / 60
+
+
+def build_window(count):
+    window = QWidget()
+    layout = QVBoxLayout(window)
+    for index in range(count):
+        layout.addWidget(Button(f"Button {index}"))
+        layout.addWidget(Input(placeholder=f"Input {index}"))
+        layout.addWidget(Label(f"Label {index}"))
+    for _ in range(max(1, count // 50)):
+        layout.addWidget(Table())
+    window.show()
+    QApplication.processEvents()
+    return window
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--widgets", type=int, default=400, help="widgets of each kind")
+    parser.add_argument("--switches", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    window = build_window(args.widgets)
+
+    # Building the window already compiled the current theme
+    styles.clear_compiled()
+    started = time.perf_counter()
+    for name in theme.THEMES:
+        styles.compile_stylesheet(name)
+    compile_ms = (time.perf_counter() - started) * 1000 / len(theme.THEMES)
+
+    names = list(theme.THEMES)
+    applies = []
+    for index in range(args.switches):
+        timings = styles.set_theme(names[(index + 1) % len(names)])
+        applies.append(timings["apply_ms"])
+        QApplication.processEvents()
+
+    print(f"widgets:            {args.widgets * 3}")
+    print(f"compile (cold) ms:  {compile_ms:.2f}")
+    print(f"apply median ms:    {statistics.median(applies):.2f}")
+    print(f"apply max ms:       {max(applies):.2f}")
+    print(f"frame budget ms:    {FRAME_MS:.2f}")
+    window.close()
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+"""
+user_service against a seeded database: latency, throughput and peak RSS.
+
+    python -m benchmarks.bench_user_service --rows 10000
+    python -m benchmarks.bench_user_service --rows 1000000 --db sqlite:///bench-1m.db
+    python -m benchmarks.bench_user_service --db postgresql+psycopg2://user:pw@localhost/bench
+
+The database is seeded once with ``--rows`` synthetic users (see
+``benchmarks.synthetic``) and reused by later runs with the same row count.
+Write benchmarks only touch users they add themselves and remove them
+again, so the seeded rows stay comparable across runs and commits.
+
+Caches are cleared before every call so the numbers measure the database
+path; ``--warm`` keeps them. Results are written as JSON to ``--out``;
+``--baseline`` compares them with an earlier results file.
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from benchmarks.synthetic import chunks, synthetic_users
+
+SEED_CHUNK = 10000
+BULK_SIZE = 500
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+class Runner:
+    """Times calls per operation and summarises them"""
+
+    def __init__(self, warm):
+        from app.services.user_service import clear_caches
+
+        self.clear_caches = clear_caches
+        self.warm = warm
+        self.results = {}
+
+    def measure(self, name, calls, rows=None):
+        """Time each ``fn()`` in ``calls``, which handle ``rows`` rows (default one per call)"""
+        calls = list(calls)
+        latencies = []
+        for fn in calls:
+            if not self.warm:
+                self.clear_caches()
+            started = time.perf_counter()
+            fn()
+            latencies.append(time.perf_counter() - started)
+        self.record(name, latencies, len(latencies) if rows is None else rows)
+
+    def record(self, name, latencies, rows):
+        latencies = sorted(latencies)
+        total = sum(latencies)
+        self.results[name] = {
+            "calls": len(latencies),
+            "rows": rows,
+            "total_s": round(total, 4),
+            "calls_per_s": round(len(latencies) / total, 1) if total else None,
+            "rows_per_s": round(rows / total, 1) if total else None,
+            "p50_ms": round(percentile(latencies, 0.5) * 1000, 3),
+            "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+            "peak_rss_mb": peak_rss_mb(),
+        }
+        result = self.results[name]
+        print(f"{name:<24} {result['calls']:>7} {result['calls_per_s'] or 0:>10.1f} "
+              f"{result['rows_per_s'] or 0:>12.1f} {result['p50_ms']:>9.3f} {result['p99_ms']:>9.3f} "
+              f"{result['peak_rss_mb'] or 0:>9.1f}")
+
+
+def seed(rows, seed_value):
+    """Fill an empty Users table; returns the seconds taken, or None if reused"""
+    from sqlalchemy import insert, text
+
+    from app.db.session import engine
+    from app.models.user import CHANGE_LOG_TABLE, User
+    from app.services.user_service import count_users
+
+    existing = count_users()
+    if existing == rows:
+        return None
+    if existing:
+        raise SystemExit(f"Database holds {existing} users, not {rows}; use a fresh database")
+
+    started = time.perf_counter()
+    seeded = 0
+    for chunk in chunks(synthetic_users(rows, seed_value), SEED_CHUNK):
+        with engine.begin() as connection:
+            connection.execute(insert(User), [{"name": name, "email": email} for name, email in chunk])
+        seeded += len(chunk)
+        print(f"\rseeding {seeded}/{rows}", end="", file=sys.stderr)
+    print(file=sys.stderr)
+    if engine.dialect.name == "sqlite":
+        # The change-feed log would otherwise hold one row per seeded user
+        with engine.begin() as connection:
+            connection.execute(text(f'DELETE FROM "{CHANGE_LOG_TABLE}"'))
+    return time.perf_counter() - started
+
+
+def run(args):
+    from app.core.config import settings
+    from app.db.init_db import init_db
+    from app.db.session import engine
+    from app.services import user_service
+    from app.services.user_service import EditOp, FieldChange
+
+    init_db()
+    seed_s = seed(args.rows, args.seed)
+    if seed_s is not None:
+        print(f"seeded {args.rows} rows in {seed_s:.1f} s ({args.rows / seed_s:.0f} rows/s)")
+
+    rng = random.Random(args.seed)
+    # Seeded ids are consecutive
+    first_id = user_service.get_users_page(None, 1, "id")[0][0].id
+    seeded_ids = range(first_id, first_id + args.rows)
+    bulk_size = min(BULK_SIZE, args.rows)
+
+    runner = Runner(args.warm)
+    print(f"{'operation':<24} {'calls':>7} {'calls/s':>10} {'rows/s':>12} {'p50 ms':>9} {'p99 ms':>9} {'rss MB':>9}")
+
+    # Reads
+    runner.measure("get_user", [lambda i=rng.choice(seeded_ids): user_service.get_user(i) for _ in range(args.calls)])
+    batches = max(args.calls // 20, 5)
+    runner.measure(
+        "get_users_by_ids",
+        [lambda ids=rng.sample(seeded_ids, bulk_size): user_service.get_users_by_ids(ids) for _ in range(batches)],
+        rows=batches * bulk_size,
+    )
+    pages = max(args.calls // 10, 5)
+    for order_by in ("id", "name"):
+        # Keyset pages continuing from random positions
+        cursors = [user_service.get_users_block(rng.randrange(args.rows), 1, order_by)[2] for _ in range(pages)]
+        runner.measure(
+            f"get_users_page[{order_by}]",
+            [lambda cursor=cursor, order_by=order_by: user_service.get_users_page(cursor, args.page_size, order_by)
+             for cursor in cursors],
+            rows=pages * args.page_size,
+        )
+        # OFFSET jumps to random positions
+        runner.measure(
+            f"get_users_block[{order_by}]",
+            [lambda offset=rng.randrange(args.rows), order_by=order_by:
+             user_service.get_users_block(offset, args.page_size, order_by)
+             for _ in range(pages)],
+            rows=pages * args.page_size,
+        )
+    runner.measure("count_users", [user_service.count_users] * 5)
+    runner.measure(
+        "search_users",
+        [lambda query=rng.choice(["nguyen", "alice", "tran", "example.org"]): user_service.search_users(query)
+         for _ in range(batches)],
+    )
+    if not args.skip_scan:
+        def scan():
+            return sum(1 for _ in user_service.get_all_users(args.page_size))
+        runner.measure("get_all_users", [scan], rows=args.rows)
+
+    # Writes, on users added here and removed again
+    token = f"{os.getpid()}-{int(time.time())}"
+    added = []
+    runner.measure(
+        "add_user",
+        [lambda i=i: added.append(user_service.add_user(f"Bench {i}", f"bench.{token}.{i}@bench.invalid"))
+         for i in range(args.calls)],
+    )
+    runner.measure(
+        "update_user",
+        [lambda user=user: user_service.update_user(user.id, user.name + " x", user.email, user.version)
+         for user in added],
+    )
+    ids = [user.id for user in added]
+    rename = [FieldChange("name", EditOp.REPLACE, value=" y", find=" x")]
+    runner.measure(
+        "update_users",
+        [lambda chunk=ids[start:start + BULK_SIZE]: user_service.update_users(chunk, rename)
+         for start in range(0, len(ids), BULK_SIZE)],
+        rows=len(ids),
+    )
+    half = len(ids) // 2
+    runner.measure("delete_user", [lambda i=i: user_service.delete_user(i) for i in ids[:half]])
+    rest = ids[half:]
+    runner.measure(
+        "delete_users",
+        [lambda chunk=rest[start:start + BULK_SIZE]: user_service.delete_users(chunk)
+         for start in range(0, len(rest), BULK_SIZE)],
+        rows=len(rest),
+    )
+
+    return {
+        "benchmark": "user_service",
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "database": engine.dialect.name,
+        "rows": args.rows,
+        "seed": args.seed,
+        "seed_s": round(seed_s, 2) if seed_s is not None else None,
+        "warm_cache": args.warm,
+        "metrics_enabled": settings.METRICS_ENABLED,
+        "results": runner.results,
+    }
+
+
+def compare(report, baseline_path):
+    """Print how each operation moved against an earlier results file"""
+    with open(baseline_path, encoding="utf-8") as handle:
+        baseline = json.load(handle)
+    print(f"\nvs {baseline_path} (commit {baseline.get('commit')}, {baseline.get('rows')} rows)")
+    print(f"{'operation':<24} {'p50':>9} {'p99':>9} {'calls/s':>9}")
+    for name, result in report["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if not before:
+            continue
+
+        def ratio(key):
+            return f"{result[key] / before[key]:>8.2f}x" if before.get(key) and result.get(key) else f"{'-':>9}"
+        print(f"{name:<24} {ratio('p50_ms')} {ratio('p99_ms')} {ratio('calls_per_s')}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=10000, help="synthetic users to seed")
+    parser.add_argument("--db", help="database URL (default: sqlite:///bench-<rows>.db)")
+    parser.add_argument("--calls", type=int, default=1000, help="calls per single-row operation")
+    parser.add_argument("--page-size", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0, help="generator seed")
+    parser.add_argument("--warm", action="store_true", help="keep the service caches between calls")
+    parser.add_argument("--skip-scan", action="store_true", help="skip the full get_all_users scan")
+    parser.add_argument("--out", default="bench_user_service.json", help="results file")
+    parser.add_argument("--baseline", help="earlier results file to compare against")
+    args = parser.parse_args(argv)
+
+    # Seeding chunks are slow by design; keep them out of the slow-query log
+    logging.getLogger("app.slow_query").setLevel(logging.ERROR)
+    # Settings are read when app.core.config is first imported
+    os.environ["DATABASE_URL"] = args.db or f"sqlite:///bench-{args.rows}.db"
+    report = run(args)
+    with open(args.out, "w", encoding="utf-8") as handle:
+        json.dump(report, handle, indent=2)
+    print(f"results written to {args.out}")
+    if args.baseline:
+        compare(report, args.baseline)
+
+
+if __name__ == "__main__":
+    main()
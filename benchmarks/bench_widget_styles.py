@@ -0,0 +1,70 @@
+"""
+Widget construction cost with the shared application stylesheet versus the
+old per-widget stylesheets.
+
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_widget_styles --count 20
+
+Every variant/size combination of Button, Input, Label and Table is built
+``--count`` times and polished. The "per-widget" mode runs without the
+application stylesheet and gives each instance its own copy of its
+stylesheet, as the widgets did before.
+"""
+import argparse
+import itertools
+import sys
+import time
+from contextlib import nullcontext
+
+from PyQt6.QtWidgets import QApplication, QWidget
+
+from app.gui.widgets.ui import styles
+from app.gui.widgets.ui.button import Button, ButtonSize, ButtonVariant
+from app.gui.widgets.ui.input import Input, InputSize, InputVariant
+from app.gui.widgets.ui.label import Label, LabelSize, LabelVariant
+from app.gui.widgets.ui.table import Table, TableSize, TableVariant
+
+WIDGETS = [
+    ("button", lambda parent, v, s: Button("Button", parent, variant=v, size=s), ButtonVariant, ButtonSize),
+    ("input", lambda parent, v, s: Input(parent, "Input", variant=v, size=s), InputVariant, InputSize),
+    ("label", lambda parent, v, s: Label("Label", parent, variant=v, size=s), LabelVariant, LabelSize),
+    ("table", lambda parent, v, s: Table(parent, variant=v, size=s), TableVariant, TableSize),
+]
+
+
+def build(name, factory, variants, sizes, count, per_widget):
+    """Return seconds spent constructing and polishing the widgets"""
+    with styles.suspended() if per_widget else nullcontext():
+        parent = QWidget()
+        combos = list(itertools.product(variants, sizes))
+        started = time.perf_counter()
+        for _ in range(count):
+            for variant, size in combos:
+                widget = factory(parent, variant, size)
+                if per_widget:
+                    widget.setStyleSheet(styles.standalone_stylesheet(name, variant, size))
+                widget.ensurePolished()
+        elapsed = time.perf_counter() - started
+        parent.deleteLater()
+        QApplication.processEvents()
+    return elapsed, count * len(combos)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--count", type=int, default=20, help="repetitions of every variant/size")
+    args = parser.parse_args(argv)
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    styles.ensure_installed()
+
+    print(f"{'widget':<8} {'mode':<11} {'widgets':>8} {'total ms':>10} {'us/widget':>10}")
+    for name, factory, variants, sizes in WIDGETS:
+        for per_widget in (True, False):
+            elapsed, built = build(name, factory, variants, sizes, args.count, per_widget)
+            mode = "per-widget" if per_widget else "shared"
+            print(f"{name:<8} {mode:<11} {built:>8} {elapsed * 1000:>10.1f} {elapsed / built * 1e6:>10.1f}")
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
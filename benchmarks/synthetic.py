@@ -0,0 +1,40 @@
+"""
+Deterministic synthetic users for benchmarks.
+
+The same ``seed`` always yields the same rows in the same order, so a
+database seeded by one commit can be compared with one seeded by another.
+Emails carry the row index and are therefore unique.
+"""
+import random
+
+FIRST_NAMES = [
+    "Anh", "Binh", "Chi", "Dung", "Giang", "Hoa", "Hung", "Lan", "Linh", "Minh",
+    "Nam", "Ngoc", "Phuong", "Quang", "Son", "Thao", "Trang", "Tuan", "Van", "Yen",
+    "Alice", "Bob", "Carol", "David", "Emma", "Frank", "Grace", "Henry", "Iris", "Jack",
+]
+LAST_NAMES = [
+    "Nguyen", "Tran", "Le", "Pham", "Hoang", "Phan", "Vu", "Dang", "Bui", "Do",
+    "Smith", "Johnson", "Brown", "Taylor", "Miller", "Wilson", "Moore", "Clark",
+]
+DOMAINS = ["example.com", "example.org", "mail.test", "corp.test", "users.invalid"]
+
+
+def synthetic_users(count, seed=0):
+    """Yield ``count`` (name, email) pairs"""
+    rng = random.Random(seed)
+    for index in range(count):
+        first = rng.choice(FIRST_NAMES)
+        last = rng.choice(LAST_NAMES)
+        yield f"{first} {last}", f"{first.lower()}.{last.lower()}.{index}@{rng.choice(DOMAINS)}"
+
+
+def chunks(rows, size):
+    """Group an iterable into lists of at most ``size``"""
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
@@ -0,0 +1,55 @@
+import os
+
+import pytest
+
+# Settings are read when app.core.config is first imported
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ.setdefault("CHANGE_FEED_ENABLED", "false")
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    from PyQt6.QtWidgets import QApplication
+
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture(scope="session")
+def _schema():
+    from app.db.init_db import init_db
+
+    init_db()
+
+
+@pytest.fixture
+def db(_schema):
+    """The migrated in-memory database, emptied, with cold service caches"""
+    from sqlalchemy import text
+
+    from app.db.session import engine
+    from app.models.user import CHANGE_LOG_TABLE
+    from app.services.user_service import clear_caches
+
+    with engine.begin() as connection:
+        connection.execute(text('DELETE FROM "Users"'))
+        connection.execute(text(f'DELETE FROM "{CHANGE_LOG_TABLE}"'))
+    clear_caches()
+    return engine
+
+
+@pytest.fixture
+def add_users(db):
+    """Insert users given as (name, email) pairs; returns their ids in order"""
+    from sqlalchemy import insert
+
+    from app.models.user import User
+
+    def add(pairs):
+        with db.begin() as connection:
+            return [
+                connection.execute(insert(User).values(name=name, email=email)).inserted_primary_key[0]
+                for name, email in pairs
+            ]
+
+    return add
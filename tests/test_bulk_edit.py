@@ -0,0 +1,105 @@
+import pytest
+
+from app.models.user import NAME_MAX_LENGTH
+from app.services import user_service
+from app.services.user_service import EditOp, FieldChange
+
+USERS = [
+    ("Ada Byron", "ada@old.example"),
+    ("Alan Byron", "alan@old.example"),
+    ("Grace", "grace@navy.example"),
+    ("Nobody", "no-at-sign"),
+]
+
+
+@pytest.fixture
+def ids(add_users):
+    return add_users(USERS)
+
+
+def _rows():
+    return [(user.name, user.email, user.version) for user in user_service.get_all_users()]
+
+
+@pytest.mark.parametrize("changes, count, message", [
+    ([], 1, "no changes"),
+    ([FieldChange("name", EditOp.SET, "a"), FieldChange("name", EditOp.SET, "b")], 1, "one change per field"),
+    ([FieldChange("phone", EditOp.SET, "1")], 1, "Unsupported field"),
+    ([FieldChange("name", EditOp.SET, "x" * (NAME_MAX_LENGTH + 1))], 1, "longer than"),
+    ([FieldChange("name", EditOp.SET, "  ")], 1, "cannot be empty"),
+    ([FieldChange("email", EditOp.SET, "a@b.example")], 2, "one user at a time"),
+    ([FieldChange("name", EditOp.REPLACE, "x")], 1, "text to replace"),
+    ([FieldChange("name", EditOp.DOMAIN, "new.example")], 1, "only emails"),
+    ([FieldChange("email", EditOp.DOMAIN, "@new.example")], 1, "invalid domain"),
+    ([FieldChange("email", EditOp.DOMAIN, "localhost")], 1, "invalid domain"),
+])
+def test_validate_changes_rejects(changes, count, message):
+    with pytest.raises(ValueError, match=message):
+        user_service.validate_changes(changes, count)
+
+
+def test_validate_changes_accepts_an_email_for_one_user():
+    user_service.validate_changes([FieldChange("email", EditOp.SET, "a@b.example")], 1)
+
+
+def test_set_replace_and_domain_in_one_update(ids):
+    changes = [
+        FieldChange("name", EditOp.REPLACE, "Lovelace", find="Byron"),
+        FieldChange("email", EditOp.DOMAIN, "new.example"),
+    ]
+    assert user_service.update_users(ids[:2], changes) == 2
+    assert _rows()[:3] == [
+        ("Ada Lovelace", "ada@new.example", 2),
+        ("Alan Lovelace", "alan@new.example", 2),
+        ("Grace", "grace@navy.example", 1),
+    ]
+
+
+def test_domain_leaves_values_without_an_at_sign(ids):
+    user_service.update_users([ids[3]], [FieldChange("email", EditOp.DOMAIN, "new.example")])
+    assert user_service.get_user(ids[3]).email == "no-at-sign"
+
+
+def test_replace_that_would_empty_a_value_writes_nothing(ids):
+    with pytest.raises(ValueError, match="would leave 1 names empty"):
+        user_service.update_users(ids, [FieldChange("name", EditOp.REPLACE, "", find="Grace")])
+    assert [version for _, _, version in _rows()] == [1, 1, 1, 1]
+
+
+def test_updates_are_visible_through_the_cache(ids):
+    user_service.get_user(ids[2])
+    user_service.update_users([ids[2]], [FieldChange("name", EditOp.SET, "Grace Hopper")])
+    assert user_service.get_user(ids[2]).name == "Grace Hopper"
+
+
+def test_update_matching_covers_the_query_minus_exclusions(ids):
+    changes = [FieldChange("name", EditOp.REPLACE, "B.", find="Byron")]
+    assert user_service.update_matching(changes, "byron", exclude=[ids[1]]) == 1
+    assert [name for name, _, _ in _rows()] == ["Ada B.", "Alan Byron", "Grace", "Nobody"]
+
+
+def test_update_matching_sets_names_on_every_user(ids):
+    assert user_service.update_matching([FieldChange("name", EditOp.SET, "Anon")]) == len(USERS)
+    assert {name for name, _, _ in _rows()} == {"Anon"}
+    with pytest.raises(ValueError, match="one user at a time"):
+        user_service.update_matching([FieldChange("email", EditOp.SET, "a@b.example")])
+
+
+def test_rows_left_unchanged_are_not_written(ids):
+    assert user_service.update_users(ids, [FieldChange("name", EditOp.REPLACE, "B.", find="Byron")]) == 2
+    assert user_service.update_users(ids, [FieldChange("email", EditOp.DOMAIN, "navy.example")]) == 2
+    assert user_service.update_users(ids[2:3], [FieldChange("name", EditOp.SET, "Grace")]) == 0
+    assert _rows() == [
+        ("Ada B.", "ada@navy.example", 3),
+        ("Alan B.", "alan@navy.example", 3),
+        ("Grace", "grace@navy.example", 1),
+        ("Nobody", "no-at-sign", 1),
+    ]
+
+
+def test_any_changed_field_writes_the_row(ids):
+    user_service.update_users(ids[:1], [FieldChange("email", EditOp.DOMAIN, "new.example")])
+    changes = [FieldChange("name", EditOp.REPLACE, "B.", find="Byron"), FieldChange("email", EditOp.DOMAIN, "new.example")]
+    assert user_service.update_matching(changes) == 3
+    assert [version for _, _, version in _rows()] == [3, 2, 2, 1]
+    assert user_service.update_matching(changes) == 0
@@ -0,0 +1,111 @@
+import pytest
+
+from app.services import user_service
+from app.services.cache import LRUCache, MISSING
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    assert cache.get("b") is MISSING
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_expired_entry_is_a_miss():
+    clock = Clock()
+    cache = LRUCache(maxsize=4, ttl=10, clock=clock)
+    cache.put("a", 1)
+    clock.now = 10
+    assert cache.get("a") == 1
+    clock.now = 10.5
+    assert cache.get("a") is MISSING
+    assert len(cache) == 0
+    assert cache.stats()["expirations"] == 1
+
+
+@pytest.mark.parametrize("invalidate", [
+    lambda cache: cache.pop("a"),
+    lambda cache: cache.discard_where(lambda key, value: False),
+    lambda cache: cache.clear(),
+])
+def test_put_loses_to_an_invalidation_that_raced_it(invalidate):
+    cache = LRUCache()
+    generation = cache.generation
+    invalidate(cache)
+    assert cache.put("a", "stale", generation) is False
+    assert cache.get("a") is MISSING
+    assert cache.put("a", "fresh", cache.generation) is True
+
+
+def test_discard_where_drops_matching_entries():
+    cache = LRUCache()
+    for key in range(6):
+        cache.put(key, key)
+    assert cache.discard_where(lambda key, value: value % 2) == 3
+    assert sorted(key for key in range(6) if cache.get(key) is not MISSING) == [0, 2, 4]
+
+
+@pytest.fixture
+def ids(add_users):
+    return add_users((f"user{index}", f"user{index}@example.com") for index in range(9))
+
+
+def _cached_pages():
+    return {key[:2] for key in user_service._page_cache._data}
+
+
+def test_invalidate_drops_only_the_id_pages_covering_the_user(ids):
+    first, cursor = user_service.get_users_page(None, 3)
+    middle, _ = user_service.get_users_page(cursor, 3)
+    user_service.get_users_page(None, 3, "name")
+    assert len(user_service._page_cache) == 3
+
+    user_service._invalidate([middle[1].id])
+    assert _cached_pages() == {("id", None)}
+    assert user_service._user_cache.get(middle[1].id) is MISSING
+    assert user_service._user_cache.get(first[0].id) is not MISSING
+
+
+def test_invalidate_covers_rows_a_backward_page_skipped(ids):
+    _, cursor = user_service.get_users_page(None, 7)
+    user_service._page_cache.clear()
+    user_service.get_users_page(cursor, 2, backward=True, skip=2)
+    # The page holds ids 3-4, but was read through 5-7 and stays valid only while they do
+    user_service._invalidate([ids[8]])
+    assert len(user_service._page_cache) == 1
+    user_service._invalidate([ids[5]])
+    assert len(user_service._page_cache) == 0
+
+
+def test_writes_are_visible_through_the_page_cache(ids):
+    user_service.get_users_page(None, 5)
+    user_service.update_user(ids[2], "renamed", "renamed@example.com")
+    users, _ = user_service.get_users_page(None, 5)
+    assert users[2].name == "renamed"
+    assert user_service.get_user(ids[2]).version == 2
+
+
+def test_a_page_read_across_a_write_is_not_cached(ids, monkeypatch):
+    real_get_session = user_service.get_session
+
+    def racing_session():
+        # Another thread commits between the generation snapshot and the query
+        user_service._invalidate([ids[0]])
+        return real_get_session()
+
+    monkeypatch.setattr(user_service, "get_session", racing_session)
+    user_service.get_users_page(None, 3)
+    assert len(user_service._page_cache) == 0
+    assert user_service._user_cache.get(ids[0]) is MISSING
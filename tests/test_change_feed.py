@@ -0,0 +1,76 @@
+import pytest
+from sqlalchemy import text
+
+from app.models.user import CHANGE_LOG_TABLE
+from app.services import user_service
+from app.services.cache import MISSING
+from app.services.change_feed import ChangeEvent, ChangeListener, ChangeOp, coalesce, parse_notification
+
+INSERT, UPDATE, DELETE, RELOAD = ChangeOp.INSERT, ChangeOp.UPDATE, ChangeOp.DELETE, ChangeOp.RELOAD
+
+
+def _batch(*events):
+    batch = coalesce([ChangeEvent(op, user_id) for op, user_id in events])
+    return batch.inserted, batch.updated, batch.deleted, batch.reload
+
+
+@pytest.mark.parametrize("events, expected", [
+    ([(INSERT, 1)], ({1}, set(), set(), False)),
+    ([(INSERT, 1), (UPDATE, 1)], ({1}, set(), set(), False)),
+    ([(INSERT, 1), (DELETE, 1)], (set(), set(), set(), False)),
+    ([(UPDATE, 1), (UPDATE, 1)], (set(), {1}, set(), False)),
+    ([(UPDATE, 1), (DELETE, 1)], (set(), set(), {1}, False)),
+    # A row deleted and inserted again under the same id has changed in place
+    ([(DELETE, 1), (INSERT, 1)], (set(), {1}, set(), False)),
+    ([(INSERT, 1), (DELETE, 2), (UPDATE, 3)], ({1}, {3}, {2}, False)),
+])
+def test_coalesce_keeps_the_net_effect(events, expected):
+    assert _batch(*events) == expected
+
+
+def test_reload_is_kept_alongside_row_events():
+    assert _batch((UPDATE, 1), (RELOAD, None)) == (set(), {1}, set(), True)
+
+
+@pytest.mark.parametrize("payload, expected", [
+    ("INSERT:7", [ChangeEvent(INSERT, 7)]),
+    ("DELETE:1,2,3", [ChangeEvent(DELETE, 1), ChangeEvent(DELETE, 2), ChangeEvent(DELETE, 3)]),
+    ("UPDATE:*", [ChangeEvent(RELOAD)]),
+    ("UPDATE:", []),
+])
+def test_parse_notification(payload, expected):
+    assert parse_notification(payload) == expected
+
+
+def test_unknown_operation_is_rejected():
+    with pytest.raises(ValueError):
+        parse_notification("TRUNCATE:1")
+
+
+def test_triggers_log_every_write(db):
+    user = user_service.add_user("Ada", "ada@example.com")
+    user_service.update_user(user.id, "Ada L", "ada@example.com")
+    user_service.delete_user(user.id)
+    with db.connect() as connection:
+        rows = connection.execute(text(f'SELECT op, user_id FROM "{CHANGE_LOG_TABLE}" ORDER BY seq')).all()
+    assert [tuple(row) for row in rows] == [("INSERT", user.id), ("UPDATE", user.id), ("DELETE", user.id)]
+
+
+class Recorder(ChangeListener):
+    def __init__(self):
+        super().__init__(lambda events, read_at: self.delivered.append(events))
+        self.delivered = []
+
+
+def test_delivery_invalidates_only_the_changed_users(add_users):
+    first, second = add_users([("Ada", "ada@example.com"), ("Alan", "alan@example.com")])
+    user_service.get_users_by_ids([first, second])
+    listener = Recorder()
+    listener.deliver([], 0.0)
+    listener.deliver([ChangeEvent(UPDATE, first)], 0.0)
+    assert user_service._user_cache.get(first) is MISSING
+    assert user_service._user_cache.get(second) is not MISSING
+    assert listener.delivered == [[ChangeEvent(UPDATE, first)]]
+
+    listener.deliver([ChangeEvent(RELOAD)], 0.0)
+    assert len(user_service._user_cache) == 0
@@ -0,0 +1,20 @@
+import os
+
+from PyQt6.QtGui import QFontDatabase, QFontInfo
+
+from app.gui import fonts
+
+
+def test_font_dir_does_not_depend_on_the_working_directory():
+    assert os.path.isabs(fonts.FONT_DIR)
+    assert os.path.isdir(fonts.FONT_DIR)
+    assert os.path.samefile(fonts.FONT_DIR, os.path.join(os.path.dirname(fonts.__file__), "..", "assets", "fonts"))
+
+
+def test_platform_font_without_bundled_files(qapp, tmp_path, monkeypatch):
+    monkeypatch.setattr(fonts, "_family", None)
+    monkeypatch.setattr(fonts, "_fonts", {})
+    family = fonts.load_fonts(str(tmp_path))
+    assert family == QFontInfo(QFontDatabase.systemFont(QFontDatabase.SystemFont.GeneralFont)).family()
+    assert fonts.load_stats["files"] == 0
+    assert fonts.get_font().family() == family
@@ -0,0 +1,21 @@
+import pytest
+
+from app.core.metrics import metrics, timed
+from app.services import user_service
+
+
+def test_generator_functions_cannot_be_timed():
+    def pages():
+        yield []
+
+    with pytest.raises(TypeError, match="generator function"):
+        timed(pages)
+
+
+def test_scans_time_each_page_fetch(add_users):
+    add_users((f"user{index}", f"user{index}@example.com") for index in range(7))
+    metrics.reset()
+    assert len(list(user_service.get_all_users(page_size=3))) == 7
+    calls = metrics.snapshot()["calls"]
+    assert set(calls) == {"user_service.get_users_page"}
+    assert calls["user_service.get_users_page"]["count"] == 3
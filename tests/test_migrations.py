@@ -0,0 +1,103 @@
+import pytest
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session
+
+from app.db import migrations
+from app.db.migrations import LATEST_VERSION, MIGRATIONS, get_schema_version, migrate
+from app.models.user import User
+from app.services import user_service
+
+# Users as the old create_all() built it, before any migration existed
+LEGACY_USERS_DDL = 'CREATE TABLE "Users" (id INTEGER NOT NULL PRIMARY KEY, name VARCHAR NOT NULL, email VARCHAR NOT NULL)'
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def legacy(engine):
+    with engine.begin() as connection:
+        connection.exec_driver_sql(LEGACY_USERS_DDL)
+        connection.exec_driver_sql(
+            """INSERT INTO "Users" (name, email) VALUES ('Ada Lovelace', 'ada@example.com'), ('Alan', 'alan@example.com')"""
+        )
+    return engine
+
+
+def _index_names(engine):
+    with engine.connect() as connection:
+        return set(connection.execute(
+            text("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'Users'")
+        ).scalars())
+
+
+def test_fresh_database_reaches_the_latest_version(engine):
+    assert get_schema_version(engine) == 0
+    applied = migrate(engine)
+    assert [m.version for m in applied] == [m.version for m in MIGRATIONS]
+    assert get_schema_version(engine) == LATEST_VERSION
+    assert {"ux_Users_email", "ix_Users_lower_name", "ix_Users_lower_email"} <= _index_names(engine)
+
+
+def test_up_to_date_database_applies_nothing(engine):
+    migrate(engine)
+    assert migrate(engine) == []
+
+
+def test_target_stops_early_and_the_rest_resumes(engine):
+    assert [m.version for m in migrate(engine, target=3)] == [1, 2, 3]
+    assert get_schema_version(engine) == 3
+    assert [m.version for m in migrate(engine)] == list(range(4, LATEST_VERSION + 1))
+
+
+def test_legacy_database_keeps_its_rows(legacy):
+    migrate(legacy)
+    assert get_schema_version(legacy) == LATEST_VERSION
+    with legacy.connect() as connection:
+        rows = connection.execute(text('SELECT name, version FROM "Users" ORDER BY id')).all()
+        matches = connection.execute(text("""SELECT rowid FROM "Users_fts" WHERE "Users_fts" MATCH '"lovelace"'""")).all()
+    assert [tuple(row) for row in rows] == [("Ada Lovelace", 1), ("Alan", 1)]
+    # Rows from before the FTS table are indexed by the rebuild
+    assert len(matches) == 1
+
+
+def test_duplicate_emails_stop_before_the_unique_index(legacy):
+    with legacy.begin() as connection:
+        connection.exec_driver_sql("""INSERT INTO "Users" (name, email) VALUES ('Ada', 'ada@example.com')""")
+    with pytest.raises(IntegrityError):
+        migrate(legacy)
+    assert get_schema_version(legacy) == 2
+
+    with legacy.begin() as connection:
+        connection.exec_driver_sql("""DELETE FROM "Users" WHERE name = 'Ada'""")
+    migrate(legacy)
+    assert get_schema_version(legacy) == LATEST_VERSION
+
+
+def test_trigram_probe_leaves_nothing_behind(engine):
+    with engine.begin() as connection:
+        assert migrations._sqlite_has_trigram_fts(connection)
+        tables = connection.exec_driver_sql("SELECT name FROM sqlite_temp_master").all()
+    assert tables == []
+
+
+def test_search_index_is_skipped_without_fts5_trigram(legacy, monkeypatch):
+    monkeypatch.setattr(migrations, "_sqlite_has_trigram_fts", lambda connection: False)
+    migrate(legacy)
+    assert get_schema_version(legacy) == LATEST_VERSION
+    with legacy.begin() as connection:
+        names = set(connection.exec_driver_sql("SELECT name FROM sqlite_master").scalars())
+        connection.exec_driver_sql("""INSERT INTO "Users" (name, email) VALUES ('Grace', 'grace@example.com')""")
+    assert not {"Users_fts", "Users_fts_ai"} & names
+
+    monkeypatch.setattr(user_service, "_fts_available", None)
+    with Session(legacy) as session:
+        assert not user_service._has_fts(session)
+        condition = user_service._search_filter(session, "lovelace", "contains")
+        names = session.execute(select(User.name).where(condition)).scalars().all()
+    assert names == ["Ada Lovelace"]
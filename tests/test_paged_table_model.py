@@ -0,0 +1,185 @@
+import pytest
+
+from app.gui.widgets.ui import paged_table_model
+from app.gui.widgets.ui.paged_table_model import PagedTableModel
+from app.services import user_service
+
+BLOCK = 4
+
+
+@pytest.fixture
+def model(qapp):
+    model = PagedTableModel(show_checkbox=False, block_size=BLOCK, max_blocks=3)
+    model.set_headers(["id", "name"])
+    model.requests = []
+    model.cancelled = []
+    model.block_requested.connect(lambda *request: model.requests.append(request))
+    model.block_cancelled.connect(lambda block, generation: model.cancelled.append(block))
+    model.reset(40)
+    return model
+
+
+def _rows(block):
+    return [(key, f"user{key}") for key in range(block * BLOCK, (block + 1) * BLOCK)]
+
+
+def _load(model, block, rows=None):
+    """Paint a row of ``block`` and answer its request, handing over cursors of its ends"""
+    rows = _rows(block) if rows is None else rows
+    model.row_data(block * BLOCK)
+    model.set_block(block, model.generation, rows, f"c{rows[0][0]}" if rows else None, f"c{rows[-1][0]}" if rows else None)
+
+
+def test_missing_row_is_requested_once(model):
+    assert model.row_data(5) is None
+    assert model.row_data(6) is None
+    assert model.requests == [(1, model.generation, None, None)]
+    model.set_block(1, model.generation, _rows(1))
+    assert model.row_data(5) == (5, "user5")
+
+
+def test_least_recently_painted_block_is_evicted(model):
+    for block in range(3):
+        _load(model, block)
+    model.row_data(0)
+    _load(model, 3)
+    assert sorted(model.loaded_blocks()) == [0, 2, 3]
+
+
+def test_short_block_ends_the_table(model):
+    _load(model, 2, _rows(2)[:1])
+    assert model.rowCount() == 2 * BLOCK + 1
+
+
+def test_block_from_an_older_generation_is_ignored(model):
+    model.row_data(0)
+    generation = model.generation
+    model.reset(40)
+    model.set_block(0, generation, _rows(0))
+    assert model.loaded_blocks() == []
+
+
+def test_failed_block_waits_before_retrying(model, monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(paged_table_model.time, "monotonic", lambda: now[0])
+    model.row_data(0)
+    assert model.block_failed(0, model.generation) == 1000
+    model.row_data(0)
+    assert len(model.requests) == 1
+    now[0] += 1.5
+    model.row_data(0)
+    assert len(model.requests) == 2
+
+
+def test_far_requests_cancel_the_ones_left_behind(model):
+    model.row_data(0)
+    model.row_data(9 * BLOCK)
+    assert model.cancelled == [0]
+
+
+def test_seek_hints_pick_the_nearest_cursor(model):
+    _load(model, 0)
+    _load(model, 7)
+    assert model._seek_hints(1) == (("c3", 0), None)
+    assert model._seek_hints(6) == (None, ("c28", 0))
+    assert model._seek_hints(3) == (("c3", 8), None)
+    assert model._seek_hints(5) == (None, ("c28", 4))
+
+
+def test_seek_from_the_top_when_no_cursor_is_closer(model):
+    _load(model, 7)
+    assert model._seek_hints(1) == (None, None)
+
+
+@pytest.fixture
+def ids(add_users):
+    return add_users((f"user{index:02}", f"user{index:02}@example.com") for index in range(30))
+
+
+@pytest.mark.parametrize("order_by", ["id", "name"])
+def test_blocks_read_through_seek_hints_match_offsets(ids, order_by):
+    _, first, last = user_service.get_users_block(0, BLOCK, order_by)
+    _, bottom, _ = user_service.get_users_block(6 * BLOCK, BLOCK, order_by)
+    expected = [user.id for user in user_service.get_users_block(3 * BLOCK, BLOCK, order_by)[0]]
+
+    after, _, _ = user_service.get_users_block(3 * BLOCK, BLOCK, order_by, after=last, skip=2 * BLOCK)
+    before, _, _ = user_service.get_users_block(3 * BLOCK, BLOCK, order_by, before=bottom, skip=2 * BLOCK)
+    adjacent, _, _ = user_service.get_users_block(BLOCK, BLOCK, order_by, after=last)
+    assert [user.id for user in after] == expected
+    assert [user.id for user in before] == expected
+    assert [user.id for user in adjacent] == sorted(ids)[BLOCK:2 * BLOCK]
+
+
+@pytest.fixture
+def gapped(model):
+    """Blocks 0, 2 and 4 loaded; block 1 was loaded and evicted, leaving its cursors"""
+    for block in (1, 0, 2, 4):
+        _load(model, block)
+    assert sorted(model.loaded_blocks()) == [0, 2, 4]
+    return model
+
+
+def _assert_rows(model, row_of_key):
+    """Every loaded row sits where ``row_of_key`` says its key belongs"""
+    loaded = list(model._loaded_rows())
+    assert loaded
+    for row, values in loaded:
+        assert row == row_of_key(values[0]), values
+
+
+def _after_removing(removed):
+    return lambda key: key - sum(other < key for other in removed)
+
+
+def test_removing_a_loaded_key_shifts_the_rows_after_it(gapped):
+    assert gapped.remove_keys([1]) == 1
+    assert gapped.rowCount() == 39
+    _assert_rows(gapped, _after_removing([1]))
+    assert gapped.find_row(9) == 8
+    # Rows cut off from the start of their block are fetched again
+    assert gapped.find_row(8) == -1
+
+
+def test_removing_an_unloaded_key_takes_a_row_from_its_gap(gapped):
+    assert gapped.remove_keys([5]) == 1
+    assert gapped.rowCount() == 39
+    _assert_rows(gapped, _after_removing([5]))
+    assert gapped.find_row(3) == 3
+    # Cursors inside the gap no longer know their row; the others moved with it
+    assert sorted(gapped._hints) == [0, 3, 7, 10, 15, 18]
+    assert gapped._hints[7] == "c8"
+
+
+def test_removing_several_gaps_and_rows(gapped):
+    assert gapped.remove_keys([2, 5, 6, 13]) == 4
+    assert gapped.rowCount() == 36
+    _assert_rows(gapped, _after_removing([2, 5, 6, 13]))
+    assert gapped.find_row(3) == 2
+
+
+def test_insert_goes_before_the_next_greater_loaded_key(gapped):
+    gapped.insert_by_key((6, "user6b"))
+    assert gapped.rowCount() == 41
+    assert gapped.find_row(6) == 8
+    _assert_rows(gapped, lambda key: 8 if key == 6 else key + (key >= 8))
+    assert 4 not in gapped._hints and 7 not in gapped._hints
+
+
+def test_insert_after_the_last_loaded_key_appends(qapp):
+    model = PagedTableModel(show_checkbox=False, block_size=BLOCK)
+    model.set_headers(["id", "name"])
+    model.set_rows(_rows(0) + _rows(1)[:2])
+    model.insert_by_key((50, "user50"))
+    assert model.row_data(6) == (50, "user50")
+    model.insert_by_key((4, "user4b"))
+    assert [model.row_data(row)[0] for row in range(model.rowCount())] == [0, 1, 2, 3, 4, 4, 5, 50]
+
+
+def test_row_deltas_abandon_fetches_in_flight(gapped):
+    gapped.row_data(6 * BLOCK)
+    generation = gapped.generation
+    gapped.remove_keys([0])
+    assert 6 in gapped.cancelled
+    assert gapped.generation != generation
+    gapped.set_block(6, generation, _rows(6))
+    assert 6 not in gapped.loaded_blocks()
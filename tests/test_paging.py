@@ -0,0 +1,81 @@
+import pytest
+
+from app.services import user_service
+
+NAMES = ["carol", "alice", "bob", "alice", "dave", "bob", "erin"]
+
+
+@pytest.fixture
+def ids(add_users):
+    return add_users((name, f"{name}{index}@example.com") for index, name in enumerate(NAMES))
+
+
+def _key(order_by):
+    return (lambda user: user.id) if order_by == "id" else (lambda user: (getattr(user, order_by), user.id))
+
+
+def _all_pages(order_by, limit):
+    pages, cursor = [], None
+    while True:
+        users, cursor = user_service.get_users_page(cursor, limit, order_by)
+        pages.append(users)
+        if cursor is None:
+            return pages
+
+
+def test_cursor_round_trip():
+    user = user_service.User(id=7, name="alice", email="a@example.com")
+    assert user_service.decode_cursor(user_service.encode_cursor("id", user), "id") == [7]
+    assert user_service.decode_cursor(user_service.encode_cursor("name", user), "name") == ["alice", 7]
+
+
+def test_cursor_is_checked():
+    user = user_service.User(id=7, name="alice", email="a@example.com")
+    with pytest.raises(ValueError, match="issued for order 'name'"):
+        user_service.decode_cursor(user_service.encode_cursor("name", user), "email")
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        user_service.decode_cursor("not a cursor", "id")
+
+
+@pytest.mark.parametrize("order_by", ["id", "name", "email"])
+@pytest.mark.parametrize("limit", [1, 2, 3, 7, 50])
+def test_pages_cover_every_row_once_in_order(ids, order_by, limit):
+    pages = _all_pages(order_by, limit)
+    users = [user for page in pages for user in page]
+    assert len(users) == len(NAMES)
+    assert users == sorted(users, key=_key(order_by))
+    assert all(len(page) == limit for page in pages[:-1])
+
+
+def test_last_page_has_no_cursor(ids):
+    users, cursor = user_service.get_users_page(None, len(NAMES), "id")
+    assert len(users) == len(NAMES)
+    assert cursor is None
+
+
+@pytest.mark.parametrize("order_by", ["id", "name"])
+def test_backward_page_holds_the_rows_before_the_cursor(ids, order_by):
+    everything = [user.id for page in _all_pages(order_by, 50) for user in page]
+    middle, _ = user_service.get_users_page(None, 5, order_by)
+    cursor = user_service.encode_cursor(order_by, middle[-1])
+
+    users, before = user_service.get_users_page(cursor, 2, order_by, backward=True)
+    assert [user.id for user in users] == everything[2:4]
+    users, before = user_service.get_users_page(before, 2, order_by, backward=True)
+    assert [user.id for user in users] == everything[0:2]
+    assert before is None
+
+
+def test_get_all_users_streams_every_user(ids):
+    assert [user.id for user in user_service.get_all_users(page_size=3)] == sorted(ids)
+
+
+@pytest.mark.parametrize("kwargs, message", [
+    ({"order_by": "version"}, "Unsupported order"),
+    ({"limit": 0}, "limit must be positive"),
+    ({"backward": True}, "needs a cursor"),
+    ({"skip": -1}, "skip must not be negative"),
+])
+def test_invalid_arguments(db, kwargs, message):
+    with pytest.raises(ValueError, match=message):
+        user_service.get_users_page(**kwargs)
@@ -0,0 +1,94 @@
+import pytest
+
+from app.services import user_service
+
+USERS = [
+    ("Alice Smith", "alice@example.com"),
+    ("Bob Stone", "bob@sample.org"),
+    ("alina park", "park@example.com"),
+    ("Carol 100%", "carol_x@example.net"),
+    ("Dave", "dave@mail.alice.io"),
+]
+
+
+@pytest.fixture
+def ids(add_users):
+    return add_users(USERS)
+
+
+@pytest.fixture(params=["fts", "like"])
+def engine(request, db, monkeypatch):
+    """Run contains-searches through the FTS5 table and through LIKE"""
+    if request.param == "like":
+        monkeypatch.setattr(user_service, "_fts_available", False)
+    else:
+        with user_service.get_session() as session:
+            if not user_service._has_fts(session):
+                pytest.skip("SQLite without FTS5 trigram support")
+    return request.param
+
+
+def _names(query, mode, **kwargs):
+    users, _ = user_service.search_users(query, mode=mode, **kwargs)
+    return [user.name for user in users]
+
+
+def test_prefix_matches_the_start_of_name_or_email(ids):
+    assert _names("ali", "prefix") == ["Alice Smith", "alina park"]
+    assert _names("PARK@", "prefix") == ["alina park"]
+    assert _names("smith", "prefix") == []
+
+
+def test_contains_matches_anywhere(ids, engine):
+    assert _names("alice", "contains") == ["Alice Smith", "Dave"]
+    assert _names("EXAMPLE.COM", "contains") == ["Alice Smith", "alina park"]
+    assert _names("zzz", "contains") == []
+
+
+def test_short_contains_queries_scan(ids, engine):
+    assert _names("rk", "contains") == ["alina park"]
+
+
+def test_like_wildcards_are_literal(ids, engine):
+    assert _names("100%", "contains") == ["Carol 100%"]
+    assert _names("l_x", "contains") == ["Carol 100%"]
+    assert _names("%", "prefix") == []
+
+
+def test_sort_and_pages(ids):
+    assert _names("", "contains", sort="name") == ["Alice Smith", "alina park", "Bob Stone", "Carol 100%", "Dave"]
+    assert _names("", "contains", sort="email", direction="desc")[0] == "alina park"
+    users, more = user_service.search_users("", sort="name", page=1, page_size=2)
+    assert [user.name for user in users] == ["Bob Stone", "Carol 100%"]
+    assert more
+    assert user_service.search_users("", page=2, page_size=2)[1] is False
+
+
+def test_count_matches_search(ids, engine):
+    assert user_service.count_users() == len(USERS)
+    assert user_service.count_users("example", "contains") == 3
+    assert user_service.count_users("ALI", "prefix") == 2
+
+
+def test_fts_follows_updates_and_deletes(ids, engine):
+    user_service.update_user(ids[1], "Bob Alicedottir", "bob@sample.org")
+    user_service.delete_user(ids[0])
+    assert _names("alice", "contains") == ["Bob Alicedottir", "Dave"]
+
+
+@pytest.mark.parametrize("query, mode, expected", [
+    ("ÉMI", "prefix", ["Émile Zola"]),
+    ("émi", "prefix", ["Émile Zola"]),
+    ("ÉM", "contains", ["Émile Zola"]),
+    ("ÉMILE", "contains", ["Émile Zola"]),
+    ("zÖ", "contains", ["Jan Zöller"]),
+])
+def test_non_ascii_letters_match_either_case(add_users, engine, query, mode, expected):
+    add_users([("Émile Zola", "zola@example.com"), ("Jan Zöller", "jan@example.com"), ("Emil", "emil@example.com")])
+    assert _names(query, mode) == expected
+
+
+@pytest.mark.parametrize("kwargs", [{"sort": "version"}, {"direction": "up"}, {"mode": "fuzzy"}, {"page": -1}])
+def test_invalid_arguments(db, kwargs):
+    with pytest.raises(ValueError):
+        user_service.search_users("a", **kwargs)
@@ -0,0 +1,115 @@
+import os
+import struct
+
+import pytest
+
+from app.core.config import settings
+from app.services import snapshot
+
+ROWS = [
+    (1, "Ada Lovelace", "ada@example.com", 1),
+    (2, "Zoë Ünïcode", "zoe@example.org", 3),
+    (5, "Grace Hopper", "grace@example.net", 2),
+]
+
+
+@pytest.fixture
+def path(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "SNAPSHOT_ENABLED", True)
+    monkeypatch.setattr(settings, "SNAPSHOT_MAX_BYTES", 4096)
+    return str(tmp_path / "users.snapshot")
+
+
+def test_schema_version_matches_migrations():
+    from app.db.migrations import LATEST_VERSION
+
+    assert snapshot.SCHEMA_VERSION == LATEST_VERSION
+
+
+def test_round_trip(path):
+    assert snapshot.save_snapshot(ROWS, 42, path) == len(ROWS)
+    loaded = snapshot.load_snapshot(path)
+    assert loaded.total == 42
+    assert loaded.rows == ROWS
+    assert loaded.schema_version == snapshot.SCHEMA_VERSION
+
+
+def test_empty_round_trip(path):
+    assert snapshot.save_snapshot([], 0, path) == 0
+    assert snapshot.load_snapshot(path).rows == []
+
+
+def test_rows_past_the_size_limit_are_left_out(path, monkeypatch):
+    rows = [(user_id, f"user{user_id}", f"user{user_id}@example.com", 1) for user_id in range(1, 1001)]
+    monkeypatch.setattr(settings, "SNAPSHOT_MAX_BYTES", 1000)
+    written = snapshot.save_snapshot(rows, len(rows), path)
+    assert 0 < written < len(rows)
+    assert os.path.getsize(path) <= 1000
+    loaded = snapshot.load_snapshot(path)
+    assert loaded.rows == rows[:written]
+    assert loaded.total == len(rows)
+
+
+def test_oversized_file_is_discarded(path, monkeypatch):
+    snapshot.save_snapshot(ROWS, 3, path)
+    monkeypatch.setattr(settings, "SNAPSHOT_MAX_BYTES", os.path.getsize(path) - 1)
+    assert snapshot.load_snapshot(path) is None
+    assert not os.path.exists(path)
+
+
+def _corrupt(path, offset, value):
+    with open(path, "r+b") as handle:
+        handle.seek(offset)
+        handle.write(value)
+
+
+def test_checksum_mismatch_is_discarded(path):
+    snapshot.save_snapshot(ROWS, 3, path)
+    _corrupt(path, snapshot.HEADER.size + snapshot.ROW.size, b"X")
+    assert snapshot.load_snapshot(path) is None
+    assert not os.path.exists(path)
+
+
+def test_truncated_file_is_discarded(path):
+    snapshot.save_snapshot(ROWS, 3, path)
+    with open(path, "r+b") as handle:
+        handle.truncate(os.path.getsize(path) - 3)
+    assert snapshot.load_snapshot(path) is None
+    assert not os.path.exists(path)
+
+
+def test_other_schema_version_is_discarded(path):
+    snapshot.save_snapshot(ROWS, 3, path)
+    # schema version follows magic, format version and flags
+    _corrupt(path, 8, struct.pack("<I", snapshot.SCHEMA_VERSION - 1))
+    assert snapshot.load_snapshot(path) is None
+    assert not os.path.exists(path)
+
+
+def test_other_database_is_discarded(path, monkeypatch):
+    snapshot.save_snapshot(ROWS, 3, path)
+    monkeypatch.setattr(settings, "DATABASE_URL", "sqlite:///other.db")
+    assert snapshot.load_snapshot(path) is None
+
+
+def test_disabled(path, monkeypatch):
+    monkeypatch.setattr(settings, "SNAPSHOT_ENABLED", False)
+    assert snapshot.save_snapshot(ROWS, 3, path) == 0
+    assert snapshot.load_snapshot(path) is None
+    assert not os.path.exists(path)
+
+
+def test_diff_rows():
+    old = [(1, "a", "a@x", 1), (2, "b", "b@x", 1), (4, "d", "d@x", 1), (6, "f", "f@x", 1)]
+    new = [(1, "a", "a@x", 1), (2, "B", "b@x", 2), (3, "c", "c@x", 1), (6, "f", "f@x", 1), (7, "g", "g@x", 1)]
+    inserted, updated, deleted = snapshot.diff_rows(old, new)
+    assert inserted == [(3, "c", "c@x", 1), (7, "g", "g@x", 1)]
+    assert updated == [(2, "B", "b@x", 2)]
+    assert deleted == [4]
+
+
+def test_diff_rows_with_an_empty_side():
+    rows = [(1, "a", "a@x", 1), (2, "b", "b@x", 1)]
+    assert snapshot.diff_rows([], rows) == (rows, [], [])
+    assert snapshot.diff_rows(rows, []) == ([], [], [1, 2])
+    assert snapshot.diff_rows(rows, rows) == ([], [], [])
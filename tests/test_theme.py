@@ -0,0 +1,43 @@
+import pytest
+from PyQt6.QtGui import QColor
+from PyQt6.QtWidgets import QLabel, QMessageBox, QProgressDialog
+
+from app.gui import theme
+from app.gui.main_window import APP_STYLES
+from app.gui.widgets.ui import styles
+
+
+@pytest.fixture(params=list(theme.THEMES))
+def themed(request, qapp):
+    styles.register_global("main_window", APP_STYLES)
+    styles.set_theme(request.param)
+    yield request.param
+    styles.set_theme(theme.DEFAULT_THEME)
+
+
+def _lightness(dialog, label):
+    """Lightness of the dialog background and of the label's text pixels"""
+    dialog.resize(320, 160)
+    dialog.show()
+    image = dialog.grab().toImage()
+    background = QColor(image.pixel(2, 2)).lightness()
+    origin = label.mapTo(dialog, label.rect().topLeft())
+    text = [
+        QColor(image.pixel(origin.x() + x, origin.y() + y)).lightness()
+        for x in range(label.width()) for y in range(label.height())
+    ]
+    dialog.close()
+    # The pixel furthest from the background is the core of a glyph
+    return background, max(text, key=lambda value: abs(value - background))
+
+
+@pytest.mark.parametrize("make", [
+    lambda: QMessageBox(QMessageBox.Icon.NoIcon, "Title", "Readable message text"),
+    lambda: QProgressDialog("Readable progress text", "Cancel", 0, 100),
+])
+def test_dialog_text_contrasts_with_its_background(themed, make):
+    dialog = make()
+    label = next(label for label in dialog.findChildren(QLabel) if label.text().startswith("Readable"))
+    background, text = _lightness(dialog, label)
+    assert background == QColor(theme.tokens(themed)["surface"]).lightness()
+    assert abs(text - background) > 100